@@ -9,8 +9,18 @@ https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported only after Django has been set up by get_asgi_application
+from project.api.asgi import AsyncReadApplication  # noqa: E402 isort:skip
+from project.api.warmup import warm_up  # noqa: E402 isort:skip
+
+if settings.WARMUP_ENABLED:
+    warm_up()
+
+application = AsyncReadApplication(django_application)
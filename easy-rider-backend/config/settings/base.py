@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.0/ref/settings/
 """
 import datetime
+import importlib.util
 
 import environ
 
@@ -52,6 +53,7 @@ THIRD_PARTY_APPS = (
 
 LOCAL_APPS = (
     'project.api',
+    'project.jobs',
 )
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
@@ -61,12 +63,14 @@ AUTH_USER_MODEL = 'api.User'
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'project.api.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'project.api.middleware.StatementTimeoutMiddleware',
 ]
 
 CORS_ORIGIN_WHITELIST = (
@@ -80,8 +84,116 @@ JWT_AUTH = {
     'JWT_ALLOW_REFRESH': True,
     'JWT_EXPIRATION_DELTA': datetime.timedelta(hours=1),
     'JWT_REFRESH_EXPIRATION_DELTA': datetime.timedelta(days=7),
+    'JWT_PAYLOAD_HANDLER': 'project.api.tokens.jwt_payload_handler',
+    'JWT_DECODE_HANDLER': 'project.api.tokens.jwt_decode_handler',
 }
 
+# Token bucket limits per endpoint and key (client IP, email of the request body), e.g. 30/minute.
+# Buckets are stored in the default cache, which has to be shared by the workers to limit across them
+RATE_LIMITS = {
+    'obtain_token': {
+        'ip': env('DJANGO_RATE_LIMIT_OBTAIN_TOKEN_IP', default='30/minute'),
+        'email': env('DJANGO_RATE_LIMIT_OBTAIN_TOKEN_EMAIL', default='10/minute'),
+    },
+    'signup': {
+        'ip': env('DJANGO_RATE_LIMIT_SIGNUP_IP', default='10/hour'),
+        'email': env('DJANGO_RATE_LIMIT_SIGNUP_EMAIL', default='3/hour'),
+    },
+}
+
+# Maximum number of verified tokens cached per process, 0 disables the cache
+JWT_CACHE_SIZE = env.int('DJANGO_JWT_CACHE_SIZE', default=10000)
+
+# Seconds between two log lines with the in-process counters of a worker (see project/api/metrics.py), 0 disables them
+METRICS_LOG_INTERVAL = env.int('DJANGO_METRICS_LOG_INTERVAL', default=60)
+
+# The runtime stats are logged at level INFO, which Django does not print by default
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'project.api.metrics': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
+# Seconds between two refreshes of the in-process token denylist from the database,
+# a token revoked by one worker is rejected by all workers within this interval
+REVOCATION_SYNC_INTERVAL = env.int('DJANGO_REVOCATION_SYNC_INTERVAL', default=5)
+
+# Content codings offered in order of preference. br and zstd need the brotli and zstandard packages
+# (poetry install -E compression) and are skipped without them
+COMPRESSION_ENCODINGS = env.list('DJANGO_COMPRESSION_ENCODINGS', default=['zstd', 'br', 'gzip'])
+# Compression levels by content coding, e.g. gzip=6,br=4,zstd=3
+COMPRESSION_LEVELS = env.dict('DJANGO_COMPRESSION_LEVELS', cast={'value': int}, default={})
+# Smaller bodies are sent uncompressed, they hardly shrink and would still cost a compressor setup
+COMPRESSION_MIN_SIZE = env.int('DJANGO_COMPRESSION_MIN_SIZE', default=1024)
+# Compressed content types, entries ending with / match all subtypes
+COMPRESSION_CONTENT_TYPES = env.list('DJANGO_COMPRESSION_CONTENT_TYPES', default=['application/json', 'application/msgpack', 'text/'])
+# Bytes of compressed bodies kept per process for bodies served repeatedly, 0 disables the cache
+COMPRESSION_CACHE_SIZE = env.int('DJANGO_COMPRESSION_CACHE_SIZE', default=16 * 1024 * 1024)
+
+# Number of processes of run_workers running background jobs (see project/jobs/worker.py)
+JOBS_WORKERS = env.int('DJANGO_JOBS_WORKERS', default=2)
+# Maximum seconds between two polls of an idle worker
+JOBS_POLL_INTERVAL = env.float('DJANGO_JOBS_POLL_INTERVAL', default=1)
+# Attempts of a job before it fails, unless its task sets max_attempts
+JOBS_MAX_ATTEMPTS = env.int('DJANGO_JOBS_MAX_ATTEMPTS', default=5)
+# Seconds a worker may run a job before it is claimed again by another worker, unless its task sets a timeout
+JOBS_VISIBILITY_TIMEOUT = env.float('DJANGO_JOBS_VISIBILITY_TIMEOUT', default=300)
+# Upper bound of the delay before the first retry in seconds, doubled on every further attempt
+JOBS_RETRY_BACKOFF = env.float('DJANGO_JOBS_RETRY_BACKOFF', default=10)
+# Maximum delay before a retry in seconds
+JOBS_RETRY_BACKOFF_MAX = env.float('DJANGO_JOBS_RETRY_BACKOFF_MAX', default=3600)
+
+# Admin changelists count at most this many rows exactly, larger tables are counted from planner statistics
+ADMIN_EXACT_COUNT_LIMIT = env.int('DJANGO_ADMIN_EXACT_COUNT_LIMIT', default=10000)
+# Rows changed per transaction by the bulk actions of the admin
+ADMIN_BATCH_SIZE = env.int('DJANGO_ADMIN_BATCH_SIZE', default=1000)
+
+# Trips which started and ended more than this many days ago are moved to the archive by archive_trips
+# (see project/api/archive.py), trip lists only read the archive when their date filters reach past it
+TRIP_ARCHIVE_AFTER_DAYS = env.int('DJANGO_TRIP_ARCHIVE_AFTER_DAYS', default=365)
+# Trips moved to the archive per transaction
+TRIP_ARCHIVE_BATCH_SIZE = env.int('DJANGO_TRIP_ARCHIVE_BATCH_SIZE', default=1000)
+
+# Trips deleted per transaction when a deleted user is purged in the background (see project/api/jobs.py)
+USER_PURGE_BATCH_SIZE = env.int('DJANGO_USER_PURGE_BATCH_SIZE', default=1000)
+# Trips deleted per second by all purges together, 0 disables the limit
+USER_PURGE_RATE = env.float('DJANGO_USER_PURGE_RATE', default=5000)
+
+# Publish trip changes to the event streams of /api/users/{id}/trips/stream (see project/api/events.py)
+TRIP_EVENTS_ENABLED = env.bool('DJANGO_TRIP_EVENTS_ENABLED', default=True)
+# Transport of trip events between processes: project.api.events.LocalBackend (single process)
+# or project.api.events.PostgresBackend (LISTEN/NOTIFY of the PostgreSQL default database)
+TRIP_EVENTS_BACKEND = env('DJANGO_TRIP_EVENTS_BACKEND', default='project.api.events.LocalBackend')
+# Number of recent events kept for streams resuming with Last-Event-ID
+TRIP_EVENTS_HISTORY_SIZE = env.int('DJANGO_TRIP_EVENTS_HISTORY_SIZE', default=1000)
+# Events buffered per stream, streams falling further behind are closed and resume with Last-Event-ID
+TRIP_EVENTS_CLIENT_BUFFER_SIZE = env.int('DJANGO_TRIP_EVENTS_CLIENT_BUFFER_SIZE', default=100)
+# Seconds between heartbeats keeping idle streams open through proxies
+TRIP_EVENTS_HEARTBEAT_INTERVAL = env.float('DJANGO_TRIP_EVENTS_HEARTBEAT_INTERVAL', default=15)
+# Seconds for which the tickets opening event streams are valid (see project.api.events.make_stream_ticket)
+TRIP_EVENTS_TICKET_TTL = env.int('DJANGO_TRIP_EVENTS_TICKET_TTL', default=30)
+# Accept the JWT of event streams from the token query parameter for EventSource clients, which cannot send headers.
+# Query strings are written to access logs, so tokens passed this way may leak; clients should use tickets instead
+TRIP_EVENTS_QUERY_TOKEN = env.bool('DJANGO_TRIP_EVENTS_QUERY_TOKEN', default=False)
+
+# Number of processes hashing and checking passwords (see project/api/hashing.py), 0 hashes on the request thread
+PASSWORD_HASHING_WORKERS = env.int('DJANGO_PASSWORD_HASHING_WORKERS', default=0)
+# Maximum number of passwords queued or being hashed, further requests are rejected with 503
+PASSWORD_HASHING_MAX_PENDING = env.int('DJANGO_PASSWORD_HASHING_MAX_PENDING', default=64)
+# Seconds a request waits for a free slot in the hashing queue
+PASSWORD_HASHING_TIMEOUT = env.float('DJANGO_PASSWORD_HASHING_TIMEOUT', default=2)
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -100,6 +212,17 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'config.wsgi.application'
 
+# Serve the hot read endpoints natively on the event loop when running under ASGI (see project/api/asgi.py)
+ASYNC_READ_ENDPOINTS = env.bool('DJANGO_ASYNC_READ_ENDPOINTS', default=True)
+# Warm up the views, settings and token denylist when config.wsgi or config.asgi is imported, i.e. before
+# the first request (see project/api/warmup.py)
+WARMUP_ENABLED = env.bool('DJANGO_WARMUP_ENABLED', default=True)
+# Concurrent identical reads of users and trips wait for the first of them and share its response
+# (see project/api/coalescing.py)
+REQUEST_COALESCING = env.bool('DJANGO_REQUEST_COALESCING', default=True)
+# Seconds a request waits for the identical request in flight before computing its response itself
+REQUEST_COALESCING_TIMEOUT = env.float('DJANGO_REQUEST_COALESCING_TIMEOUT', default=5.0)
+
 
 # Database
 # https://docs.djangoproject.com/en/3.0/ref/settings/#databases
@@ -111,6 +234,43 @@ DATABASES = {
     }
 }
 
+DATABASE_ROUTERS = ['project.api.routers.TripShardRouter', 'project.api.routers.ReplicaRouter']
+
+# Aliases of databases trips are sharded across by user ID, trips stay in the default database if empty
+TRIP_SHARDS = []
+
+# Aliases of read replicas of the default database serving list and retrieve actions
+DATABASE_REPLICAS = []
+
+# Seconds during which reads of a user stay on the primary after their own write
+DATABASE_READ_YOUR_WRITES_WINDOW = env.int('DJANGO_DATABASE_READ_YOUR_WRITES_WINDOW', default=5)
+
+# Close persistent connections which became unusable before a request reuses them
+DATABASE_HEALTH_CHECKS = env.bool('DJANGO_DATABASE_HEALTH_CHECKS', default=False)
+
+# Statement timeouts in milliseconds, either global or per URL name (e.g. user-list=2000,user-trips-list=5000).
+# 0 disables the timeout
+DATABASE_STATEMENT_TIMEOUT = env.int('DJANGO_DATABASE_STATEMENT_TIMEOUT', default=0)
+DATABASE_STATEMENT_TIMEOUTS = env.dict('DJANGO_DATABASE_STATEMENT_TIMEOUTS', cast={'value': int}, default={})
+
+# Funnel trip writes of the views through a single writer thread per process committing them in groups
+# (see project/api/writer.py). Meant for SQLite, which allows one writer at a time
+WRITE_QUEUE_ENABLED = env.bool('DJANGO_WRITE_QUEUE_ENABLED', default=False)
+# Maximum number of writes waiting for the writer, further writes are rejected with 503
+WRITE_QUEUE_MAX_SIZE = env.int('DJANGO_WRITE_QUEUE_MAX_SIZE', default=1000)
+# Maximum number of writes committed in one transaction
+WRITE_QUEUE_MAX_BATCH_SIZE = env.int('DJANGO_WRITE_QUEUE_MAX_BATCH_SIZE', default=100)
+# Seconds the writer waits for more writes before it commits a batch
+WRITE_QUEUE_MAX_BATCH_DELAY = env.float('DJANGO_WRITE_QUEUE_MAX_BATCH_DELAY', default=0.002)
+# Seconds a request waits for a free slot in the queue and then for its write
+WRITE_QUEUE_TIMEOUT = env.float('DJANGO_WRITE_QUEUE_TIMEOUT', default=10)
+
+# PRAGMAs applied to every new SQLite connection, e.g. journal_mode=wal,synchronous=normal
+SQLITE_PRAGMAS = env.dict('DJANGO_SQLITE_PRAGMAS', default={})
+
+# Seconds between two PRAGMA optimize and WAL checkpoint runs triggered by finished requests, 0 disables them
+SQLITE_MAINTENANCE_INTERVAL = env.int('DJANGO_SQLITE_MAINTENANCE_INTERVAL', default=0)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.0/ref/settings/#auth-password-validators
@@ -179,7 +339,7 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ),
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_jwt.authentication.JSONWebTokenAuthentication',
+        'project.api.authentication.JSONWebTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
         'rest_framework.authentication.BasicAuthentication',
     ),
@@ -190,3 +350,9 @@ REST_FRAMEWORK = {
         'djangorestframework_camel_case.render.CamelCaseBrowsableAPIRenderer',
     ),
 }
+
+# MessagePack for clients asking for application/msgpack, available with the msgpack package (poetry install -E msgpack)
+if importlib.util.find_spec('msgpack') is not None:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] += ('project.api.renderers.MessagePackRenderer',)
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] += ('project.api.parsers.MessagePackParser',)
+    REST_FRAMEWORK['TEST_REQUEST_RENDERER_CLASSES'] += ('project.api.renderers.MessagePackRenderer',)
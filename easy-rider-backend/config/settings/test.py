@@ -1 +1,43 @@
+import os
+import tempfile
+from pathlib import Path
+
 from .base import *
+
+SECRET_KEY = env('DJANGO_SECRET_KEY', default='test')
+
+# Password hashing strength is irrelevant in tests while PBKDF2 dominates the runtime of the suite
+PASSWORD_HASHERS = (
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+)
+
+# SQLite files standing in for a primary, its read replica and a second trip shard. Routing to the replica is enabled
+# only by tests overriding DATABASE_REPLICAS, the replica is not replicated and stays empty otherwise.
+# The shard is used only by tests overriding TRIP_SHARDS. Test databases are named after the process, so leftovers
+# of interrupted runs do not prompt for deletion and concurrent runs do not share files
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': str(Path(tempfile.gettempdir()) / 'easy-rider-default.sqlite3'),
+        'TEST': {
+            'NAME': str(Path(tempfile.gettempdir()) / f'easy-rider-test-default-{os.getpid()}.sqlite3'),
+        },
+    },
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': str(Path(tempfile.gettempdir()) / 'easy-rider-replica.sqlite3'),
+        'TEST': {
+            'NAME': str(Path(tempfile.gettempdir()) / f'easy-rider-test-replica-{os.getpid()}.sqlite3'),
+        },
+    },
+    'shard': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': str(Path(tempfile.gettempdir()) / 'easy-rider-shard.sqlite3'),
+        'TEST': {
+            'NAME': str(Path(tempfile.gettempdir()) / f'easy-rider-test-shard-{os.getpid()}.sqlite3'),
+        },
+    },
+}
+
+# Tests read the runtime stats directly instead of from the log
+METRICS_LOG_INTERVAL = 0
@@ -18,5 +18,6 @@ from django.urls import include, path
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('api/', include('project.api.urls'))
+    path('api/', include('project.api.urls')),
+    path('api/', include('project.jobs.urls')),
 ]
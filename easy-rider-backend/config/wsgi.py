@@ -9,8 +9,15 @@ https://docs.djangoproject.com/en/3.0/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+# Imported only after Django has been set up by get_wsgi_application
+from project.api.warmup import warm_up  # noqa: E402 isort:skip
+
+if settings.WARMUP_ENABLED:
+    warm_up()
@@ -0,0 +1 @@
+default_app_config = 'project.api.apps.ApiConfig'
@@ -1,6 +1,260 @@
-from django.contrib import admin
+from typing import Callable, Iterator, List, Optional, Tuple
 
+from django.conf import settings
+from django.contrib import admin, messages
+from django.core.paginator import Paginator
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import F, Q, QuerySet
+from django.http import HttpRequest
+from django.utils.functional import cached_property
+
+from project.jobs.queue import enqueue
+
+from .coalescing import next_generation
+from .db import estimate_row_count
+from .events import DELETED, build_event, get_broker
+from .filters import filter_email_domain, filter_email_prefix
+from .jobs import purge_user
 from .models import Trip, User
+from .sharding import fan_out, get_trip_shards, is_sharding_enabled
+from .summaries import refresh_trip_summaries
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator of changelists counting at most ADMIN_EXACT_COUNT_LIMIT rows. Larger unfiltered tables are counted
+    from the statistics of the query planner, larger filtered lists only page through their first rows.
+    """
+
+    @cached_property
+    def count(self) -> int:
+        limit = settings.ADMIN_EXACT_COUNT_LIMIT
+        queryset = self.object_list
+        # Counting a sliced queryset stops reading after limit + 1 rows
+        count = queryset.order_by()[:limit + 1].count()
+
+        if count <= limit:
+            return count
+
+        if not queryset.query.where:
+            estimate = estimate_row_count(queryset.model._meta.db_table, queryset.db)
+
+            if estimate is not None:
+                return max(estimate, limit)
+
+        return limit
+
+
+def run_in_batches(queryset: QuerySet, function: Callable[[QuerySet], None]) -> int:
+    """
+    Applies @function to the rows of @queryset in batches of ADMIN_BATCH_SIZE primary keys, each batch in its own
+    transaction, so actions on a whole changelist neither load it at once nor hold one long transaction
+
+    :param queryset: Selected rows
+    :param function: Function receiving a QuerySet of one batch
+    :return: Number of processed rows
+    """
+
+    queryset = queryset.order_by('pk')
+    manager = queryset.model._default_manager.db_manager(queryset.db)
+    last_pk = None
+    total = 0
+
+    while True:
+        batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        pks = list(batch.values_list('pk', flat=True)[:settings.ADMIN_BATCH_SIZE])
+
+        if not pks:
+            return total
+
+        with transaction.atomic(using=queryset.db):
+            function(manager.filter(pk__in=pks))
+
+        last_pk = pks[-1]
+        total += len(pks)
+
+
+class ScalableModelAdmin(admin.ModelAdmin):
+    """
+    ModelAdmin whose changelists stay usable on large tables: counts are bounded, the total count is not shown
+    and the bulk delete of Django, which loads every selected row, is replaced by batched actions
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_actions(self, request: HttpRequest) -> dict:
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+
+        return actions
+
+
+@admin.register(User)
+class UserAdmin(ScalableModelAdmin):
+    list_display = ('id', 'email', 'role', 'is_active', 'trip_count', 'next_trip_start', 'last_trip_end')
+    list_filter = ('role', 'is_active')
+    # Only indexed columns, get_search_results replaces the default lookups
+    search_fields = ('email_lower',)
+    sortable_by = ('id', 'email')
+    fields = ('email', 'role', 'is_active', 'is_superuser', 'trip_count', 'next_trip_start', 'last_trip_end')
+    readonly_fields = ('trip_count', 'next_trip_start', 'last_trip_end')
+    actions = ('deactivate_users', 'delete_users')
+
+    def get_search_results(self, request: HttpRequest, queryset: QuerySet, search_term: str) -> Tuple[QuerySet, bool]:
+        """
+        Searches "@domain" by the email domain and anything else by the email prefix, both indexed
+        """
+
+        search_term = search_term.strip()
+
+        if search_term.startswith('@'):
+            return filter_email_domain(queryset, search_term), False
+
+        return filter_email_prefix(queryset, search_term), False
+
+    def deactivate_users(self, request: HttpRequest, queryset: QuerySet) -> None:
+        count = run_in_batches(queryset, lambda users: users.update(
+            is_active=False, token_version=F('token_version') + 1))
+        self.message_user(request, f'Deactivated {count} users and revoked their tokens', messages.SUCCESS)
+
+    deactivate_users.short_description = 'Deactivate selected users'
+
+    def delete_users(self, request: HttpRequest, queryset: QuerySet) -> None:
+        def schedule(users: QuerySet) -> None:
+            user_ids = list(users.values_list('pk', flat=True))
+            users.update(is_active=False, token_version=F('token_version') + 1)
+
+            for user_id in user_ids:
+                enqueue(purge_user, user_id, user_id=request.user.pk)
+
+        count = run_in_batches(queryset, schedule)
+        self.message_user(
+            request, f'Deactivated {count} users, their trips are purged in the background', messages.SUCCESS)
+
+    delete_users.short_description = 'Delete selected users in the background'
+
+
+class ShardListFilter(admin.SimpleListFilter):
+    """
+    Picks the shard the trip changelist and its actions run on, the first shard of TRIP_SHARDS by default.
+    Shown only with sharding, the queryset is routed by TripAdmin.get_queryset.
+    """
+
+    title = 'shard'
+    parameter_name = 'shard'
+
+    @staticmethod
+    def get_shard(request: HttpRequest) -> str:
+        return ShardListFilter._validate(request.GET.get(ShardListFilter.parameter_name))
+
+    @staticmethod
+    def _validate(shard: Optional[str]) -> str:
+        shards = get_trip_shards()
+
+        return shard if shard in shards else shards[0]
+
+    def lookups(self, request: HttpRequest, model_admin: admin.ModelAdmin) -> List[Tuple[str, str]]:
+        return [(alias, alias) for alias in get_trip_shards()]
+
+    def choices(self, changelist) -> Iterator[dict]:
+        # There is no "All" choice, trips of all shards cannot be paginated by one query
+        shard = self._validate(self.value()) if self.lookup_choices else None
+
+        for alias, title in self.lookup_choices:
+            yield {
+                'selected': alias == shard,
+                'query_string': changelist.get_query_string({self.parameter_name: alias}),
+                'display': title,
+            }
+
+    def queryset(self, request: HttpRequest, queryset: QuerySet) -> QuerySet:
+        return queryset
+
+
+@admin.register(Trip)
+class TripAdmin(ScalableModelAdmin):
+    list_display = ('id', 'user', 'destination', 'start_date', 'end_date')
+    list_select_related = ('user',)
+    list_filter = (ShardListFilter,)
+    autocomplete_fields = ('user',)
+    # Only indexed columns, get_search_results replaces the default lookups
+    search_fields = ('=id',)
+    sortable_by = ('id', 'start_date', 'end_date')
+    date_hierarchy = 'start_date'
+    actions = ('delete_trips',)
+
+    def get_queryset(self, request: HttpRequest) -> QuerySet:
+        queryset = super().get_queryset(request)
+
+        if not is_sharding_enabled():
+            return queryset
+
+        shard = ShardListFilter.get_shard(request)
+
+        if shard == DEFAULT_DB_ALIAS:
+            return queryset.using(shard)
+
+        # Users live in the default database, a join in a shard would not find them
+        return queryset.using(shard).prefetch_related('user')
+
+    def get_list_select_related(self, request: HttpRequest):
+        if is_sharding_enabled() and ShardListFilter.get_shard(request) != DEFAULT_DB_ALIAS:
+            return ()
+
+        return super().get_list_select_related(request)
+
+    def get_object(self, request: HttpRequest, object_id: str, from_field: Optional[str] = None) -> Optional[Trip]:
+        if not is_sharding_enabled() or from_field is not None:
+            return super().get_object(request, object_id, from_field)
+
+        # Links of the changelist do not carry the shard, trip IDs are unique across shards
+        try:
+            trips = fan_out(Q(pk=int(object_id)), limit=1)
+        except ValueError:
+            return None
+
+        return trips[0] if trips else None
+
+    def get_search_results(self, request: HttpRequest, queryset: QuerySet, search_term: str) -> Tuple[QuerySet, bool]:
+        """
+        Searches a number by the trip ID and anything else by the email prefix of the user
+        """
+
+        search_term = search_term.strip()
+
+        if search_term.isdigit():
+            return queryset.filter(pk=int(search_term)), False
+
+        users = filter_email_prefix(User.objects.all(), search_term)
+
+        if queryset.db != DEFAULT_DB_ALIAS:
+            # Subqueries cannot reach the users from a shard
+            users = list(users.values_list('pk', flat=True))
+
+        return queryset.filter(user__in=users), False
+
+    def delete_trips(self, request: HttpRequest, queryset: QuerySet) -> None:
+        def delete(trips: QuerySet) -> None:
+            deleted = list(trips.only('id', 'user'))
+            # A raw delete skips the collector and the per-trip signals, the summaries are refreshed once per batch
+            trips._raw_delete(trips.db)
+            refresh_trip_summaries({trip.user_id for trip in deleted})
+            # The deletions are published and the coalesced reads invalidated once the batch commits, as by the signals
+            transaction.on_commit(next_generation, using=trips.db)
+
+            if settings.TRIP_EVENTS_ENABLED:
+                events = [build_event(DELETED, trip) for trip in deleted]
+
+                def publish() -> None:
+                    broker = get_broker()
+
+                    for event in events:
+                        broker.publish(event)
+
+                transaction.on_commit(publish, using=trips.db)
+
+        count = run_in_batches(queryset, delete)
+        self.message_user(request, f'Deleted {count} trips', messages.SUCCESS)
 
-admin.site.register(User)
-admin.site.register(Trip)
+    delete_trips.short_description = 'Delete selected trips'
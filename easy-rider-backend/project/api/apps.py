@@ -1,5 +1,46 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.core.signals import request_finished, request_started
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
 
 
 class ApiConfig(AppConfig):
     name = 'project.api'
+
+    def ready(self) -> None:
+        if getattr(settings, 'DATABASE_HEALTH_CHECKS', False):
+            from .db import check_connection_health
+
+            request_started.connect(check_connection_health, dispatch_uid='api_check_connection_health')
+
+        from .db import configure_sqlite_connection, schedule_sqlite_maintenance
+
+        connection_created.connect(configure_sqlite_connection, dispatch_uid='api_configure_sqlite_connection')
+
+        if getattr(settings, 'SQLITE_MAINTENANCE_INTERVAL', 0) > 0:
+            request_finished.connect(schedule_sqlite_maintenance, dispatch_uid='api_schedule_sqlite_maintenance')
+
+        if getattr(settings, 'METRICS_LOG_INTERVAL', 0) > 0:
+            from .metrics import log_runtime_stats
+
+            request_finished.connect(log_runtime_stats, dispatch_uid='api_log_runtime_stats')
+
+        from .models import Trip, User
+        from .signals import (assign_trip_id, delete_sharded_trips, invalidate_coalesced_reads, publish_trip_deleted,
+                              publish_trip_saved, update_trip_summaries)
+
+        pre_save.connect(assign_trip_id, sender=Trip, dispatch_uid='api_assign_trip_id')
+        pre_delete.connect(delete_sharded_trips, sender=User, dispatch_uid='api_delete_sharded_trips')
+        post_save.connect(update_trip_summaries, sender=Trip, dispatch_uid='api_update_trip_summaries_on_save')
+        post_delete.connect(update_trip_summaries, sender=Trip, dispatch_uid='api_update_trip_summaries_on_delete')
+
+        for model in (Trip, User):
+            post_save.connect(
+                invalidate_coalesced_reads, sender=model, dispatch_uid=f'api_invalidate_coalesced_reads_on_{model.__name__}_save')
+            post_delete.connect(
+                invalidate_coalesced_reads, sender=model, dispatch_uid=f'api_invalidate_coalesced_reads_on_{model.__name__}_delete')
+
+        if getattr(settings, 'TRIP_EVENTS_ENABLED', False):
+            post_save.connect(publish_trip_saved, sender=Trip, dispatch_uid='api_publish_trip_saved')
+            post_delete.connect(publish_trip_deleted, sender=Trip, dispatch_uid='api_publish_trip_deleted')
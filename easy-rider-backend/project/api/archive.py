@@ -0,0 +1,171 @@
+import datetime
+import logging
+from functools import lru_cache
+from typing import Mapping, Optional, Type
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
+from django.http import Http404
+from django.utils import timezone
+from django_filters import FilterSet
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework.generics import get_object_or_404
+
+from .models import ArchivedTrip, Trip
+
+_logger: logging.Logger = logging.getLogger(__name__)
+
+# Trip filters on dates, the archive is only read when one of them is used
+DATE_FIELDS = ('start_date', 'end_date')
+
+
+def get_archive_horizon() -> datetime.date:
+    """
+    Returns the date before which trips are archived: trips which started and ended before it
+    are moved to the archive by archive_trips
+    """
+
+    return timezone.localdate() - datetime.timedelta(days=settings.TRIP_ARCHIVE_AFTER_DAYS)
+
+
+def reaches_archive(query_params: Mapping[str, str], horizon: Optional[datetime.date] = None) -> bool:
+    """
+    Checks whether the date filters of a trip list may match archived trips. Lists without date filters
+    show the trips which have not been archived only, lists bounding a date from below
+    at or after the horizon cannot match archived trips either.
+
+    :param query_params: Query parameters of the request, e.g. {'start_date__gte': '2019-01-01'}
+    :param horizon: Archive horizon, get_archive_horizon() by default
+    :return: Boolean value indicating whether archived trips have to be listed too
+    """
+
+    horizon = horizon or get_archive_horizon()
+    filters_dates = False
+
+    for name, value in query_params.items():
+        field, _, lookup = name.partition('__')
+
+        if field not in DATE_FIELDS:
+            continue
+
+        filters_dates = True
+
+        if lookup not in ('', 'exact', 'gt', 'gte'):
+            continue
+
+        try:
+            lower_bound = datetime.date.fromisoformat(value)
+        except ValueError:
+            # The filterset rejects the value
+            continue
+
+        if lookup == 'gt':
+            lower_bound += datetime.timedelta(days=1)
+
+        if lower_bound >= horizon:
+            return False
+
+    return filters_dates
+
+
+@lru_cache(maxsize=None)
+def get_archive_filterset_class(filterset_class: Type[FilterSet]) -> Type[FilterSet]:
+    """
+    Returns a copy of a trip filterset filtering archived trips
+    """
+
+    meta = type('Meta', (filterset_class.Meta,), {'model': ArchivedTrip})
+
+    return type(f'Archived{filterset_class.__name__}', (filterset_class,), {'Meta': meta})
+
+
+class TripFilterBackend(DjangoFilterBackend):
+    """
+    Filter backend applying the filterset of the view to trips and archived trips
+    """
+
+    def get_filterset_class(self, view, queryset: Optional[QuerySet] = None) -> Optional[Type[FilterSet]]:
+        filterset_class = getattr(view, 'filterset_class', None)
+
+        if filterset_class is not None and queryset is not None and queryset.model is ArchivedTrip:
+            return get_archive_filterset_class(filterset_class)
+
+        return super().get_filterset_class(view, queryset)
+
+
+class TripArchiveViewMixin:
+    """
+    View mixin adding archived trips to lists whose date filters reach past the archive horizon
+    (see reaches_archive) and serving archived trips to the retrieve action. Archived trips are read-only.
+    Views have to filter with TripFilterBackend instead of DjangoFilterBackend.
+    """
+
+    def get_archive_queryset(self) -> QuerySet:
+        """
+        Returns the archived counterpart of get_queryset()
+        """
+
+        raise NotImplementedError
+
+    def filter_queryset(self, queryset: QuerySet) -> QuerySet:
+        queryset = super().filter_queryset(queryset)
+
+        if getattr(self, 'action', None) != 'list' or not reaches_archive(self.request.query_params):
+            return queryset
+
+        # Both parts are read from the same database (shard or replica) and ordered as a whole.
+        # Django cannot build model instances of unions with deferred columns, so unions load whole rows
+        archived = super().filter_queryset(self.get_archive_queryset().using(queryset.db))
+        ordering = queryset.query.order_by
+
+        return queryset.defer(None).order_by().union(archived.defer(None).order_by(), all=True).order_by(*ordering)
+
+    def get_object(self):
+        try:
+            return super().get_object()
+        except Http404:
+            if getattr(self, 'action', None) != 'retrieve':
+                raise
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        trip = get_object_or_404(
+            self.filter_queryset(self.get_archive_queryset()), **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        self.check_object_permissions(self.request, trip)
+
+        return trip
+
+
+def archive_trips(using: str, horizon: datetime.date, batch_size: int) -> int:
+    """
+    Moves trips which started and ended before @horizon into the archive table of their database.
+    Every batch is moved in its own transaction, so an interrupted run is simply repeated.
+
+    :param using: Database alias, the default database or a shard
+    :param horizon: Archive horizon
+    :param batch_size: Number of trips moved per transaction
+    :return: Number of archived trips
+    """
+
+    fields = [field.attname for field in ArchivedTrip._meta.concrete_fields]
+    archived = 0
+
+    while True:
+        with transaction.atomic(using=using):
+            trips = list(
+                Trip.objects.using(using)
+                .filter(start_date__lt=horizon, end_date__lt=horizon)
+                .order_by('id')[:batch_size])
+
+            if not trips:
+                break
+
+            ArchivedTrip.objects.using(using).bulk_create(
+                [ArchivedTrip(**{field: getattr(trip, field) for field in fields}) for trip in trips])
+            # A raw delete skips the collector and the trip signals, archived trips have not been deleted
+            Trip.objects.using(using).filter(id__in=[trip.id for trip in trips])._raw_delete(using)
+
+        archived += len(trips)
+        _logger.info(f'Archived {archived} trips of {using}')
+
+    return archived
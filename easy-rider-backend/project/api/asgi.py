@@ -0,0 +1,509 @@
+import asyncio
+import functools
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Pattern, Tuple
+
+import jwt
+from asgiref.sync import sync_to_async
+from corsheaders.middleware import CorsMiddleware
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections
+from django.http import HttpResponse, QueryDict
+from djangorestframework_camel_case.render import CamelCaseJSONRenderer
+from rest_framework.exceptions import NotAcceptable, NotAuthenticated, NotFound, PermissionDenied
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.views import APIView
+from rest_framework_jwt.settings import api_settings
+
+from .archive import reaches_archive
+from .coalescing import coalesce, get_coalescing_key, get_user_scope
+from .events import get_broker, read_stream_ticket
+from .middleware import CompressionMiddleware
+from .models import Trip, User
+from .routers import read_from_replica
+from .serializers import TripSerializer, UserSerializer
+from .tokens import denylist, is_token_version_current
+from .views import CurrentUserView, TripViewSet, UserViewSet
+
+jwt_decode_handler = api_settings.JWT_DECODE_HANDLER
+jwt_get_username_from_payload = api_settings.JWT_PAYLOAD_GET_USERNAME_HANDLER
+
+ASGIApplication = Callable[[dict, Callable, Callable], Awaitable[None]]
+
+# Sentinel returned by endpoints which cannot serve a request identically to the Django stack
+FALLBACK = None
+
+
+def database_sync_to_async(func: Callable) -> Callable[..., Awaitable[Any]]:
+    """
+    Wraps a function accessing the database so it can be awaited from the event loop.
+    The ORM has no native async support yet, so the function runs in a worker thread and stale connections
+    are closed around it the same way Django does at request boundaries.
+
+    :param func: Function accessing the database
+    :return: Awaitable version of @func
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        close_old_connections()
+
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return sync_to_async(wrapper, thread_sensitive=False)
+
+
+@dataclass
+class AsyncRequest:
+    """
+    Minimal request object built from an ASGI scope.
+    It mimics the attributes of DRF requests which are used by the access policies and filter backends.
+    """
+
+    scope: dict
+    method: str
+    path: str
+    headers: Dict[str, str]
+    query_params: QueryDict
+    kwargs: Dict[str, str] = field(default_factory=dict)
+    user: Optional[User] = None
+    data: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_scope(cls, scope: dict) -> 'AsyncRequest':
+        headers = {name.decode('latin1').lower(): value.decode('latin1') for name, value in scope.get('headers', [])}
+
+        return cls(
+            scope=scope,
+            method=scope['method'],
+            path=scope['path'],
+            headers=headers,
+            query_params=QueryDict(scope.get('query_string', b'').decode('latin1')))
+
+    @property
+    def parser_context(self) -> dict:
+        return {'kwargs': self.kwargs}
+
+    @property
+    def META(self) -> Dict[str, str]:  # pylint: disable=invalid-name
+        meta = {f'HTTP_{name.upper().replace("-", "_")}': value for name, value in self.headers.items()}
+        meta['REQUEST_METHOD'] = self.method
+
+        return meta
+
+    @property
+    def path_info(self) -> str:
+        return self.path
+
+
+def _accepts_json(request: AsyncRequest) -> bool:
+    # Negotiated the same way as by the DRF views, which may prefer another renderer (e.g. MessagePack) to JSON
+    try:
+        renderer, _ = DefaultContentNegotiation().select_renderer(
+            request, [renderer_class() for renderer_class in APIView.renderer_classes])
+    except NotAcceptable:
+        return False
+
+    return isinstance(renderer, CamelCaseJSONRenderer)
+
+
+@database_sync_to_async
+def _get_active_user(username: str, payload: dict) -> Optional[User]:
+    try:
+        user = User.objects.get_by_natural_key(username)
+    except User.DoesNotExist:
+        return None
+
+    return user if user.is_active and is_token_version_current(payload, user) else None
+
+
+async def authenticate(request: AsyncRequest) -> Optional[User]:
+    """
+    Authenticates the request using its JWT. Signature verification runs on the event loop,
+    only the user lookup hits the database.
+
+    :param request: Incoming request
+    :return: Authenticated user or None if the request has to be authenticated by the Django stack
+    """
+
+    authorization = request.headers.get('authorization', '').split()
+
+    if len(authorization) != 2 or authorization[0].lower() != api_settings.JWT_AUTH_HEADER_PREFIX.lower():
+        return None
+
+    # Decoding checks the denylist, which is refreshed from the database off the event loop when due
+    if denylist.is_sync_due():
+        await database_sync_to_async(denylist.sync)()
+
+    try:
+        payload = jwt_decode_handler(authorization[1])
+    except jwt.InvalidTokenError:
+        return None
+
+    username = jwt_get_username_from_payload(payload)
+
+    if not username:
+        return None
+
+    return await _get_active_user(username, payload)
+
+
+def check_permissions(request: AsyncRequest, view_class: type, action: str) -> bool:
+    """
+    Evaluates the permission classes of a DRF view without instantiating the view.
+    Access policies only inspect the user and URL arguments of read actions, so no database access is needed.
+
+    :param request: Authenticated request
+    :param view_class: DRF view class whose permissions are checked
+    :param action: View action
+    :return: Boolean value indicating whether the action is allowed
+    """
+
+    view = SimpleNamespace(action=action, kwargs=request.kwargs)
+
+    return all(
+        permission_class().has_permission(request, view)
+        for permission_class in view_class.permission_classes)
+
+
+def _filter_trips(request: AsyncRequest) -> Optional[Any]:
+    queryset = Trip.objects.for_user(request.kwargs['user_pk'])
+    filterset = TripViewSet.filterset_class(data=request.query_params, queryset=queryset, request=request)
+
+    if not filterset.is_valid():
+        return FALLBACK
+
+    return filterset.qs
+
+
+def _get_coalescing_key(request: AsyncRequest, endpoint: str, scope: Optional[str] = None) -> tuple:
+    # Permission checks passed, the trips of the user in the URL are the same for every originator
+    return get_coalescing_key('asgi', endpoint, request.path, request.scope.get('query_string', b''), scope)
+
+
+@database_sync_to_async
+def _list_trips(request: AsyncRequest) -> Optional[list]:
+    queryset = _filter_trips(request)
+
+    if queryset is FALLBACK:
+        return FALLBACK
+
+    with read_from_replica(request.user.id):
+        return coalesce(_get_coalescing_key(request, 'list_trips'), lambda: TripSerializer(queryset, many=True).data)
+
+
+@database_sync_to_async
+def _retrieve_trip(request: AsyncRequest) -> Optional[dict]:
+    queryset = _filter_trips(request)
+
+    if queryset is FALLBACK:
+        return FALLBACK
+
+    def retrieve() -> dict:
+        trip = queryset.filter(pk=request.kwargs['pk']).first()
+
+        # Empty data means that the object does not exist or is not visible to the originator
+        return TripSerializer(trip).data if trip is not None else {}
+
+    with read_from_replica(request.user.id):
+        return coalesce(_get_coalescing_key(request, 'retrieve_trip'), retrieve)
+
+
+@database_sync_to_async
+def _retrieve_user(request: AsyncRequest) -> dict:
+    queryset = User.objects.all()
+
+    for filter_backend in UserViewSet.filter_backends:
+        queryset = filter_backend().filter_queryset(request, queryset, None)
+
+    def retrieve() -> dict:
+        user = queryset.filter(pk=request.kwargs['pk']).first()
+
+        return UserSerializer(user).data if user is not None else {}
+
+    with read_from_replica(request.user.id):
+        return coalesce(_get_coalescing_key(request, 'retrieve_user', get_user_scope(request.user)), retrieve)
+
+
+def _error_response(status: int, detail: str) -> HttpResponse:
+    return HttpResponse(
+        CamelCaseJSONRenderer().render({'detail': detail}), status=status, content_type='application/json')
+
+
+def _drf_response(data: Any, allow: str = 'GET, PUT, PATCH, DELETE, HEAD, OPTIONS') -> HttpResponse:
+    response = HttpResponse(CamelCaseJSONRenderer().render(data), content_type='application/json')
+    response['Vary'] = 'Accept'
+    response['Allow'] = allow
+
+    return response
+
+
+async def current_user(request: AsyncRequest) -> Optional[HttpResponse]:
+    """
+    Async counterpart of CurrentUserView.get
+    """
+
+    if not check_permissions(request, CurrentUserView, 'get'):
+        return _error_response(403, PermissionDenied.default_detail)
+
+    # CurrentUserView renders through JsonResponse instead of DRF renderers
+    data = json.dumps(UserSerializer(request.user).data, cls=DjangoJSONEncoder)
+    response = HttpResponse(data, content_type='application/json')
+    response['Vary'] = 'Accept'
+    response['Allow'] = 'GET, HEAD, OPTIONS'
+
+    return response
+
+
+async def retrieve_user(request: AsyncRequest) -> Optional[HttpResponse]:
+    """
+    Async counterpart of UserViewSet.retrieve
+    """
+
+    if request.query_params:
+        return FALLBACK
+    if not check_permissions(request, UserViewSet, 'retrieve'):
+        return _error_response(403, PermissionDenied.default_detail)
+
+    data = await _retrieve_user(request)
+
+    return _drf_response(data) if data else _error_response(404, NotFound.default_detail)
+
+
+async def list_trips(request: AsyncRequest) -> Optional[HttpResponse]:
+    """
+    Async counterpart of TripViewSet.list
+    """
+
+    if not set(request.query_params).issubset(TripViewSet.filterset_class.base_filters):
+        return FALLBACK
+    # Only the trip table is queried natively, lists reaching archived trips need the union built by the view
+    if reaches_archive(request.query_params):
+        return FALLBACK
+    if not check_permissions(request, TripViewSet, 'list'):
+        return _error_response(403, PermissionDenied.default_detail)
+
+    data = await _list_trips(request)
+
+    return FALLBACK if data is FALLBACK else _drf_response(data, allow='GET, POST, HEAD, OPTIONS')
+
+
+async def retrieve_trip(request: AsyncRequest) -> Optional[HttpResponse]:
+    """
+    Async counterpart of TripViewSet.retrieve
+    """
+
+    if not set(request.query_params).issubset(TripViewSet.filterset_class.base_filters):
+        return FALLBACK
+    if not check_permissions(request, TripViewSet, 'retrieve'):
+        return _error_response(403, PermissionDenied.default_detail)
+
+    data = await _retrieve_trip(request)
+
+    # Trips missing from the trip table may have been archived, the view looks them up in the archive
+    if not data:
+        return FALLBACK
+
+    return _drf_response(data)
+
+
+@database_sync_to_async
+def _get_user(pk: str) -> Optional[User]:
+    return User.objects.filter(pk=pk).first()
+
+
+@database_sync_to_async
+def _get_ticket_user(ticket: str, owner_id: str) -> Optional[User]:
+    payload = read_stream_ticket(ticket, int(owner_id))
+
+    if payload is None:
+        return None
+
+    user = User.objects.filter(pk=payload['user'], is_active=True).first()
+
+    # Revoking all tokens of the user revokes the tickets issued for them too
+    return user if user is not None and user.token_version == payload['version'] else None
+
+
+def _format_event(event: dict) -> bytes:
+    data = CamelCaseJSONRenderer().render(event['data'])
+
+    return f'id: {event["id"]}\nevent: {event["type"]}\ndata: '.encode() + data + b'\n\n'
+
+
+async def _wait_for_disconnect(receive: Callable) -> None:
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def _send_response(send: Callable, response: HttpResponse) -> None:
+    response['Content-Length'] = str(len(response.content))
+    headers = [(name.encode('latin1'), value.encode('latin1')) for name, value in response.items()]
+
+    await send({'type': 'http.response.start', 'status': response.status_code, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': response.content})
+
+
+async def stream_trip_events(request: AsyncRequest, receive: Callable, send: Callable) -> None:
+    """
+    Streams created, updated and deleted events of the trips of a user as server-sent events.
+    A client reconnecting with Last-Event-ID receives the events it missed, or a reset event if they are
+    no longer known and the trips have to be reloaded. Clients falling behind by more than
+    TRIP_EVENTS_CLIENT_BUFFER_SIZE events are disconnected and resume the same way.
+    """
+
+    # EventSource cannot send headers, so clients pass a short-lived ticket instead (see make_stream_ticket).
+    # The token itself is accepted as a query parameter only where allowed, as query strings end up in access logs
+    if 'authorization' not in request.headers and 'ticket' in request.query_params:
+        request.user = await _get_ticket_user(request.query_params['ticket'], request.kwargs['user_pk'])
+    else:
+        if settings.TRIP_EVENTS_QUERY_TOKEN and 'authorization' not in request.headers and 'token' in request.query_params:
+            request.headers['authorization'] = f'{api_settings.JWT_AUTH_HEADER_PREFIX} {request.query_params["token"]}'
+
+        request.user = await authenticate(request)
+
+    if request.user is None:
+        await _send_response(send, _error_response(401, NotAuthenticated.default_detail))
+        return
+
+    # The stream is the live view of the trip list, so it is allowed to exactly the callers of TripViewSet.list
+    if not check_permissions(request, TripViewSet, 'list'):
+        await _send_response(send, _error_response(403, PermissionDenied.default_detail))
+        return
+
+    owner = await _get_user(request.kwargs['user_pk'])
+
+    if owner is None:
+        await _send_response(send, _error_response(404, NotFound.default_detail))
+        return
+
+    broker = get_broker()
+    last_event_id = request.headers.get('last-event-id') or request.query_params.get('lastEventId')
+    subscription = broker.subscribe(owner.id, last_event_id)
+    body = b'retry: 3000\n\n'
+
+    if subscription is None:
+        subscription = broker.subscribe(owner.id)
+        body += b'event: reset\ndata: {}\n\n'
+
+    response = CorsMiddleware().process_response(request, HttpResponse(content_type='text/event-stream'))
+    response['Cache-Control'] = 'no-cache'
+    # Disables response buffering of nginx
+    response['X-Accel-Buffering'] = 'no'
+    headers = [(name.encode('latin1'), value.encode('latin1')) for name, value in response.items()]
+    disconnected = asyncio.ensure_future(_wait_for_disconnect(receive))
+
+    try:
+        await send({'type': 'http.response.start', 'status': 200, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+
+        while True:
+            events = asyncio.ensure_future(subscription.get(settings.TRIP_EVENTS_HEARTBEAT_INTERVAL))
+            await asyncio.wait([events, disconnected], return_when=asyncio.FIRST_COMPLETED)
+
+            if disconnected.done():
+                events.cancel()
+                return
+
+            body = b''.join(_format_event(event) for event in events.result()) or b': heartbeat\n\n'
+            await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+
+            if subscription.overflowed:
+                break
+
+        await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        broker.unsubscribe(subscription)
+        disconnected.cancel()
+
+
+class AsyncReadApplication:
+    """
+    ASGI application serving the hot read endpoints natively on the event loop.
+    Every other request, and every request the async endpoints cannot answer exactly like the Django stack
+    (unauthenticated requests, non-JSON content negotiation, pagination, invalid filters, archived trips),
+    is delegated to the wrapped Django application.
+    """
+
+    routes: List[Tuple[Pattern, Callable[[AsyncRequest], Awaitable[Optional[HttpResponse]]]]] = [
+        (re.compile(r'^/api/auth/user/$'), current_user),
+        (re.compile(r'^/api/users/(?P<pk>\d+)/$'), retrieve_user),
+        (re.compile(r'^/api/users/(?P<user_pk>\d+)/trips/$'), list_trips),
+        (re.compile(r'^/api/users/(?P<user_pk>\d+)/trips/(?P<pk>\d+)/$'), retrieve_trip),
+    ]
+
+    stream_route: Pattern = re.compile(r'^/api/users/(?P<user_pk>\d+)/trips/stream/?$')
+
+    def __init__(self, application: ASGIApplication) -> None:
+        self._application: ASGIApplication = application
+        self._logger: logging.Logger = logging.getLogger(__name__)
+
+    def _match(self, path: str) -> Tuple[Optional[Callable], Dict[str, str]]:
+        for pattern, endpoint in self.routes:
+            match = pattern.match(path)
+
+            if match:
+                return endpoint, match.groupdict()
+
+        return None, {}
+
+    async def _handle(self, scope: dict) -> Optional[HttpResponse]:
+        endpoint, kwargs = self._match(scope['path'])
+
+        if endpoint is None:
+            return FALLBACK
+
+        request = AsyncRequest.from_scope(scope)
+        request.kwargs = kwargs
+
+        if not _accepts_json(request):
+            return FALLBACK
+
+        request.user = await authenticate(request)
+
+        if request.user is None:
+            return FALLBACK
+
+        response = await endpoint(request)
+
+        if response is not FALLBACK:
+            response = CorsMiddleware().process_response(request, response)
+
+            if settings.SECURE_CONTENT_TYPE_NOSNIFF:
+                response['X-Content-Type-Options'] = 'nosniff'
+            response['X-Frame-Options'] = getattr(settings, 'X_FRAME_OPTIONS', 'DENY').upper()
+            # Compression is CPU-bound and would stall the event loop for large bodies
+            response = await sync_to_async(CompressionMiddleware().process_response, thread_sensitive=False)(
+                request, response)
+
+        return response
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        response = FALLBACK
+
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            match = self.stream_route.match(scope['path'])
+
+            if match and settings.TRIP_EVENTS_ENABLED:
+                request = AsyncRequest.from_scope(scope)
+                request.kwargs = match.groupdict()
+
+                await stream_trip_events(request, receive, send)
+                return
+
+            if settings.ASYNC_READ_ENDPOINTS:
+                response = await self._handle(scope)
+
+        if response is FALLBACK:
+            await self._application(scope, receive, send)
+            return
+
+        await _send_response(send, response)
@@ -0,0 +1,43 @@
+import jwt
+from django.utils.translation import gettext as _
+from rest_framework import exceptions
+from rest_framework_jwt import authentication
+from rest_framework_jwt.settings import api_settings
+
+from .tokens import RevokedTokenError, is_token_version_current
+
+jwt_decode_handler = api_settings.JWT_DECODE_HANDLER
+
+
+class JSONWebTokenAuthentication(authentication.JSONWebTokenAuthentication):
+    """
+    JWT authentication rejecting revoked tokens. Single tokens are rejected by the in-process denylist
+    in the decode handler, tokens revoked by "logout everywhere" by comparing their version
+    with the version of the user, who is loaded anyway.
+    """
+
+    def authenticate(self, request) -> tuple:
+        jwt_value = self.get_jwt_value(request)
+
+        if jwt_value is None:
+            return None
+
+        try:
+            payload = jwt_decode_handler(jwt_value)
+        except RevokedTokenError:
+            raise exceptions.AuthenticationFailed(_('Token has been revoked.'))
+        except jwt.ExpiredSignature:
+            raise exceptions.AuthenticationFailed(_('Signature has expired.'))
+        except jwt.DecodeError:
+            raise exceptions.AuthenticationFailed(_('Error decoding signature.'))
+        except jwt.InvalidTokenError:
+            raise exceptions.AuthenticationFailed()
+
+        user = self.authenticate_credentials(payload)
+
+        if not is_token_version_current(payload, user):
+            raise exceptions.AuthenticationFailed(_('Token has been revoked.'))
+
+        request.jwt_payload = payload
+
+        return user, jwt_value
@@ -0,0 +1,229 @@
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from .models import RoleEnum, User
+from .routers import get_read_database
+
+# Incremented whenever a transaction writing users or trips commits in this process. Requests arriving after
+# the commit do not join computations which may have read the data before it
+_generation: int = 0
+_generation_lock = threading.Lock()
+
+
+def next_generation() -> None:
+    global _generation
+
+    with _generation_lock:
+        _generation += 1
+
+
+def get_coalescing_key(*parts: Hashable) -> tuple:
+    """
+    Builds the key under which identical reads are coalesced
+
+    :param parts: Whatever the response depends on: endpoint, URL, media type, permission scope
+    :return: @parts completed with the database the reads are routed to and the current write generation
+    """
+
+    # Users pinned to the primary after a write must not receive a response read from a lagging replica
+    return (*parts, get_read_database() is None, _generation)
+
+
+def get_user_scope(user: User) -> str:
+    """
+    Returns the part of the coalescing key standing for the users visible to @user (see UserFilterBackend):
+    USERs only see themselves, MANAGERs and ADMINs see the same users as every other MANAGER or ADMIN
+    """
+
+    if user.role == RoleEnum.USER:
+        return f'user:{user.id}'
+
+    return f'role:{user.role}'
+
+
+@dataclass
+class Flight:
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Any = None
+    succeeded: bool = False
+    followers: int = 0
+
+
+@dataclass(frozen=True)
+class SharedResponse:
+    """
+    Rendered response handed to the requests coalesced with the one which computed it
+    """
+
+    status: int
+    content: bytes
+    headers: Tuple[Tuple[str, str], ...]
+
+    @classmethod
+    def from_response(cls, response: Response) -> 'SharedResponse':
+        return cls(response.status_code, response.content, tuple(response.items()))
+
+    def to_response(self) -> HttpResponse:
+        response = HttpResponse(self.content, status=self.status)
+
+        for name, value in self.headers:
+            response[name] = value
+
+        return response
+
+
+class RequestCoalescer:
+    """
+    Single-flight execution of identical reads: the first request for a key computes the result, requests
+    arriving with the same key while it is in flight wait for it and share it instead of repeating the queries
+    and the serialization. Results are not kept once the computation finished, this is not a cache.
+    Requests waiting longer than the timeout, or whose computation failed, compute the result themselves.
+    """
+
+    def __init__(self) -> None:
+        self._flights: Dict[Hashable, Flight] = {}
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {'leaders': 0, 'followers': 0, 'timeouts': 0, 'failures': 0}
+        self._logger: logging.Logger = logging.getLogger(__name__)
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            requests = self._stats['leaders'] + self._stats['followers']
+
+            return dict(
+                self._stats, in_flight=len(self._flights),
+                coalesced_rate=self._stats['followers'] / requests if requests else 0.0)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def run(self, key: Hashable, compute: Callable[[], Any], timeout: Optional[float] = None) -> Tuple[Any, bool]:
+        """
+        Computes the result for @key, or waits for the computation of a concurrent request with the same key
+
+        :param key: Key identifying identical requests, see get_coalescing_key
+        :param compute: Function computing the result, it must not depend on anything not in @key
+        :param timeout: Seconds to wait for a concurrent computation, None waits forever
+        :return: Result and a boolean value indicating whether it was computed by this call
+        """
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+
+            if leader:
+                flight = self._flights[key] = Flight()
+                self._stats['leaders'] += 1
+            else:
+                flight.followers += 1
+
+        if leader:
+            try:
+                flight.result = compute()
+                flight.succeeded = True
+
+                return flight.result, True
+            finally:
+                with self._lock:
+                    del self._flights[key]
+
+                flight.done.set()
+
+                if flight.followers:
+                    self._logger.debug(f'Shared the result of {key} with {flight.followers} requests')
+
+        if not flight.done.wait(timeout):
+            self._count('timeouts')
+            self._logger.warning(f'Gave up waiting for {key} after {timeout} s')
+        elif not flight.succeeded:
+            self._count('failures')
+        else:
+            self._count('followers')
+
+            return flight.result, False
+
+        return compute(), True
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats = {'leaders': 0, 'followers': 0, 'timeouts': 0, 'failures': 0}
+
+
+coalescer = RequestCoalescer()
+
+
+def is_coalescing_enabled() -> bool:
+    return getattr(settings, 'REQUEST_COALESCING', False)
+
+
+def coalesce(key: Hashable, compute: Callable[[], Any]) -> Any:
+    """
+    Runs @compute once for concurrent calls with the same @key if REQUEST_COALESCING is enabled
+
+    :param key: Key identifying identical requests, see get_coalescing_key
+    :param compute: Function computing the result
+    :return: Result of @compute, possibly computed by a concurrent call
+    """
+
+    if not is_coalescing_enabled():
+        return compute()
+
+    return coalescer.run(key, compute, settings.REQUEST_COALESCING_TIMEOUT)[0]
+
+
+class CoalescingReadMixin:
+    """
+    View mixin coalescing concurrent identical requests to the actions listed in coalesced_actions.
+    Authentication, permission checks and throttling run for every request, the queries, the serialization
+    and the rendering only once per key. Views define the permission scope of the key in get_coalescing_scope.
+    """
+
+    coalesced_actions = ('list', 'retrieve')
+
+    def get_coalescing_scope(self, request: Request) -> Hashable:
+        """
+        Returns what the response depends on besides the URL and the media type: requests with the same scope
+        are allowed to share the response. The originator by default, views narrow it down.
+        """
+
+        return request.user.id
+
+    def _coalesce(self, handler: Callable[..., Response], request: Request, *args, **kwargs) -> HttpResponse:
+        # The browsable API renders the originator and its forms into the page
+        if (not is_coalescing_enabled() or self.action not in self.coalesced_actions
+                or isinstance(request.accepted_renderer, BrowsableAPIRenderer)):
+            return handler(request, *args, **kwargs)
+
+        def render() -> Tuple[Response, SharedResponse]:
+            response = handler(request, *args, **kwargs)
+            # What finalize_response would do, the rendered bytes are shared
+            response.accepted_renderer = request.accepted_renderer
+            response.accepted_media_type = request.accepted_media_type
+            response.renderer_context = self.get_renderer_context()
+            response.render()
+
+            return response, SharedResponse.from_response(response)
+
+        key = get_coalescing_key(
+            type(self).__name__, self.action, request.method, request.build_absolute_uri(), request.accepted_media_type,
+            self.get_coalescing_scope(request))
+        (response, shared), computed = coalescer.run(key, render, settings.REQUEST_COALESCING_TIMEOUT)
+
+        # The computing request keeps its DRF response, e.g. for the data attribute used by tests
+        return response if computed else shared.to_response()
+
+    def list(self, request: Request, *args, **kwargs) -> HttpResponse:
+        return self._coalesce(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request: Request, *args, **kwargs) -> HttpResponse:
+        return self._coalesce(super().retrieve, request, *args, **kwargs)
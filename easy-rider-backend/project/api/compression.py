@@ -0,0 +1,261 @@
+import hashlib
+import logging
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+_logger: logging.Logger = logging.getLogger(__name__)
+
+
+class Codec:
+    """
+    Content coding of the Content-Encoding header
+    """
+
+    name: str = ''
+
+    def __init__(self, level: int) -> None:
+        self.level: int = level
+
+    def compress(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+    def compress_stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Compresses the chunks incrementally. Every chunk is flushed, so a consumer of a streamed response
+        (e.g. an event stream) receives it without waiting for the following ones
+        """
+
+        raise NotImplementedError
+
+
+class GzipCodec(Codec):
+    name = 'gzip'
+
+    def _compressor(self):
+        # wbits=31 writes the gzip container with a zero mtime, so equal bodies compress to equal bytes
+        return zlib.compressobj(self.level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        compressor = self._compressor()
+
+        return compressor.compress(data) + compressor.flush()
+
+    def compress_stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        compressor = self._compressor()
+
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+            if data:
+                yield data
+
+        yield compressor.flush()
+
+
+class BrotliCodec(Codec):
+    name = 'br'
+
+    def compress(self, data: bytes) -> bytes:
+        return brotli.compress(data, quality=self.level)
+
+    def compress_stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        compressor = brotli.Compressor(quality=self.level)
+
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+
+            if data:
+                yield data
+
+        yield compressor.finish()
+
+
+class ZstdCodec(Codec):
+    name = 'zstd'
+
+    def compress(self, data: bytes) -> bytes:
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def compress_stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        compressor = zstandard.ZstdCompressor(level=self.level).compressobj()
+
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+            if data:
+                yield data
+
+        yield compressor.flush()
+
+
+# Codecs by content coding, brotli and zstd only when their optional packages are installed
+CODECS: Dict[str, type] = {'gzip': GzipCodec}
+
+if brotli is not None:
+    CODECS['br'] = BrotliCodec
+
+if zstandard is not None:
+    CODECS['zstd'] = ZstdCodec
+
+DEFAULT_LEVELS = {'gzip': 6, 'br': 4, 'zstd': 3}
+
+
+def get_codecs(encodings: Iterable[str], levels: Optional[Dict[str, int]] = None) -> List[Codec]:
+    """
+    Instantiates the available codecs of @encodings, keeping their order of preference
+
+    :param encodings: Content codings in order of preference
+    :param levels: Optional compression levels by content coding
+    :return: List of codecs
+    """
+
+    levels = {**DEFAULT_LEVELS, **(levels or {})}
+    codecs = []
+
+    for encoding in encodings:
+        if encoding not in CODECS:
+            _logger.debug(f'Content coding {encoding} is not available')
+            continue
+
+        codecs.append(CODECS[encoding](levels.get(encoding, DEFAULT_LEVELS.get(encoding))))
+
+    return codecs
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """
+    Parses an Accept-Encoding header into quality values by content coding
+
+    :param header: Value of the header, e.g. "br;q=1.0, gzip;q=0.8, *;q=0.1"
+    :return: Quality values by lowercased content coding
+    """
+
+    qualities = {}
+
+    for item in header.split(','):
+        encoding, _, parameters = item.partition(';')
+        encoding = encoding.strip().lower()
+
+        if not encoding:
+            continue
+
+        quality = 1.0
+        parameter, _, value = parameters.partition('=')
+
+        if parameter.strip().lower() == 'q':
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+
+        qualities[encoding] = quality
+
+    return qualities
+
+
+def negotiate(header: str, codecs: List[Codec]) -> Optional[Codec]:
+    """
+    Picks the codec with the highest quality value accepted by the client,
+    ties are broken by the order of preference of @codecs
+
+    :param header: Value of the Accept-Encoding header
+    :param codecs: Available codecs in order of preference
+    :return: Codec or None if the body has to be sent uncompressed
+    """
+
+    qualities = parse_accept_encoding(header)
+    default_quality = qualities.get('*', 0.0)
+    best_codec, best_quality = None, 0.0
+
+    for codec in codecs:
+        quality = qualities.get(codec.name, default_quality)
+
+        if quality > best_quality:
+            best_codec, best_quality = codec, quality
+
+    return best_codec
+
+
+class CompressedBodyCache:
+    """
+    Bounded LRU cache of compressed bodies keyed by the content coding and the SHA-256 digest of the body.
+    Hashing is two orders of magnitude cheaper than compressing, so bodies served repeatedly
+    (cached responses, popular unchanged lists) are compressed once per content coding.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self._max_bytes: int = max_bytes
+        self._size: int = 0
+        self._entries: 'OrderedDict[Tuple[str, bytes], bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats, size=len(self._entries), bytes=self._size)
+
+    def compress(self, codec: Codec, body: bytes) -> bytes:
+        """
+        Returns the compressed body from the cache or compresses and stores it
+
+        :param codec: Codec
+        :param body: Uncompressed body
+        :return: Compressed body
+        """
+
+        if self._max_bytes <= 0:
+            return codec.compress(body)
+
+        key = (codec.name, hashlib.sha256(body).digest())
+
+        with self._lock:
+            compressed = self._entries.get(key)
+
+            if compressed is not None:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+
+                return compressed
+
+            self._stats['misses'] += 1
+
+        compressed = codec.compress(body)
+
+        if len(compressed) > self._max_bytes:
+            return compressed
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = compressed
+                self._size += len(compressed)
+
+            while self._size > self._max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self._stats['evictions'] += 1
+
+        return compressed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+
+compressed_bodies = CompressedBodyCache(getattr(settings, 'COMPRESSION_CACHE_SIZE', 0))
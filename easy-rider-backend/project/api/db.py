@@ -0,0 +1,202 @@
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DatabaseError, connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+_logger: logging.Logger = logging.getLogger(__name__)
+
+# Number of SQLite virtual machine instructions between two deadline checks
+SQLITE_PROGRESS_HANDLER_PERIOD = 1000
+
+SQLITE_PRAGMA_NAME = re.compile(r'^[a-z_]+$')
+SQLITE_PRAGMA_VALUE = re.compile(r'^-?[A-Za-z0-9_]+$')
+
+SQLITE_CHECKPOINT_MODES = ('PASSIVE', 'FULL', 'RESTART', 'TRUNCATE')
+
+_maintenance_lock = threading.Lock()
+_last_maintenance: float = time.monotonic()
+
+
+def check_connection_health(**kwargs) -> None:
+    """
+    request_started receiver closing persistent connections which are no longer usable
+    (e.g. after a database restart or a failover), so the request opens a fresh one
+    instead of failing on a dead socket. Only connections that are already open are checked.
+    """
+
+    for connection in connections.all():
+        if connection.connection is None or connection.settings_dict['CONN_MAX_AGE'] == 0:
+            continue
+
+        if not connection.is_usable():
+            _logger.warning(f'Closing unusable persistent connection to {connection.alias}')
+            connection.close()
+
+
+@contextmanager
+def statement_timeout(timeout: Optional[int], using: str = 'default') -> Iterator[None]:
+    """
+    Limits the execution time of every statement executed within the block.
+    PostgreSQL enforces the limit server-side through statement_timeout,
+    SQLite interrupts the running statement from its progress handler.
+
+    :param timeout: Timeout in milliseconds, None or 0 disables the limit
+    :param using: Database alias
+    """
+
+    if not timeout:
+        yield
+        return
+
+    connection = connections[using]
+
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SET statement_timeout = %s', [int(timeout)])
+
+        try:
+            yield
+        finally:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute('RESET statement_timeout')
+            except DatabaseError:
+                # The setting must never leak to the next request using this persistent connection
+                connection.close()
+    elif connection.vendor == 'sqlite':
+        deadline = time.monotonic() + timeout / 1000
+
+        connection.ensure_connection()
+        connection.connection.set_progress_handler(
+            lambda: int(time.monotonic() > deadline), SQLITE_PROGRESS_HANDLER_PERIOD)
+
+        try:
+            yield
+        finally:
+            if connection.connection is not None:
+                connection.connection.set_progress_handler(None, 0)
+    else:
+        _logger.debug(f'Statement timeouts are not supported by {connection.vendor}')
+
+        yield
+
+
+def configure_sqlite_connection(sender: type, connection: BaseDatabaseWrapper, **kwargs) -> None:
+    """
+    connection_created receiver applying SQLITE_PRAGMAS to every new SQLite connection.
+    busy_timeout is applied first, so switching the journal mode waits for concurrent writers instead of failing.
+    """
+
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+
+    if connection.vendor != 'sqlite' or not pragmas:
+        return
+
+    for name, value in sorted(pragmas.items(), key=lambda pragma: pragma[0] != 'busy_timeout'):
+        if not SQLITE_PRAGMA_NAME.match(name) or not SQLITE_PRAGMA_VALUE.match(str(value)):
+            raise ImproperlyConfigured(f'Invalid SQLite pragma {name}={value}')
+
+        # The raw connection is used as PRAGMA does not support parameters and must not show up in query logs
+        connection.connection.execute(f'PRAGMA {name} = {value}')
+
+
+def run_sqlite_maintenance(
+        using: str = 'default', analyze: bool = False, checkpoint_mode: str = 'PASSIVE') -> Optional[Tuple[int, int, int]]:
+    """
+    Refreshes query planner statistics and checkpoints the write-ahead log of a SQLite database.
+    PRAGMA optimize only analyzes tables whose statistics are missing or outdated, ANALYZE rebuilds all of them.
+
+    :param using: Database alias
+    :param analyze: Rebuild statistics of all tables and indexes
+    :param checkpoint_mode: Checkpoint mode, PASSIVE never blocks readers or writers
+    :return: Result of the checkpoint (busy, WAL frames, checkpointed frames) or None if the database is not SQLite
+    """
+
+    connection = connections[using]
+
+    if connection.vendor != 'sqlite':
+        return None
+
+    if checkpoint_mode.upper() not in SQLITE_CHECKPOINT_MODES:
+        raise ValueError(f'Unknown checkpoint mode {checkpoint_mode}')
+
+    with connection.cursor() as cursor:
+        if analyze:
+            cursor.execute('ANALYZE')
+
+        cursor.execute('PRAGMA optimize')
+        cursor.execute(f'PRAGMA wal_checkpoint({checkpoint_mode.upper()})')
+
+        return tuple(cursor.fetchone())
+
+
+def schedule_sqlite_maintenance(**kwargs) -> None:
+    """
+    request_finished receiver running run_sqlite_maintenance on the SQLite databases
+    at most once per SQLITE_MAINTENANCE_INTERVAL seconds in every worker process
+    """
+
+    global _last_maintenance
+
+    interval = getattr(settings, 'SQLITE_MAINTENANCE_INTERVAL', 0)
+
+    if interval <= 0 or time.monotonic() - _last_maintenance < interval:
+        return
+
+    # Concurrent requests of a threaded worker must not run the maintenance twice
+    if not _maintenance_lock.acquire(blocking=False):
+        return
+
+    try:
+        _last_maintenance = time.monotonic()
+
+        for connection in connections.all():
+            # Databases the request did not use are not connected just for the maintenance
+            if connection.vendor == 'sqlite' and connection.connection is not None:
+                try:
+                    run_sqlite_maintenance(connection.alias)
+                except DatabaseError as error:
+                    _logger.warning(f'SQLite maintenance of {connection.alias} failed: {error}')
+    finally:
+        _maintenance_lock.release()
+
+
+def estimate_row_count(table: str, using: str = 'default') -> Optional[int]:
+    """
+    Reads the number of rows of a table from the statistics of the query planner instead of counting them.
+    PostgreSQL keeps them up to date with autovacuum, SQLite only after ANALYZE (see run_sqlite_maintenance).
+
+    :param table: Table name
+    :param using: Database alias
+    :return: Estimated number of rows or None if the table has no statistics
+    """
+
+    connection = connections[using]
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT reltuples FROM pg_class WHERE oid = to_regclass(%s)', [table])
+            row = cursor.fetchone()
+
+            # -1 or 0 until the table has been vacuumed or analyzed
+            return int(row[0]) if row and row[0] > 0 else None
+        elif connection.vendor == 'sqlite':
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+
+            if cursor.fetchone() is None:
+                return None
+
+            # The first number of the statistics of any index of the table is its number of rows
+            cursor.execute('SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1', [table])
+            row = cursor.fetchone()
+
+            return int(row[0].split()[0]) if row else None
+
+    return None
@@ -0,0 +1,321 @@
+import asyncio
+import itertools
+import json
+import logging
+import secrets
+import select
+import threading
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Set
+
+from django.conf import settings
+from django.core import signing
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.module_loading import import_string
+
+from .models import Trip, User
+
+_broker: Optional['TripEventBroker'] = None
+_broker_lock = threading.Lock()
+
+# Event IDs are unique across processes: a random prefix per process and a counter
+_process_id: str = secrets.token_hex(4)
+_sequence = itertools.count(1)
+
+CREATED, UPDATED, DELETED = 'created', 'updated', 'deleted'
+
+TICKET_SALT = 'project.api.events.stream_ticket'
+
+
+class EventBackend:
+    """
+    Transport of trip events between the processes serving event streams.
+    publish() sends an event to all processes, including the current one, which hand it to deliver()
+    """
+
+    def start(self, deliver: Callable[[dict], None]) -> None:
+        raise NotImplementedError
+
+    def publish(self, event: dict) -> None:
+        raise NotImplementedError
+
+    def stop(self) -> None:
+        pass
+
+
+class LocalBackend(EventBackend):
+    """
+    Delivers events within the current process only. Enough for a single ASGI worker, for development and tests
+    """
+
+    def __init__(self) -> None:
+        self._deliver: Optional[Callable[[dict], None]] = None
+
+    def start(self, deliver: Callable[[dict], None]) -> None:
+        self._deliver = deliver
+
+    def publish(self, event: dict) -> None:
+        if self._deliver is not None:
+            self._deliver(event)
+
+
+class PostgresBackend(EventBackend):
+    """
+    Delivers events to all processes using LISTEN/NOTIFY of the PostgreSQL default database.
+    Every process listens on a dedicated connection in a daemon thread and reconnects after failures.
+    """
+
+    channel = 'easy_rider_trip_events'
+
+    # NOTIFY payloads are limited to 8000 bytes, larger events are sent without the trip which clients refetch
+    max_payload_size = 7900
+
+    def __init__(self) -> None:
+        self._deliver: Optional[Callable[[dict], None]] = None
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._logger: logging.Logger = logging.getLogger(__name__)
+
+    def start(self, deliver: Callable[[dict], None]) -> None:
+        self._deliver = deliver
+        self._thread = threading.Thread(target=self._listen, name='trip-events-listener', daemon=True)
+        self._thread.start()
+
+    def publish(self, event: dict) -> None:
+        payload = json.dumps(event)
+
+        if len(payload.encode()) > self.max_payload_size:
+            payload = json.dumps(dict(event, data={'id': event['data']['id']}))
+
+        with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [self.channel, payload])
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _listen(self) -> None:
+        import psycopg2
+
+        params = connections[DEFAULT_DB_ALIAS].get_connection_params()
+        delay = 1
+
+        while not self._stopped.is_set():
+            try:
+                connection = psycopg2.connect(**params)
+                connection.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+
+                with connection.cursor() as cursor:
+                    cursor.execute(f'LISTEN {self.channel}')
+
+                self._logger.info(f'Listening to {self.channel}')
+                delay = 1
+
+                while not self._stopped.is_set():
+                    if select.select([connection], [], [], 5) == ([], [], []):
+                        continue
+
+                    connection.poll()
+
+                    while connection.notifies:
+                        self._deliver(json.loads(connection.notifies.pop(0).payload))
+            except Exception:
+                self._logger.exception(f'Listening to {self.channel} failed, reconnecting in {delay} seconds')
+                self._stopped.wait(delay)
+                delay = min(delay * 2, 30)
+
+
+class Subscription:
+    """
+    Bounded buffer of the events of one stream. Events are pushed on the event loop of the stream,
+    a subscriber falling more than max_size events behind is marked as overflowed and has to resume later
+    """
+
+    def __init__(self, user_id: int, loop: asyncio.AbstractEventLoop, max_size: int) -> None:
+        self.user_id: int = user_id
+        self.overflowed: bool = False
+        self._loop: asyncio.AbstractEventLoop = loop
+        self._max_size: int = max_size
+        self._events: Deque[dict] = deque()
+        self._ready = asyncio.Event()
+
+    def push(self, event: dict) -> None:
+        if len(self._events) >= self._max_size:
+            self.overflowed = True
+        else:
+            self._events.append(event)
+
+        self._ready.set()
+
+    def push_threadsafe(self, event: dict) -> None:
+        self._loop.call_soon_threadsafe(self.push, event)
+
+    async def get(self, timeout: float) -> List[dict]:
+        """
+        Waits for events
+
+        :param timeout: Seconds to wait
+        :return: Buffered events, empty if none arrived in time
+        """
+
+        if not self._events and not self.overflowed:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+
+        self._ready.clear()
+        events = list(self._events)
+        self._events.clear()
+
+        return events
+
+
+class TripEventBroker:
+    """
+    Fans trip events delivered by the backend out to the subscriptions of the trips' users
+    and keeps the most recent events for subscribers resuming after a disconnect
+    """
+
+    def __init__(self, backend: EventBackend, history_size: int, buffer_size: int) -> None:
+        """
+        :param backend: Transport of events between processes
+        :param history_size: Number of recent events kept for resumption
+        :param buffer_size: Maximum number of events buffered per subscription
+        """
+
+        self._backend: EventBackend = backend
+        self._buffer_size: int = buffer_size
+        self._history: Deque[dict] = deque(maxlen=history_size)
+        self._subscriptions: Dict[int, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._logger: logging.Logger = logging.getLogger(__name__)
+
+        self._backend.start(self.deliver)
+
+    def publish(self, event: dict) -> None:
+        try:
+            self._backend.publish(event)
+        except Exception:
+            # Streams are a best-effort notification, the change itself is already committed
+            self._logger.exception(f'Trip event {event["id"]} could not be published')
+
+    def deliver(self, event: dict) -> None:
+        with self._lock:
+            self._history.append(event)
+
+            for subscription in list(self._subscriptions.get(event['user'], ())):
+                try:
+                    subscription.push_threadsafe(event)
+                except RuntimeError:
+                    # The event loop of the subscriber has been closed without unsubscribing
+                    self._subscriptions[event['user']].discard(subscription)
+
+    def subscribe(self, user_id: int, last_event_id: Optional[str] = None) -> Optional[Subscription]:
+        """
+        Subscribes the running event loop to the trip events of a user
+
+        :param user_id: ID of the user whose trips are watched
+        :param last_event_id: ID of the last event received before a reconnect, its successors are replayed
+        :return: Subscription or None if @last_event_id is no longer known and the subscriber has to reload the trips
+        """
+
+        subscription = Subscription(user_id, asyncio.get_event_loop(), self._buffer_size)
+
+        with self._lock:
+            if last_event_id is not None:
+                ids = [event['id'] for event in self._history]
+
+                if last_event_id not in ids:
+                    return None
+
+                for event in itertools.islice(self._history, ids.index(last_event_id) + 1, None):
+                    if event['user'] == user_id:
+                        subscription.push(event)
+
+            self._subscriptions.setdefault(user_id, set()).add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id, set())
+            subscriptions.discard(subscription)
+
+            if not subscriptions:
+                self._subscriptions.pop(subscription.user_id, None)
+
+    def stop(self) -> None:
+        self._backend.stop()
+
+
+def get_broker() -> TripEventBroker:
+    global _broker
+
+    with _broker_lock:
+        if _broker is None:
+            _broker = TripEventBroker(
+                import_string(settings.TRIP_EVENTS_BACKEND)(),
+                settings.TRIP_EVENTS_HISTORY_SIZE,
+                settings.TRIP_EVENTS_CLIENT_BUFFER_SIZE)
+
+        return _broker
+
+
+def reset_broker() -> None:
+    global _broker
+
+    with _broker_lock:
+        if _broker is not None:
+            _broker.stop()
+
+        _broker = None
+
+
+def build_event(event_type: str, trip: Trip) -> dict:
+    """
+    Builds the event of a change of a trip
+
+    :param event_type: One of created, updated and deleted
+    :param trip: Changed trip
+    :return: JSON-serializable event
+    """
+
+    from .serializers import TripSerializer
+
+    return {
+        'id': f'{_process_id}-{next(_sequence)}',
+        'type': event_type,
+        'user': trip.user_id,
+        'data': dict(TripSerializer(trip).data) if event_type != DELETED else {'id': trip.pk},
+    }
+
+
+def make_stream_ticket(user: User, owner_id: int) -> str:
+    """
+    Signs a ticket opening the event stream of the trips of @owner_id for @user. EventSource cannot send
+    the Authorization header, so clients fetch a ticket with their JWT and pass it in the URL of the stream instead.
+    Tickets expire after TRIP_EVENTS_TICKET_TTL seconds and when all tokens of the user are revoked
+
+    :param user: Authenticated user allowed to list the trips of @owner_id
+    :param owner_id: ID of the user whose trips are streamed
+    :return: URL-safe ticket
+    """
+
+    return signing.dumps({'user': user.id, 'owner': int(owner_id), 'version': user.token_version}, salt=TICKET_SALT)
+
+
+def read_stream_ticket(ticket: str, owner_id: int) -> Optional[dict]:
+    """
+    Verifies a ticket made by make_stream_ticket for the stream of the trips of @owner_id
+
+    :param ticket: Ticket passed by the client
+    :param owner_id: ID of the user whose trips are requested
+    :return: Payload with the user ID and token version, or None if the ticket is invalid, expired or for another stream
+    """
+
+    try:
+        payload = signing.loads(ticket, salt=TICKET_SALT, max_age=settings.TRIP_EVENTS_TICKET_TTL)
+    except signing.BadSignature:
+        return None
+
+    return payload if payload.get('owner') == int(owner_id) else None
@@ -0,0 +1,126 @@
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import QuerySet
+from djangorestframework_camel_case.util import camel_to_underscore
+from rest_framework import serializers
+from rest_framework.fields import Field
+from rest_framework.request import Request
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Actions whose querysets are projected to the requested columns
+PROJECTED_ACTIONS = ('list', 'retrieve')
+
+
+def _parse_names(request: Optional[Request], parameter: str) -> Optional[FrozenSet[str]]:
+    if request is None or request.method not in SAFE_METHODS or parameter not in request.query_params:
+        return None
+
+    # Clients see camelCase names, so both startDate and start_date are accepted
+    return frozenset(
+        camel_to_underscore(name.strip())
+        for name in request.query_params[parameter].split(',')
+        if name.strip())
+
+
+def get_requested_fields(request: Optional[Request]) -> Optional[FrozenSet[str]]:
+    """
+    Returns the field names listed in the fields query parameter of a read request (e.g. ?fields=id,startDate)
+
+    :param request: Incoming request
+    :return: Set of field names or None if all fields are requested
+    """
+
+    return _parse_names(request, 'fields')
+
+
+def get_requested_includes(request: Optional[Request]) -> FrozenSet[str]:
+    """
+    Returns the relation names listed in the include query parameter of a read request (e.g. ?include=trips)
+
+    :param request: Incoming request
+    :return: Set of relation names
+    """
+
+    return _parse_names(request, 'include') or frozenset()
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    Serializer mixin rendering only the fields requested by ?fields= and adding the relations
+    requested by ?include= from get_included_fields(). Writes always use all fields.
+    """
+
+    def get_included_fields(self) -> Dict[str, Field]:
+        """
+        Returns the relations which can be embedded by ?include=, keyed by their names
+        """
+
+        return {}
+
+    def get_fields(self) -> Dict[str, Field]:
+        fields = super().get_fields()
+        request = self.context.get('request')
+
+        # Nested serializers render all of their fields
+        root = self.parent if isinstance(self.parent, serializers.ListSerializer) else self
+
+        if root.parent is not None:
+            return fields
+
+        included_fields = self.get_included_fields()
+        includes = get_requested_includes(request)
+        unknown_includes = includes - set(included_fields)
+
+        if unknown_includes:
+            raise serializers.ValidationError({'include': f'Unknown relations: {", ".join(sorted(unknown_includes))}'})
+
+        requested_fields = get_requested_fields(request)
+
+        if requested_fields is not None:
+            unknown_fields = requested_fields - set(fields) - includes
+
+            if unknown_fields:
+                raise serializers.ValidationError({'fields': f'Unknown fields: {", ".join(sorted(unknown_fields))}'})
+
+            fields = {name: field for name, field in fields.items() if name in requested_fields or field.write_only}
+
+        fields.update((name, field) for name, field in included_fields.items() if name in includes)
+
+        return fields
+
+
+class SparseFieldsetViewMixin:
+    """
+    View mixin loading only the columns of the fields requested by ?fields= for list and retrieve actions
+    """
+
+    # Columns read by the relations of ?include= which are rendered from the model itself, keyed by relation
+    included_columns: Dict[str, Tuple[str, ...]] = {}
+
+    def project_queryset(self, queryset: QuerySet) -> QuerySet:
+        requested_fields = get_requested_fields(self.request)
+
+        if requested_fields is None or getattr(self, 'action', None) not in PROJECTED_ACTIONS:
+            return queryset
+
+        model = queryset.model
+        columns = {model._meta.pk.name}
+
+        for name in requested_fields:
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+
+            if field.concrete:
+                columns.add(field.name)
+
+        for name in get_requested_includes(self.request):
+            columns.update(self.included_columns.get(name, ()))
+
+        return queryset.only(*columns)
+
+    def filter_queryset(self, queryset: QuerySet) -> QuerySet:
+        return self.project_queryset(super().filter_queryset(queryset))
@@ -1,11 +1,50 @@
 import logging
 
-from django.db.models import Q, QuerySet
+from django.db import connections
+from django.db.models import QuerySet
 from django.views import View
 from rest_framework import filters
 from rest_framework.request import Request
 
 from project.api.models import RoleEnum
+from project.api.policies import TripAccessPolicy
+from project.api.sharding import is_sharding_enabled
+
+
+def filter_email_prefix(queryset: QuerySet, value: str) -> QuerySet:
+    """
+    Filters users by a case-insensitive email prefix using the index of the lowercased email
+
+    :param queryset: QuerySet of users
+    :param value: Email prefix
+    :return: Filtered QuerySet
+    """
+
+    prefix = value.strip().lower()
+
+    if not prefix:
+        return queryset
+
+    if connections[queryset.db].vendor == 'postgresql':
+        # Django adds a varchar_pattern_ops index for LIKE 'prefix%' next to the b-tree index
+        return queryset.filter(email_lower__startswith=prefix)
+
+    # SQLite only uses indexes for LIKE on NOCASE columns, a range over the lowercased column always uses one
+    return queryset.filter(email_lower__gte=prefix, email_lower__lt=prefix[:-1] + chr(ord(prefix[-1]) + 1))
+
+
+def filter_email_domain(queryset: QuerySet, value: str) -> QuerySet:
+    """
+    Filters users by a case-insensitive email domain using the index of the domain
+
+    :param queryset: QuerySet of users
+    :param value: Domain, optionally starting with @
+    :return: Filtered QuerySet
+    """
+
+    domain = value.strip().lower().lstrip('@')
+
+    return queryset.filter(email_domain=domain) if domain else queryset
 
 
 class UserFilterBackend(filters.BaseFilterBackend):
@@ -17,10 +56,13 @@ class UserFilterBackend(filters.BaseFilterBackend):
         self._logger: logging.Logger = logging.getLogger(__name__)
 
     def filter_queryset(self, request: Request, queryset: QuerySet, view: View) -> QuerySet:
+        # Deleted users stay inactive until their trips have been purged
+        queryset = queryset.filter(is_active=True)
+
         if request.user.role == RoleEnum.USER:
             return queryset.filter(id=request.user.id)
         elif request.user.role == RoleEnum.MANAGER:
-            return queryset.filter(Q(role=int(RoleEnum.USER)) | Q(role=int(RoleEnum.MANAGER)))
+            return queryset.filter(role__in=(int(RoleEnum.USER), int(RoleEnum.MANAGER)))
         elif request.user.role == RoleEnum.ADMIN:
             return queryset
         else:
@@ -36,3 +78,12 @@ class IsOwnerFilterBackend(filters.BaseFilterBackend):
 
     def filter_queryset(self, request: Request, queryset: QuerySet, view: View) -> QuerySet:
         return queryset.filter(owner=request.user)
+
+
+class TripAccessFilterBackend(filters.BaseFilterBackend):
+    """
+    Filter that only allows users to see the trips TripAccessPolicy lets them list.
+    """
+
+    def filter_queryset(self, request: Request, queryset: QuerySet, view: View) -> QuerySet:
+        return TripAccessPolicy.scope_queryset(request, queryset, join_users=not is_sharding_enabled())
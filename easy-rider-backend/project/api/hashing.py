@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+_pool: Optional['PasswordHashingPool'] = None
+_pool_lock = threading.Lock()
+
+
+class HashingQueueFull(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many pending password checks, try again later.'
+    default_code = 'hashing_queue_full'
+
+    def __init__(self, wait: Optional[float] = None) -> None:
+        super().__init__()
+
+        # DRF turns the wait attribute into a Retry-After header
+        self.wait = wait
+
+
+def _init_worker() -> None:
+    import django
+
+    django.setup()
+
+
+def _make_password(password: Optional[str]) -> str:
+    return hashers.make_password(password)
+
+
+def _check_password(password: Optional[str], encoded: str) -> Tuple[bool, bool]:
+    must_update = []
+    is_correct = hashers.check_password(password, encoded, setter=lambda raw_password: must_update.append(True))
+
+    return is_correct, bool(must_update)
+
+
+class PasswordHashingPool:
+    """
+    Runs password hashing in a pool of worker processes, so PBKDF2 neither blocks the request thread
+    nor holds the GIL of the web worker. At most max_pending hashes are queued or running,
+    callers wait up to timeout seconds for a free slot and are rejected with 503 afterwards.
+    """
+
+    def __init__(self, workers: int, max_pending: int, timeout: float) -> None:
+        """
+        :param workers: Number of worker processes
+        :param max_pending: Maximum number of hashes queued or running at the same time
+        :param timeout: Seconds to wait for a free slot
+        """
+
+        self._workers: int = workers
+        self._timeout: float = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._logger: logging.Logger = logging.getLogger(__name__)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                # Forking a multi-threaded web worker is unsafe, workers are started from a fresh interpreter
+                self._executor = ProcessPoolExecutor(
+                    self._workers, mp_context=multiprocessing.get_context('spawn'), initializer=_init_worker)
+
+            return self._executor
+
+    def submit(self, function: Callable, *args) -> Future:
+        if not self._slots.acquire(timeout=self._timeout):
+            self._logger.warning('Password hashing queue is full, rejecting the request')
+
+            raise HashingQueueFull(wait=1)
+
+        try:
+            future = self._get_executor().submit(function, *args)
+        except Exception:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self._slots.release())
+
+        return future
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+def get_hashing_pool() -> Optional[PasswordHashingPool]:
+    """
+    Returns the hashing pool of the process or None if PASSWORD_HASHING_WORKERS is 0
+    and passwords are hashed in the calling thread
+    """
+
+    global _pool
+
+    if getattr(settings, 'PASSWORD_HASHING_WORKERS', 0) <= 0:
+        return None
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = PasswordHashingPool(
+                settings.PASSWORD_HASHING_WORKERS,
+                settings.PASSWORD_HASHING_MAX_PENDING,
+                settings.PASSWORD_HASHING_TIMEOUT)
+
+        return _pool
+
+
+def make_password(password: Optional[str]) -> str:
+    """
+    Drop-in replacement of django.contrib.auth.hashers.make_password running in the hashing pool
+    """
+
+    pool = get_hashing_pool()
+
+    if pool is None:
+        return _make_password(password)
+
+    return pool.submit(_make_password, password).result()
+
+
+def check_password(password: Optional[str], encoded: str) -> Tuple[bool, bool]:
+    """
+    Checks the password in the hashing pool
+
+    :param password: Raw password
+    :param encoded: Encoded password
+    :return: Whether the password is correct and whether its encoding has to be updated to the preferred hasher
+    """
+
+    pool = get_hashing_pool()
+
+    if pool is None:
+        return _check_password(password, encoded)
+
+    return pool.submit(_check_password, password, encoded).result()
+
+
+async def amake_password(password: Optional[str]) -> str:
+    """
+    Awaitable make_password, without a pool the password is hashed in the default executor of the loop
+    """
+
+    pool = get_hashing_pool()
+
+    if pool is None:
+        return await asyncio.get_running_loop().run_in_executor(None, _make_password, password)
+
+    return await asyncio.wrap_future(pool.submit(_make_password, password))
+
+
+async def acheck_password(password: Optional[str], encoded: str) -> Tuple[bool, bool]:
+    """
+    Awaitable check_password, without a pool the password is checked in the default executor of the loop
+    """
+
+    pool = get_hashing_pool()
+
+    if pool is None:
+        return await asyncio.get_running_loop().run_in_executor(None, _check_password, password, encoded)
+
+    return await asyncio.wrap_future(pool.submit(_check_password, password, encoded))
@@ -0,0 +1,81 @@
+import logging
+import time
+
+from django.conf import settings
+from django.db import transaction
+
+from project.jobs.models import Job
+from project.jobs.queue import enqueue, set_progress
+from project.jobs.registry import task
+
+from .models import ArchivedTrip, Trip, User
+from .throttling import reserve
+from .tokens import revoke_all_tokens
+
+_logger: logging.Logger = logging.getLogger(__name__)
+
+
+@task(name='api.purge_user', bind=True)
+def purge_user(job: Job, user_id: int) -> dict:
+    """
+    Deletes the trips and archived trips of a deactivated user in batches of USER_PURGE_BATCH_SIZE, each in its own
+    transaction, at no more than USER_PURGE_RATE trips per second across all workers, and deletes the user afterwards.
+    An interrupted purge continues where it stopped when the job is retried.
+
+    :param job: Running job
+    :param user_id: ID of the user
+    :return: Number of deleted trips
+    """
+
+    if not User.objects.filter(pk=user_id, is_active=False).exists():
+        _logger.info(f'User {user_id} has already been deleted')
+
+        return {'deleted_trips': 0}
+
+    querysets = [Trip.objects.for_user(user_id), ArchivedTrip.objects.for_user(user_id)]
+    remaining = sum(trips.count() for trips in querysets)
+    deleted = 0
+
+    for trips in querysets:
+        while True:
+            ids = list(trips.order_by('pk').values_list('pk', flat=True)[:settings.USER_PURGE_BATCH_SIZE])
+
+            if not ids:
+                break
+
+            time.sleep(reserve('purge_user', len(ids), settings.USER_PURGE_RATE))
+
+            with transaction.atomic(using=trips.db):
+                trips.filter(pk__in=ids).delete()
+
+            deleted += len(ids)
+            remaining = max(remaining - len(ids), 0)
+
+            # Reporting progress extends the lease of the job, a worker which lost it stops
+            if not set_progress(job, {'deleted_trips': deleted, 'remaining_trips': remaining}):
+                _logger.warning(f'Purge of user {user_id} has been taken over by another worker')
+
+                return {'deleted_trips': deleted}
+
+    User.objects.filter(pk=user_id, is_active=False).delete()
+    _logger.info(f'User {user_id} and {deleted} trips have been deleted')
+
+    return {'deleted_trips': deleted}
+
+
+def schedule_user_deletion(user: User, requested_by: User) -> Job:
+    """
+    Deactivates a user, revokes their tokens and enqueues the purge of their trips. Inactive users
+    are hidden by UserFilterBackend and cannot authenticate, the user row is deleted once the trips are gone.
+
+    :param user: User to be deleted
+    :param requested_by: Originator of the request, allowed to follow the progress of the job
+    :return: Purge job
+    """
+
+    with transaction.atomic():
+        User.objects.filter(pk=user.pk).update(is_active=False)
+        user.is_active = False
+        revoke_all_tokens(user)
+
+        return enqueue(purge_user, user.pk, user_id=requested_by.id)
@@ -0,0 +1,36 @@
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+
+from project.api.archive import archive_trips
+from project.api.sharding import get_trip_shards
+
+
+class Command(BaseCommand):
+    help = 'Moves trips which ended before the archive horizon into the archive table of their database (e.g. from cron)'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--days', type=int, default=settings.TRIP_ARCHIVE_AFTER_DAYS,
+            help='Archive trips which ended more than this many days ago, at least TRIP_ARCHIVE_AFTER_DAYS')
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.TRIP_ARCHIVE_BATCH_SIZE, help='Number of trips moved per transaction')
+
+    def handle(self, *args, **options) -> None:
+        # Lists skip the archive when their date filters start after the configured horizon,
+        # so trips ending after it must stay in the trip table
+        if options['days'] < settings.TRIP_ARCHIVE_AFTER_DAYS:
+            raise CommandError(f'--days must be at least TRIP_ARCHIVE_AFTER_DAYS ({settings.TRIP_ARCHIVE_AFTER_DAYS})')
+
+        horizon = timezone.localdate() - datetime.timedelta(days=options['days'])
+        total = 0
+
+        for alias in get_trip_shards() or [DEFAULT_DB_ALIAS]:
+            archived = archive_trips(alias, horizon, options['batch_size'])
+            self.stdout.write(f'{alias}: {archived} trips')
+            total += archived
+
+        self.stdout.write(self.style.SUCCESS(f'Archived {total} trips which ended before {horizon}'))
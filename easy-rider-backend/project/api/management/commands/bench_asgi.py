@@ -0,0 +1,141 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Callable, List
+
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.core.wsgi import get_wsgi_application
+from django.test import override_settings
+from rest_framework_jwt.settings import api_settings
+
+from project.api.asgi import AsyncReadApplication
+from project.api.models import User
+
+jwt_payload_handler = api_settings.JWT_PAYLOAD_HANDLER
+jwt_encode_handler = api_settings.JWT_ENCODE_HANDLER
+
+
+class Command(BaseCommand):
+    help = 'Compares the async read endpoints with the Django ASGI and WSGI stacks at high concurrency (in-process)'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--email', required=True, help='Email of the user the requests are authenticated as')
+        parser.add_argument('--path', help='Requested path, trip list of the user by default')
+        parser.add_argument('--requests', type=int, default=2000, help='Number of requests per mode')
+        parser.add_argument('--concurrency', type=int, default=100, help='Number of concurrent requests')
+
+    def _report(self, mode: str, latencies: List[float], elapsed: float, statuses: List[int]) -> None:
+        latencies = sorted(latencies)
+        p50 = latencies[len(latencies) // 2] * 1000
+        p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+        errors = sum(1 for status in statuses if status >= 400)
+
+        self.stdout.write(
+            f'{mode:<12} {len(latencies) / elapsed:>10.1f} req/s   '
+            f'mean {statistics.mean(latencies) * 1000:>8.2f} ms   p50 {p50:>8.2f} ms   p99 {p99:>8.2f} ms   '
+            f'errors {errors}')
+
+    def _run_wsgi(self, path: str, authorization: str, requests: int, concurrency: int) -> None:
+        application = get_wsgi_application()
+
+        def call() -> None:
+            environ = {
+                'REQUEST_METHOD': 'GET',
+                'PATH_INFO': path,
+                'QUERY_STRING': '',
+                'SERVER_NAME': 'localhost',
+                'SERVER_PORT': '80',
+                'HTTP_ACCEPT': 'application/json',
+                'HTTP_AUTHORIZATION': authorization,
+                'wsgi.input': BytesIO(),
+                'wsgi.url_scheme': 'http',
+            }
+            statuses = []
+            started = time.perf_counter()
+            body = application(environ, lambda status, headers: statuses.append(int(status.split()[0])))
+            b''.join(body)
+            latencies.append(time.perf_counter() - started)
+            all_statuses.extend(statuses)
+
+        latencies: List[float] = []
+        all_statuses: List[int] = []
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for _ in range(requests):
+                executor.submit(call)
+
+        self._report('wsgi', latencies, time.perf_counter() - started, all_statuses)
+
+    def _run_asgi(self, mode: str, application: Callable, path: str, authorization: str, requests: int,
+                  concurrency: int) -> None:
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': b'',
+            'root_path': '',
+            'headers': [(b'accept', b'application/json'), (b'authorization', authorization.encode())],
+            'server': ('localhost', 80),
+            'client': ('127.0.0.1', 12345),
+        }
+        latencies: List[float] = []
+        statuses: List[int] = []
+
+        async def receive() -> dict:
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def call(semaphore: asyncio.Semaphore) -> None:
+            async with semaphore:
+                async def send(message: dict) -> None:
+                    if message['type'] == 'http.response.start':
+                        statuses.append(message['status'])
+
+                started = time.perf_counter()
+                await application(dict(scope), receive, send)
+                latencies.append(time.perf_counter() - started)
+
+        async def run() -> float:
+            semaphore = asyncio.Semaphore(concurrency)
+            started = time.perf_counter()
+            await asyncio.gather(*(call(semaphore) for _ in range(requests)))
+
+            return time.perf_counter() - started
+
+        elapsed = asyncio.run(run())
+
+        self._report(mode, latencies, elapsed, statuses)
+
+    def handle(self, *args, **options) -> None:
+        try:
+            user = User.objects.get(email=options['email'])
+        except User.DoesNotExist:
+            raise CommandError(f'User {options["email"]} does not exist')
+
+        path = options['path'] or f'/api/users/{user.id}/trips/'
+        token = jwt_encode_handler(jwt_payload_handler(user))
+        authorization = f'{settings.JWT_AUTH["JWT_AUTH_HEADER_PREFIX"]} {token}'
+        requests = options['requests']
+        concurrency = options['concurrency']
+
+        self.stdout.write(f'GET {path}: {requests} requests, concurrency {concurrency}')
+
+        self._run_wsgi(path, authorization, requests, concurrency)
+
+        django_application = get_asgi_application()
+
+        with override_settings(ASYNC_READ_ENDPOINTS=False):
+            self._run_asgi('asgi', AsyncReadApplication(django_application), path, authorization, requests,
+                           concurrency)
+
+        with override_settings(ASYNC_READ_ENDPOINTS=True):
+            self._run_asgi('asgi-native', AsyncReadApplication(django_application), path, authorization, requests,
+                           concurrency)
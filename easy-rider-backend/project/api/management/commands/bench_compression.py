@@ -0,0 +1,85 @@
+import datetime
+import hashlib
+import random
+import time
+from typing import Callable, List
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from djangorestframework_camel_case.render import CamelCaseJSONRenderer
+
+from project.api.compression import CODECS, Codec, get_codecs
+
+WORDS = ['beach', 'museum', 'hiking', 'sunny', 'flight', 'hotel', 'dinner', 'train', 'rain', 'mountains', 'old town']
+
+
+def _trip_list(count: int, rng: random.Random) -> bytes:
+    start = datetime.date(2020, 1, 1)
+    trips = [
+        {
+            'id': number,
+            'user': rng.randint(1, 1000),
+            'destination': f'Destination {rng.randint(1, 500)}',
+            'start_date': (start + datetime.timedelta(days=number % 365)).isoformat(),
+            'end_date': (start + datetime.timedelta(days=number % 365 + 7)).isoformat(),
+            'comment': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(0, 60))),
+        }
+        for number in range(count)
+    ]
+
+    return CamelCaseJSONRenderer().render(trips)
+
+
+def _time(function: Callable[[], object], min_duration: float = 0.2) -> float:
+    runs = 0
+    started = time.perf_counter()
+
+    while True:
+        function()
+        runs += 1
+        elapsed = time.perf_counter() - started
+
+        if elapsed >= min_duration:
+            return elapsed / runs
+
+
+class Command(BaseCommand):
+    help = 'Measures CPU time and bytes saved by the content codings of CompressionMiddleware on trip lists'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--trips', type=int, nargs='+', default=[10, 100, 1000], help='Trips per list')
+        parser.add_argument(
+            '--levels', nargs='+', help='Codings with their levels, e.g. gzip=1 gzip=9 br=11, the defaults by default')
+
+    def _parse_codecs(self, levels: List[str]) -> List[Codec]:
+        codecs = []
+
+        for item in levels:
+            name, _, level = item.partition('=')
+
+            if name not in CODECS or not level.isdigit():
+                raise CommandError(f'Invalid or unavailable coding {item}')
+
+            codecs.append(CODECS[name](int(level)))
+
+        return codecs
+
+    def handle(self, *args, **options) -> None:
+        rng = random.Random(0)
+        codecs = self._parse_codecs(options['levels']) if options['levels'] else get_codecs(list(CODECS))
+
+        self.stdout.write(f'Content codings: {", ".join(CODECS)}')
+
+        for count in options['trips']:
+            body = _trip_list(count, rng)
+            digest_time = _time(lambda: hashlib.sha256(body).digest())
+            self.stdout.write(
+                f'\n{count} trips, {len(body)} bytes, cache lookup (SHA-256) {digest_time * 1e6:.1f} us')
+
+            for codec in codecs:
+                compressed = codec.compress(body)
+                elapsed = _time(lambda: codec.compress(body))
+                saved = len(body) - len(compressed)
+                self.stdout.write(
+                    f'  {codec.name:<5} level {codec.level:>2}   {len(compressed):>9} bytes   '
+                    f'ratio {len(body) / len(compressed):>5.1f}   {elapsed * 1000:>8.3f} ms   '
+                    f'{len(body) / elapsed / 1e6:>7.1f} MB/s   {saved / (elapsed * 1e6):>8.1f} KB saved per CPU ms')
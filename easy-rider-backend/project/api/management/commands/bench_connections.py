@@ -0,0 +1,91 @@
+import statistics
+import time
+from io import BytesIO
+from typing import List
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+from django.db.backends.signals import connection_created
+from rest_framework_jwt.settings import api_settings
+
+from project.api.models import User
+
+jwt_payload_handler = api_settings.JWT_PAYLOAD_HANDLER
+jwt_encode_handler = api_settings.JWT_ENCODE_HANDLER
+
+
+class Command(BaseCommand):
+    help = 'Measures request latency with per-request database connections and with persistent connections'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--email', required=True, help='Email of the user the requests are authenticated as')
+        parser.add_argument('--path', help='Requested path, trip list of the user by default')
+        parser.add_argument('--requests', type=int, default=1000, help='Number of requests per mode')
+        parser.add_argument('--database', default='default', help='Database alias')
+        parser.add_argument('--conn-max-age', type=int, default=600, help='CONN_MAX_AGE of the persistent mode')
+
+    def _run(self, mode: str, conn_max_age: int, path: str, authorization: str, requests: int, using: str) -> None:
+        application = get_wsgi_application()
+        connection = connections[using]
+        connection.close()
+        connection.settings_dict['CONN_MAX_AGE'] = conn_max_age
+        opened: List[int] = []
+        latencies: List[float] = []
+        errors: List[str] = []
+
+        def count_connections(sender, connection, **kwargs) -> None:
+            opened.append(1)
+
+        connection_created.connect(count_connections)
+
+        try:
+            for _ in range(requests):
+                environ = {
+                    'REQUEST_METHOD': 'GET',
+                    'PATH_INFO': path,
+                    'QUERY_STRING': '',
+                    'SERVER_NAME': 'localhost',
+                    'SERVER_PORT': '80',
+                    'HTTP_ACCEPT': 'application/json',
+                    'HTTP_AUTHORIZATION': authorization,
+                    'wsgi.input': BytesIO(),
+                    'wsgi.url_scheme': 'http',
+                }
+                started = time.perf_counter()
+                body = application(
+                    environ, lambda status, headers: errors.append(status) if int(status.split()[0]) >= 400 else None)
+                b''.join(body)
+                body.close()
+                latencies.append(time.perf_counter() - started)
+        finally:
+            connection_created.disconnect(count_connections)
+
+        latencies.sort()
+
+        self.stdout.write(
+            f'{mode:<12} CONN_MAX_AGE={conn_max_age:<6} connections opened {len(opened):>6}   '
+            f'mean {statistics.mean(latencies) * 1000:>7.3f} ms   '
+            f'p50 {latencies[len(latencies) // 2] * 1000:>7.3f} ms   '
+            f'p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:>7.3f} ms   errors {len(errors)}')
+
+    def handle(self, *args, **options) -> None:
+        try:
+            user = User.objects.get(email=options['email'])
+        except User.DoesNotExist:
+            raise CommandError(f'User {options["email"]} does not exist')
+
+        path = options['path'] or f'/api/users/{user.id}/trips/'
+        token = jwt_encode_handler(jwt_payload_handler(user))
+        authorization = f'{settings.JWT_AUTH["JWT_AUTH_HEADER_PREFIX"]} {token}'
+        using = options['database']
+        original_conn_max_age = connections[using].settings_dict['CONN_MAX_AGE']
+
+        self.stdout.write(f'GET {path}: {options["requests"]} sequential requests ({connections[using].vendor})')
+
+        try:
+            self._run('per-request', 0, path, authorization, options['requests'], using)
+            self._run('persistent', options['conn_max_age'], path, authorization, options['requests'], using)
+        finally:
+            connections[using].settings_dict['CONN_MAX_AGE'] = original_conn_max_age
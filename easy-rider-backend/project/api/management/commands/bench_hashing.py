@@ -0,0 +1,87 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from project.api import hashing
+
+
+def _serve_requests(stop: threading.Event) -> int:
+    # Stands in for the other request threads of the worker: short bursts of pure Python work needing the GIL
+    payload = [{'id': number, 'destination': f'Destination {number}', 'comment': 'x' * 50} for number in range(20)]
+    served = 0
+
+    while not stop.is_set():
+        json.loads(json.dumps(payload))
+        served += 1
+
+    return served
+
+
+class Command(BaseCommand):
+    help = 'Measures concurrent logins and the throughput of other request threads with hashing on the threads and in the pool'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--logins', type=int, default=8, help='Number of concurrent login threads')
+        parser.add_argument('--duration', type=float, default=5, help='Seconds every mode runs')
+        parser.add_argument('--workers', type=int, default=2, help='Number of hashing processes of the pool mode')
+
+    def _login(self, encoded: str, stop: threading.Event) -> List[float]:
+        latencies = []
+
+        while not stop.is_set():
+            started = time.perf_counter()
+            is_correct, _ = hashing.check_password('password', encoded)
+            latencies.append(time.perf_counter() - started)
+
+            if not is_correct:
+                raise CommandError('Password check failed')
+
+        return latencies
+
+    def _run(self, mode: str, encoded: str, logins: int, duration: float) -> Tuple[int, List[float]]:
+        stop = threading.Event()
+
+        with ThreadPoolExecutor(logins + 1) as executor:
+            served = executor.submit(_serve_requests, stop)
+            login_futures = [executor.submit(self._login, encoded, stop) for _ in range(logins)]
+            time.sleep(duration)
+            stop.set()
+
+            latencies = sorted(latency for future in login_futures for latency in future.result())
+
+        self.stdout.write(
+            f'{mode:<7} {len(latencies) / duration:>8.1f} logins/s   '
+            f'p50 {latencies[len(latencies) // 2] * 1000 if latencies else 0:>8.1f} ms   '
+            f'other requests {served.result() / duration:>9.0f}/s')
+
+        return served.result(), latencies
+
+    def handle(self, *args, **options) -> None:
+        encoded = hashers.make_password('password')
+        original_workers = settings.PASSWORD_HASHING_WORKERS
+
+        self.stdout.write(
+            f'{options["logins"]} login threads and one request thread, {hashers.get_hasher().algorithm}, '
+            f'{options["workers"]} hashing processes in pool mode')
+
+        try:
+            settings.PASSWORD_HASHING_WORKERS = 0
+            self._run('thread', encoded, options['logins'], options['duration'])
+
+            settings.PASSWORD_HASHING_WORKERS = options['workers']
+            hashing._pool = None
+            # Processes are spawned lazily, the first check pays for their startup
+            hashing.check_password('password', encoded)
+            self._run('pool', encoded, options['logins'], options['duration'])
+        finally:
+            if hashing._pool is not None:
+                hashing._pool.shutdown()
+                hashing._pool = None
+
+            settings.PASSWORD_HASHING_WORKERS = original_workers
@@ -0,0 +1,90 @@
+import datetime
+import json
+import random
+import time
+import zlib
+from typing import Callable, List
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.test import RequestFactory
+from djangorestframework_camel_case.parser import CamelCaseJSONParser
+from djangorestframework_camel_case.render import CamelCaseJSONRenderer
+from rest_framework.request import Request
+
+from project.api.models import Trip
+from project.api.parsers import MessagePackParser
+from project.api.renderers import MessagePackRenderer, msgpack
+from project.api.serializers import TripSerializer
+
+WORDS = ['beach', 'museum', 'hiking', 'sunny', 'flight', 'hotel', 'dinner', 'train', 'rain', 'mountains', 'old town']
+
+
+def _trips(count: int, rng: random.Random) -> List[Trip]:
+    start = datetime.date(2020, 1, 1)
+
+    return [
+        Trip(
+            id=number,
+            user_id=rng.randint(1, 1000),
+            destination=f'Destination {rng.randint(1, 500)}',
+            start_date=start + datetime.timedelta(days=number % 365),
+            end_date=start + datetime.timedelta(days=number % 365 + 7),
+            comment=' '.join(rng.choice(WORDS) for _ in range(rng.randint(0, 60))))
+        for number in range(count)
+    ]
+
+
+def _serialize(trips: List[Trip], renderer) -> list:
+    # TripViewSet.list serializes with the renderer picked by content negotiation
+    request = Request(RequestFactory().get('/'))
+    request.accepted_renderer = renderer
+
+    return TripSerializer(trips, many=True, context={'request': request}).data
+
+
+def _time(function: Callable[[], object], min_duration: float = 0.2) -> float:
+    runs = 0
+    started = time.perf_counter()
+
+    while True:
+        function()
+        runs += 1
+        elapsed = time.perf_counter() - started
+
+        if elapsed >= min_duration:
+            return elapsed / runs
+
+
+class Command(BaseCommand):
+    help = 'Compares the size and the encoding and decoding times of JSON and MessagePack trip lists'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--trips', type=int, nargs='+', default=[10, 100, 1000, 10000], help='Trips per list')
+
+    def handle(self, *args, **options) -> None:
+        if msgpack is None:
+            raise CommandError('msgpack is not installed, install it with poetry install -E msgpack')
+
+        rng = random.Random(0)
+        formats = [
+            ('json', CamelCaseJSONRenderer(), CamelCaseJSONParser()),
+            ('msgpack', MessagePackRenderer(), MessagePackParser()),
+        ]
+
+        for count in options['trips']:
+            trips = _trips(count, rng)
+            self.stdout.write(f'\n{count} trips')
+
+            for name, renderer, parser in formats:
+                data = _serialize(trips, renderer)
+                body = renderer.render(data)
+                encode_time = _time(lambda: renderer.render(_serialize(trips, renderer)))
+                render_time = _time(lambda: renderer.render(data))
+                # Clients decode the body without the camelCase conversion of the parsers
+                decode = json.loads if name == 'json' else lambda content: msgpack.unpackb(content, timestamp=3)
+                decode_time = _time(lambda: decode(body))
+                gzipped = len(zlib.compress(body, 6))
+                self.stdout.write(
+                    f'  {name:<8} {len(body):>9} bytes   gzip {gzipped:>8} bytes   '
+                    f'serialize+render {encode_time * 1000:>8.2f} ms   render {render_time * 1000:>7.2f} ms   '
+                    f'decode {decode_time * 1000:>7.2f} ms')
@@ -0,0 +1,115 @@
+import datetime
+import multiprocessing
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import OperationalError, connections
+
+from project.api.models import RoleEnum, Trip, User
+
+
+def _init_worker() -> None:
+    # Connections inherited from the parent process must never be shared between processes
+    connections.close_all()
+
+
+def _create_trips(arguments: Tuple[int, int]) -> Tuple[List[float], int]:
+    user_id, count = arguments
+    latencies = []
+    errors = 0
+
+    for number in range(count):
+        started = time.perf_counter()
+
+        try:
+            Trip.objects.create(
+                user_id=user_id,
+                destination=f'Destination {number}',
+                start_date=datetime.date(2020, 7, 1),
+                end_date=datetime.date(2020, 8, 1))
+        except OperationalError:
+            errors += 1
+        else:
+            latencies.append(time.perf_counter() - started)
+
+    connections.close_all()
+
+    return latencies, errors
+
+
+class Command(BaseCommand):
+    help = 'Measures concurrent trip creation on a scratch SQLite database without and with SQLITE_PRAGMAS'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--workers', type=int, default=8, help='Number of concurrent writer processes')
+        parser.add_argument('--trips', type=int, default=200, help='Number of trips created by every worker')
+        parser.add_argument(
+            '--pragmas',
+            help='Tuned PRAGMAs as name=value pairs separated by commas, SQLITE_PRAGMAS by default '
+                 '(see config.settings.production)')
+
+    def _parse_pragmas(self, value: str) -> Dict[str, str]:
+        try:
+            return dict(pragma.split('=', 1) for pragma in value.split(','))
+        except ValueError:
+            raise CommandError(f'Invalid pragmas: {value}')
+
+    def _run(self, mode: str, pragmas: Dict[str, str], workers: int, trips: int, directory: str) -> None:
+        connection = connections['default']
+        connection.close()
+        connection.settings_dict['NAME'] = str(Path(directory) / f'{mode}.sqlite3')
+        settings.SQLITE_PRAGMAS = pragmas
+
+        call_command('migrate', verbosity=0, interactive=False)
+        user = User.objects.create(email=f'{mode}@example.com', role=int(RoleEnum.USER))
+        connections.close_all()
+
+        started = time.perf_counter()
+
+        with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+            results = pool.map(_create_trips, [(user.id, trips)] * workers)
+
+        elapsed = time.perf_counter() - started
+        latencies = sorted(latency for worker_latencies, _ in results for latency in worker_latencies)
+        errors = sum(worker_errors for _, worker_errors in results)
+
+        if not latencies:
+            self.stdout.write(f'{mode:<8} all {errors} creates failed')
+            return
+
+        self.stdout.write(
+            f'{mode:<8} {len(latencies) / elapsed:>8.0f} creates/s   '
+            f'mean {statistics.mean(latencies) * 1000:>7.3f} ms   '
+            f'p50 {latencies[len(latencies) // 2] * 1000:>7.3f} ms   '
+            f'p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:>7.3f} ms   errors {errors}')
+
+    def handle(self, *args, **options) -> None:
+        connection = connections['default']
+
+        if connection.vendor != 'sqlite':
+            raise CommandError('The default database is not SQLite')
+
+        pragmas = self._parse_pragmas(options['pragmas']) if options['pragmas'] else dict(settings.SQLITE_PRAGMAS)
+
+        if not pragmas:
+            raise CommandError('SQLITE_PRAGMAS is empty, pass --pragmas or use --settings=config.settings.production')
+
+        original_name = connection.settings_dict['NAME']
+        original_pragmas = settings.SQLITE_PRAGMAS
+
+        self.stdout.write(f'{options["workers"]} processes creating {options["trips"]} trips each, one transaction per trip')
+
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                self._run('default', {}, options['workers'], options['trips'], directory)
+                self._run('tuned', pragmas, options['workers'], options['trips'], directory)
+        finally:
+            connections.close_all()
+            connection.settings_dict['NAME'] = original_name
+            settings.SQLITE_PRAGMAS = original_pragmas
@@ -0,0 +1,132 @@
+import json
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+# Runs in a fresh interpreter inheriting DJANGO_SETTINGS_MODULE, so that nothing has been imported yet.
+# Prints the durations of the phases as JSON, the import times are written to stderr by -X importtime
+CHILD_SCRIPT = '''
+import json, sys, time
+from io import BytesIO
+
+started = time.perf_counter()
+phases = {}
+
+from django.core.wsgi import get_wsgi_application
+
+application = get_wsgi_application()
+phases['setup'] = time.perf_counter() - started
+
+if sys.argv[1] == 'warm':
+    from project.api.warmup import warm_up
+
+    phase_started = time.perf_counter()
+    warm_up(close_connections=False)
+    phases['warmup'] = time.perf_counter() - phase_started
+
+for phase in ('first_request', 'second_request'):
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': sys.argv[2],
+        'QUERY_STRING': '',
+        'SERVER_NAME': sys.argv[3],
+        'SERVER_PORT': '80',
+        'HTTP_ACCEPT': 'application/json',
+        'wsgi.input': BytesIO(),
+        'wsgi.url_scheme': 'http',
+    }
+    phase_started = time.perf_counter()
+    b''.join(application(environ, lambda status, headers: None))
+    phases[phase] = time.perf_counter() - phase_started
+
+phases['total'] = time.perf_counter() - started
+print(json.dumps(phases))
+'''
+
+IMPORT_TIME_PREFIX = 'import time:'
+
+
+def parse_import_times(output: str) -> List[Tuple[str, int, int]]:
+    """
+    Parses the output of python -X importtime
+
+    :param output: stderr of the interpreter
+    :return: (module, self time, cumulative time) tuples, times in microseconds
+    """
+
+    imports = []
+
+    for line in output.splitlines():
+        if not line.startswith(IMPORT_TIME_PREFIX):
+            continue
+
+        columns = line[len(IMPORT_TIME_PREFIX):].split('|')
+
+        try:
+            self_time, cumulative_time = int(columns[0]), int(columns[1])
+        except (IndexError, ValueError):
+            # The header line
+            continue
+
+        imports.append((columns[2].strip(), self_time, cumulative_time))
+
+    return imports
+
+
+class Command(BaseCommand):
+    help = 'Profiles the start of a worker: import time per module, Django setup, warmup and first request (cold/warm)'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--path', default='/api/users/', help='Path of the first requests')
+        parser.add_argument('--top', type=int, default=20, help='Number of the slowest modules and packages reported')
+
+    def _run_child(self, mode: str, path: str) -> Tuple[Dict[str, float], List[Tuple[str, int, int]]]:
+        hosts = [host.lstrip('.') for host in settings.ALLOWED_HOSTS if host != '*']
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', CHILD_SCRIPT, mode, path, hosts[0] if hosts else 'localhost'],
+            cwd=str(settings.ROOT_DIR), capture_output=True, text=True)
+
+        if process.returncode != 0:
+            errors = [line for line in process.stderr.splitlines() if not line.startswith(IMPORT_TIME_PREFIX)]
+
+            raise CommandError(f'Profiling the {mode} start failed:\n' + '\n'.join(errors[-20:]))
+
+        return json.loads(process.stdout.splitlines()[-1]), parse_import_times(process.stderr)
+
+    def _report_imports(self, imports: List[Tuple[str, int, int]], top: int) -> None:
+        packages: Dict[str, int] = defaultdict(int)
+
+        for module, self_time, _ in imports:
+            packages[module.split('.')[0]] += self_time
+
+        total = sum(self_time for _, self_time, _ in imports)
+
+        self.stdout.write(f'\n{len(imports)} modules imported in {total / 1000:.1f} ms')
+        self.stdout.write('\nSlowest modules (cumulative ms, including their imports):')
+
+        for module, _, cumulative_time in sorted(imports, key=lambda item: item[2], reverse=True)[:top]:
+            self.stdout.write(f'  {cumulative_time / 1000:>8.1f}  {module}')
+
+        self.stdout.write('\nSlowest packages (ms spent in their own modules):')
+
+        for package, self_time in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+            self.stdout.write(f'  {self_time / 1000:>8.1f}  {package}')
+
+    def handle(self, *args, **options) -> None:
+        path = options['path']
+        cold_phases, imports = self._run_child('cold', path)
+        warm_phases, _ = self._run_child('warm', path)
+
+        self.stdout.write(f'GET {path} in a fresh interpreter (ms)')
+        self.stdout.write(f'{"phase":<16} {"cold":>10} {"warm":>10}')
+
+        for phase in ('setup', 'warmup', 'first_request', 'second_request', 'total'):
+            cold = f'{cold_phases[phase] * 1000:.1f}' if phase in cold_phases else '-'
+            warm = f'{warm_phases[phase] * 1000:.1f}' if phase in warm_phases else '-'
+            self.stdout.write(f'{phase:<16} {cold:>10} {warm:>10}')
+
+        self._report_imports(imports, options['top'])
@@ -0,0 +1,82 @@
+from collections import defaultdict
+from typing import Dict, List, Type
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from project.api.models import ArchivedTrip, BaseTrip, Trip
+from project.api.sharding import get_trip_shards, shard_for_user
+
+
+class Command(BaseCommand):
+    help = 'Moves trips and archived trips stored in a shard other than the one TRIP_SHARDS assigns to their user'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--from', dest='sources', action='append', default=[],
+            help='Additional database alias to drain, e.g. a shard removed from TRIP_SHARDS (repeatable)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Number of trips scanned per batch')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many trips would be moved')
+
+    def _rebalance(
+            self, model: Type[BaseTrip], source: str, shards: List[str], batch_size: int, dry_run: bool) -> Dict[str, int]:
+        moved: Dict[str, int] = defaultdict(int)
+        last_id = 0
+
+        while True:
+            # Keyset pagination stays fast on large tables and is not affected by rows deleted in previous batches
+            batch = list(model.objects.using(source).filter(id__gt=last_id).order_by('id')[:batch_size])
+
+            if not batch:
+                break
+
+            last_id = batch[-1].id
+            misplaced: Dict[str, List[BaseTrip]] = defaultdict(list)
+
+            for trip in batch:
+                target = shard_for_user(trip.user_id, shards)
+
+                if target != source:
+                    misplaced[target].append(trip)
+
+            for target, trips in misplaced.items():
+                if not dry_run:
+                    # Trips are copied before they are deleted, an interrupted run is simply repeated:
+                    # already copied trips are skipped thanks to the globally unique IDs
+                    with transaction.atomic(using=target):
+                        model.objects.using(target).bulk_create(trips, ignore_conflicts=True)
+
+                    # A raw delete skips the collector and the trip signals, moved trips have not been deleted
+                    with transaction.atomic(using=source):
+                        model.objects.using(source).filter(id__in=[trip.id for trip in trips])._raw_delete(source)
+
+                moved[target] += len(trips)
+
+        return moved
+
+    def handle(self, *args, **options) -> None:
+        shards = get_trip_shards()
+
+        if not shards:
+            raise CommandError('TRIP_SHARDS is empty, trips are not sharded')
+
+        sources = list(dict.fromkeys([DEFAULT_DB_ALIAS] + shards + options['sources']))
+
+        for source in sources:
+            if source not in settings.DATABASES:
+                raise CommandError(f'Unknown database {source}')
+
+        total = 0
+
+        # Archived trips live in the same shard as the trips of their user (see ArchivedTrip)
+        for model in (Trip, ArchivedTrip):
+            for source in sources:
+                moved = self._rebalance(model, source, shards, options['batch_size'], options['dry_run'])
+
+                for target, count in moved.items():
+                    self.stdout.write(f'{source} -> {target}: {count} {model._meta.verbose_name_plural}')
+                    total += count
+
+        verb = 'Would move' if options['dry_run'] else 'Moved'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {total} trips'))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+
+from project.api.models import User
+from project.api.summaries import refresh_trip_summaries
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the trip summaries of users (trip_count, next_trip_start, last_trip_end) in bulk'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--batch-size', type=int, default=1000, help='Number of users refreshed per batch')
+        parser.add_argument(
+            '--stale', action='store_true',
+            help='Only refresh users whose next trip has started since the last refresh (e.g. daily from cron)')
+
+    def handle(self, *args, **options) -> None:
+        users = User.objects.using(DEFAULT_DB_ALIAS)
+
+        if options['stale']:
+            users = users.filter(next_trip_start__lt=timezone.localdate())
+
+        last_id = 0
+        total = 0
+
+        while True:
+            # Keyset pagination, refreshed users may leave the stale filter
+            user_ids = list(users.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:options['batch_size']])
+
+            if not user_ids:
+                break
+
+            last_id = user_ids[-1]
+            total += refresh_trip_summaries(user_ids)
+
+            if options['verbosity'] > 1:
+                self.stdout.write(f'Refreshed {total} users')
+
+        self.stdout.write(self.style.SUCCESS(f'Refreshed the trip summaries of {total} users'))
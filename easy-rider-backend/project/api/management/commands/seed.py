@@ -0,0 +1,298 @@
+import datetime
+import logging
+import multiprocessing
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection, connections, transaction
+
+from project.api.models import RoleEnum, Trip, User
+from project.api.sharding import bulk_create_trips
+from project.api.summaries import refresh_trip_summaries
+
+DEFAULT_DESTINATIONS = (
+    'Austria', 'Belgium', 'Brazil', 'Canada', 'Chile', 'China', 'Croatia', 'Cuba', 'Czechia', 'Denmark',
+    'Egypt', 'Estonia', 'Finland', 'France', 'Georgia', 'Germany', 'Greece', 'Iceland', 'India', 'Indonesia',
+    'Ireland', 'Italy', 'Japan', 'Kenya', 'Mexico', 'Morocco', 'Netherlands', 'Norway', 'Peru', 'Poland',
+    'Portugal', 'Romania', 'Serbia', 'Singapore', 'Slovakia', 'Spain', 'Sweden', 'Thailand', 'UK', 'USA',
+)
+
+DATE_DISTRIBUTIONS = ('uniform', 'recent', 'upcoming')
+
+# Stays below SQLITE_MAX_VARIABLE_NUMBER of older SQLite builds
+LOOKUP_BATCH_SIZE = 900
+
+
+@dataclass
+class SeedChunk:
+    """
+    Self-contained description of a batch of users (and their trips) generated by a single worker
+    """
+
+    index: int
+    first_user: int
+    user_count: int
+    email_prefix: str
+    email_domain: str
+    password_hash: str
+    roles: List[Tuple[RoleEnum, int]]
+    min_trips: int
+    max_trips: int
+    start: datetime.date
+    end: datetime.date
+    date_distribution: str
+    max_duration: int
+    destinations: List[str]
+    comment_length: int
+    batch_size: int
+    seed: int
+
+
+def _pick_start_date(rng: random.Random, chunk: SeedChunk) -> datetime.date:
+    span = (chunk.end - chunk.start).days
+
+    if chunk.date_distribution == 'recent':
+        offset = rng.triangular(0, span, span)
+    elif chunk.date_distribution == 'upcoming':
+        offset = rng.triangular(0, span, 0)
+    else:
+        offset = rng.uniform(0, span)
+
+    return chunk.start + datetime.timedelta(days=int(offset))
+
+
+def _make_comment(rng: random.Random, chunk: SeedChunk) -> str:
+    if chunk.comment_length <= 0:
+        return ''
+
+    words = []
+    length = 0
+
+    while length < chunk.comment_length:
+        word = rng.choice(chunk.destinations).lower()
+        words.append(word)
+        length += len(word) + 1
+
+    return ' '.join(words)[:chunk.comment_length]
+
+
+def seed_chunk(chunk: SeedChunk) -> Tuple[int, int]:
+    """
+    Generates and inserts a single chunk of users and their trips inside one transaction.
+    The random generator is seeded per chunk so the output does not depend on the number of workers.
+
+    :param chunk: Chunk description
+    :return: Two-tuple containing the number of inserted users and trips
+    """
+
+    rng = random.Random(chunk.seed * 1_000_003 + chunk.index)
+    roles = [role for role, _ in chunk.roles]
+    weights = [weight for _, weight in chunk.roles]
+    emails = [
+        f'{chunk.email_prefix}{number}@{chunk.email_domain}'
+        for number in range(chunk.first_user, chunk.first_user + chunk.user_count)
+    ]
+    users = [
+        User(email=email, password=chunk.password_hash, role=int(rng.choices(roles, weights)[0]))
+        for email in emails
+    ]
+
+    for user in users:
+        # bulk_create() bypasses save()
+        user.sync_email_fields()
+    trip_count = 0
+
+    with transaction.atomic():
+        # Leaving batch_size empty lets the backend pick the largest statement it supports
+        User.objects.bulk_create(users)
+
+        # SQLite does not return primary keys from bulk inserts so the ids are fetched back by email
+        user_ids = []
+
+        for offset in range(0, len(emails), LOOKUP_BATCH_SIZE):
+            user_ids.extend(User.objects.filter(
+                email__in=emails[offset:offset + LOOKUP_BATCH_SIZE]).values_list('id', flat=True))
+
+        trips = []
+
+        for user_id in user_ids:
+            for _ in range(rng.randint(chunk.min_trips, chunk.max_trips)):
+                start_date = _pick_start_date(rng, chunk)
+                end_date = start_date + datetime.timedelta(days=rng.randint(0, chunk.max_duration))
+                trips.append(Trip(
+                    user_id=user_id,
+                    destination=rng.choice(chunk.destinations),
+                    start_date=start_date,
+                    end_date=end_date,
+                    comment=_make_comment(rng, chunk)))
+
+            if len(trips) >= chunk.batch_size:
+                bulk_create_trips(trips)
+                trip_count += len(trips)
+                trips = []
+
+        bulk_create_trips(trips)
+        trip_count += len(trips)
+        # bulk_create() bypasses the signals maintaining the trip summaries
+        refresh_trip_summaries(user_ids)
+
+    return len(users), trip_count
+
+
+def _init_worker() -> None:
+    import django
+
+    django.setup()
+    # Connections inherited from the parent process must never be shared between processes
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = 'Generates synthetic users and trips in bulk for benchmarking and reproducing production-scale data'
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+
+        self._logger: logging.Logger = logging.getLogger(__name__)
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        today = datetime.date.today()
+
+        parser.add_argument('--users', type=int, default=1000, help='Number of users to generate')
+        parser.add_argument(
+            '--roles',
+            default='USER:90,MANAGER:9,ADMIN:1',
+            help='Role mix as comma-separated ROLE:WEIGHT pairs, e.g. USER:90,MANAGER:9,ADMIN:1')
+        parser.add_argument('--min-trips', type=int, default=0, help='Minimum number of trips per user')
+        parser.add_argument('--max-trips', type=int, default=20, help='Maximum number of trips per user')
+        parser.add_argument(
+            '--start',
+            type=datetime.date.fromisoformat,
+            default=today - datetime.timedelta(days=3 * 365),
+            help='Earliest trip start date (YYYY-MM-DD)')
+        parser.add_argument(
+            '--end',
+            type=datetime.date.fromisoformat,
+            default=today + datetime.timedelta(days=365),
+            help='Latest trip start date (YYYY-MM-DD)')
+        parser.add_argument(
+            '--date-distribution',
+            choices=DATE_DISTRIBUTIONS,
+            default='uniform',
+            help='Distribution of trip start dates between --start and --end')
+        parser.add_argument('--max-duration', type=int, default=21, help='Maximum trip duration in days')
+        parser.add_argument('--destinations', help='Path to a file containing one destination per line')
+        parser.add_argument('--comment-length', type=int, default=0, help='Length of generated trip comments')
+        parser.add_argument('--password', default='password', help='Password shared by all generated users')
+        parser.add_argument('--email-prefix', help='Prefix of generated emails, random by default')
+        parser.add_argument('--email-domain', default='example.com', help='Domain of generated emails')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Number of users inserted per transaction')
+        parser.add_argument('--workers', type=int, default=1, help='Number of worker processes')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed')
+
+    def _parse_roles(self, value: str) -> List[Tuple[RoleEnum, int]]:
+        try:
+            roles = []
+
+            for item in value.split(','):
+                role, weight = item.split(':')
+                roles.append((RoleEnum[role.strip().upper()], int(weight)))
+        except (KeyError, ValueError):
+            raise CommandError(f'Invalid role mix: {value}')
+
+        if not roles or sum(weight for _, weight in roles) <= 0:
+            raise CommandError(f'Role mix must contain at least one positive weight: {value}')
+
+        return roles
+
+    def _read_destinations(self, path: Optional[str]) -> List[str]:
+        if path is None:
+            return list(DEFAULT_DESTINATIONS)
+
+        with open(path, encoding='utf-8') as destinations_file:
+            destinations = [line.strip() for line in destinations_file if line.strip()]
+
+        if not destinations:
+            raise CommandError(f'{path} does not contain any destinations')
+
+        return destinations
+
+    def handle(self, *args, **options) -> None:
+        if options['min_trips'] < 0 or options['max_trips'] < options['min_trips']:
+            raise CommandError('--max-trips must be greater than or equal to --min-trips')
+        if options['end'] < options['start']:
+            raise CommandError('--end must be greater than or equal to --start')
+
+        user_count = options['users']
+        batch_size = max(1, options['batch_size'])
+        workers = max(1, options['workers'])
+
+        if workers > 1 and connection.vendor == 'sqlite':
+            # SQLite serializes writers, parallel transactions would only fail with "database is locked"
+            self.stderr.write(self.style.WARNING('SQLite does not support concurrent writers, using a single worker'))
+            workers = 1
+
+        email_prefix = options['email_prefix'] or f'seed-{uuid.uuid4().hex[:8]}-'
+        # PBKDF2 runs once per command instead of once per user
+        password_hash = make_password(options['password'])
+        roles = self._parse_roles(options['roles'])
+        destinations = self._read_destinations(options['destinations'])
+
+        chunks = [
+            SeedChunk(
+                index=index,
+                first_user=first_user,
+                user_count=min(batch_size, user_count - first_user),
+                email_prefix=email_prefix,
+                email_domain=options['email_domain'],
+                password_hash=password_hash,
+                roles=roles,
+                min_trips=options['min_trips'],
+                max_trips=options['max_trips'],
+                start=options['start'],
+                end=options['end'],
+                date_distribution=options['date_distribution'],
+                max_duration=options['max_duration'],
+                destinations=destinations,
+                comment_length=options['comment_length'],
+                batch_size=batch_size,
+                seed=options['seed'])
+            for index, first_user in enumerate(range(0, user_count, batch_size))
+        ]
+
+        self._logger.info(f'Seeding {user_count} users in {len(chunks)} chunks using {workers} worker(s)')
+
+        started = time.monotonic()
+        total_users = 0
+        total_trips = 0
+
+        if workers == 1:
+            results = map(seed_chunk, chunks)
+            pool = None
+        else:
+            connections.close_all()
+            pool = multiprocessing.Pool(workers, initializer=_init_worker)
+            results = pool.imap_unordered(seed_chunk, chunks)
+
+        try:
+            for inserted_users, inserted_trips in results:
+                total_users += inserted_users
+                total_trips += inserted_trips
+
+                if options['verbosity'] > 1:
+                    self.stdout.write(f'Inserted {total_users}/{user_count} users and {total_trips} trips')
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Inserted {total_users} users ({email_prefix}*@{options["email_domain"]}) '
+            f'and {total_trips} trips in {elapsed:.1f}s'))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connections
+
+from project.api.db import SQLITE_CHECKPOINT_MODES, run_sqlite_maintenance
+
+
+class Command(BaseCommand):
+    help = 'Refreshes query planner statistics and checkpoints the write-ahead log of a SQLite database (e.g. from cron)'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--database', default='default', help='Database alias')
+        parser.add_argument('--analyze', action='store_true', help='Rebuild statistics of all tables with ANALYZE')
+        parser.add_argument(
+            '--checkpoint', default='TRUNCATE', choices=SQLITE_CHECKPOINT_MODES, type=str.upper,
+            help='WAL checkpoint mode, TRUNCATE also shrinks the WAL file to zero bytes')
+
+    def handle(self, *args, **options) -> None:
+        using = options['database']
+
+        if connections[using].vendor != 'sqlite':
+            raise CommandError(f'{using} is not a SQLite database')
+
+        busy, log_frames, checkpointed_frames = run_sqlite_maintenance(using, options['analyze'], options['checkpoint'])
+
+        if busy:
+            self.stderr.write(self.style.WARNING('The checkpoint could not complete because of concurrent connections'))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Optimized {using}, WAL frames: {log_frames}, checkpointed: {checkpointed_frames}'))
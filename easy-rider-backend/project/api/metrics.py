@@ -0,0 +1,55 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict
+
+from django.conf import settings
+
+_logger: logging.Logger = logging.getLogger(__name__)
+
+_report_lock = threading.Lock()
+_last_report: float = time.monotonic()
+
+
+def get_runtime_stats() -> Dict[str, dict]:
+    """
+    Collects the counters kept in memory by the current worker process
+
+    :return: Counters per component
+    """
+
+    from .coalescing import coalescer
+    from .throttling import rate_limiter_stats
+    from .tokens import token_cache
+
+    return {
+        'token_cache': token_cache.stats,
+        'rate_limits': rate_limiter_stats.stats,
+        'coalescing': coalescer.stats,
+    }
+
+
+def log_runtime_stats(**kwargs) -> None:
+    """
+    request_finished receiver logging get_runtime_stats() at most once per METRICS_LOG_INTERVAL seconds
+    in every worker process
+    """
+
+    global _last_report
+
+    interval = getattr(settings, 'METRICS_LOG_INTERVAL', 0)
+
+    if interval <= 0 or time.monotonic() - _last_report < interval:
+        return
+
+    # Concurrent requests of a threaded worker must not log the counters twice
+    if not _report_lock.acquire(blocking=False):
+        return
+
+    try:
+        _last_report = time.monotonic()
+        _logger.info(f'Runtime stats of worker {os.getpid()}: {json.dumps(get_runtime_stats(), sort_keys=True)}')
+    finally:
+        _report_lock.release()
@@ -0,0 +1,132 @@
+import logging
+import re
+import time
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.db import OperationalError
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.utils.cache import patch_vary_headers
+
+from .compression import compressed_bodies, get_codecs, negotiate
+from .db import statement_timeout
+
+STRONG_ETAG = re.compile(r'^"[^"]*"$')
+
+
+class StatementTimeoutMiddleware:
+    """
+    Middleware limiting the execution time of database statements issued by a view.
+    Timeouts are looked up by URL name in DATABASE_STATEMENT_TIMEOUTS, DATABASE_STATEMENT_TIMEOUT is used otherwise.
+    Statements interrupted by the timeout result in 503 responses instead of tying up a worker.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self._get_response: Callable[[HttpRequest], HttpResponse] = get_response
+        self._default_timeout: int = getattr(settings, 'DATABASE_STATEMENT_TIMEOUT', None)
+        self._timeouts: dict = getattr(settings, 'DATABASE_STATEMENT_TIMEOUTS', {})
+        self._logger: logging.Logger = logging.getLogger(__name__)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        try:
+            return self._get_response(request)
+        finally:
+            timeout_context = getattr(request, '_statement_timeout_context', None)
+
+            if timeout_context is not None:
+                timeout_context.__exit__(None, None, None)
+
+    def process_view(self, request: HttpRequest, view_func: Callable, view_args: tuple, view_kwargs: dict) -> None:
+        url_name = request.resolver_match.url_name if request.resolver_match else None
+        timeout = self._timeouts.get(url_name, self._default_timeout)
+
+        if timeout:
+            request._statement_timeout = timeout
+            request._statement_timeout_started = time.monotonic()
+            request._statement_timeout_context = statement_timeout(timeout)
+            request._statement_timeout_context.__enter__()
+
+    def process_exception(self, request: HttpRequest, exception: Exception) -> HttpResponse:
+        timeout = getattr(request, '_statement_timeout', None)
+
+        if timeout is None or not isinstance(exception, OperationalError):
+            return None
+
+        elapsed = (time.monotonic() - request._statement_timeout_started) * 1000
+
+        if elapsed < timeout:
+            return None
+
+        self._logger.warning(f'{request.path} exceeded the statement timeout of {timeout} ms')
+
+        return JsonResponse({'detail': 'The request took too long to complete.'}, status=503)
+
+
+class CompressionMiddleware:
+    """
+    Middleware compressing response bodies with the best content coding accepted by the client
+    (COMPRESSION_ENCODINGS: br and zstd if their packages are installed, gzip otherwise).
+    Only bodies of COMPRESSION_CONTENT_TYPES reaching COMPRESSION_MIN_SIZE bytes are compressed,
+    streamed bodies are compressed chunk by chunk. Compressed bodies are kept in a per-process cache,
+    so bodies served repeatedly are compressed once per content coding.
+    """
+
+    def __init__(self, get_response: Optional[Callable[[HttpRequest], HttpResponse]] = None) -> None:
+        self._get_response: Optional[Callable[[HttpRequest], HttpResponse]] = get_response
+        self._codecs = get_codecs(
+            getattr(settings, 'COMPRESSION_ENCODINGS', ['gzip']), getattr(settings, 'COMPRESSION_LEVELS', {}))
+        self._min_size: int = getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+        self._content_types: tuple = tuple(
+            getattr(settings, 'COMPRESSION_CONTENT_TYPES', ['application/json', 'application/msgpack', 'text/']))
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        return self.process_response(request, self._get_response(request))
+
+    def _is_compressible(self, response: HttpResponse) -> bool:
+        if response.has_header('Content-Encoding') or response.status_code in (204, 304):
+            return False
+        if 'no-transform' in response.get('Cache-Control', '').lower():
+            return False
+
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+
+        if not any(
+                content_type.startswith(allowed) if allowed.endswith('/') else content_type == allowed
+                for allowed in self._content_types):
+            return False
+
+        # Streamed bodies have an unknown length and are always compressed
+        return response.streaming or len(response.content) >= self._min_size
+
+    def process_response(self, request: HttpRequest, response: HttpResponse) -> HttpResponse:
+        if not self._codecs or not self._is_compressible(response):
+            return response
+
+        # The body depends on Accept-Encoding even if this client gets it uncompressed
+        patch_vary_headers(response, ('Accept-Encoding',))
+        codec = negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''), self._codecs)
+
+        if codec is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = codec.compress_stream(response.streaming_content)
+            del response['Content-Length']
+        else:
+            compressed = compressed_bodies.compress(codec, response.content)
+
+            if len(compressed) >= len(response.content):
+                return response
+
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+
+        if etag and STRONG_ETAG.match(etag):
+            # The compressed body is no longer byte-for-byte equal to the one the strong ETag was computed for
+            response['ETag'] = f'W/{etag}'
+
+        response['Content-Encoding'] = codec.name
+
+        return response
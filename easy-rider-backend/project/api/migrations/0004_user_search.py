@@ -0,0 +1,47 @@
+# Generated by Django 3.0.14 on 2026-10-19 16:38
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def fill_email_fields(apps, schema_editor) -> None:
+    User = apps.get_model('api', 'User')
+    users = User.objects.using(schema_editor.connection.alias).only('id', 'email').order_by('id')
+    batch = []
+
+    for user in users.iterator(chunk_size=BATCH_SIZE):
+        user.email_lower = user.email.lower()
+        user.email_domain = user.email_lower.rpartition('@')[2]
+        batch.append(user)
+
+        if len(batch) == BATCH_SIZE:
+            User.objects.using(schema_editor.connection.alias).bulk_update(batch, ['email_lower', 'email_domain'])
+            batch = []
+
+    User.objects.using(schema_editor.connection.alias).bulk_update(batch, ['email_lower', 'email_domain'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_token_revocation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='email_domain',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='email_lower',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(fill_email_fields, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['role', 'email_lower'], name='api_user_role_email_idx'),
+        ),
+    ]
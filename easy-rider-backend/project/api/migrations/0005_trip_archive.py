@@ -0,0 +1,37 @@
+# Generated by Django 3.0.14 on 2026-10-19 17:06
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_user_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTrip',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('destination', models.CharField(max_length=120)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+                ('comment', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='trip',
+            index=models.Index(fields=['end_date'], name='api_trip_end_date_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedtrip',
+            name='user',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 3.0.14 on 2026-10-19 17:10
+
+import datetime
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Q
+
+BATCH_SIZE = 1000
+
+
+def fill_trip_summaries(apps, schema_editor) -> None:
+    # Only trips stored in the database of the users are counted, sharded deployments run refresh_trip_summaries
+    alias = schema_editor.connection.alias
+    User = apps.get_model('api', 'User')
+    today = datetime.date.today()
+    summaries = {}
+
+    for model_name in ('Trip', 'ArchivedTrip'):
+        rows = apps.get_model('api', model_name).objects.using(alias).values('user').annotate(
+            trip_count=Count('id'),
+            next_trip_start=Min('start_date', filter=Q(start_date__gte=today)),
+            last_trip_end=Max('end_date'))
+
+        for row in rows:
+            summary = summaries.setdefault(row['user'], User(pk=row['user'], trip_count=0))
+            summary.trip_count += row['trip_count']
+            summary.next_trip_start = min(filter(None, (summary.next_trip_start, row['next_trip_start'])), default=None)
+            summary.last_trip_end = max(filter(None, (summary.last_trip_end, row['last_trip_end'])), default=None)
+
+    User.objects.using(alias).bulk_update(
+        list(summaries.values()), ['trip_count', 'next_trip_start', 'last_trip_end'], batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_trip_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='last_trip_end',
+            field=models.DateField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='next_trip_start',
+            field=models.DateField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='trip_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_trip_summaries, migrations.RunPython.noop),
+    ]
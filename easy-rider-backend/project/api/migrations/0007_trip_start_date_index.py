@@ -0,0 +1,17 @@
+# Generated by Django 3.0.14 on 2026-10-19 17:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_user_trip_summary'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='trip',
+            index=models.Index(fields=['start_date'], name='api_trip_start_date_idx'),
+        ),
+    ]
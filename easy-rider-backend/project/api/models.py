@@ -4,7 +4,9 @@ from enum import IntFlag
 from django.conf import settings
 from django.contrib.auth.base_user import AbstractBaseUser, BaseUserManager
 from django.contrib.auth.models import AbstractUser, PermissionsMixin
-from django.db import models
+from django.db import DatabaseError, models, router, transaction
+
+from . import hashing
 
 
 class RoleEnum(IntFlag):
@@ -56,12 +58,29 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_active = models.BooleanField(default=True)
     email = models.EmailField(verbose_name='email address', max_length=255, blank=False, null=False, unique=True)
     role = models.PositiveSmallIntegerField(choices=ROLE_CHOICES, blank=False, null=False, default=int(RoleEnum.USER))
+    # Incremented to revoke all tokens of the user at once, tokens carry the version they were issued for
+    token_version = models.PositiveIntegerField(default=0)
+    # Lowercased email and its domain maintained by save(), case-insensitive searches use their indexes
+    email_lower = models.CharField(max_length=255, editable=False, db_index=True, default='')
+    email_domain = models.CharField(max_length=255, editable=False, db_index=True, default='')
+    # Summary of the trips and archived trips of the user maintained on trip writes (see project/api/summaries.py).
+    # next_trip_start is the first start date on or after the day of the last refresh, refresh_trip_summaries --stale
+    # recomputes it once it has passed
+    trip_count = models.PositiveIntegerField(editable=False, default=0)
+    next_trip_start = models.DateField(editable=False, null=True)
+    last_trip_end = models.DateField(editable=False, null=True)
 
     objects = UserManager()
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['role']
 
+    class Meta:
+        indexes = [
+            # Serves the role predicates of UserFilterBackend and the role filter, alone or with an email prefix
+            models.Index(fields=['role', 'email_lower'], name='api_user_role_email_idx'),
+        ]
+
     @property
     def is_staff(self):
         """
@@ -71,6 +90,56 @@ class User(AbstractBaseUser, PermissionsMixin):
 
         return self.is_superuser
 
+    def sync_email_fields(self) -> None:
+        """
+        Derives the lowercased email and the domain from the email. Called by save(),
+        code bypassing save() (bulk_create, update) has to call it or set the fields itself
+        """
+
+        self.email_lower = self.email.lower()
+        self.email_domain = self.email_lower.rpartition('@')[2]
+
+    def save(self, *args, **kwargs) -> None:
+        self.sync_email_fields()
+        update_fields = kwargs.get('update_fields')
+
+        if update_fields is not None and 'email' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'email_lower', 'email_domain'}
+
+        super().save(*args, **kwargs)
+
+    def set_password(self, raw_password) -> None:
+        """
+        Hashes the password in the hashing pool instead of the calling thread
+        """
+
+        self.password = hashing.make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password) -> bool:
+        """
+        Checks the password in the hashing pool and upgrades its encoding if the preferred hasher changed
+        """
+
+        is_correct, must_update = hashing.check_password(raw_password, self.password)
+
+        if is_correct and must_update:
+            self.set_password(raw_password)
+            self._password = None
+            self.save(update_fields=['password'])
+
+        return is_correct
+
+    async def acheck_password(self, raw_password) -> bool:
+        """
+        Checks the password without blocking the event loop. Encodings are not upgraded,
+        the next synchronous login takes care of it
+        """
+
+        is_correct, _ = await hashing.acheck_password(raw_password, self.password)
+
+        return is_correct
+
     def __str__(self) -> str:
         return self.email
 
@@ -84,13 +153,135 @@ class CurrentUser:
     user: settings.AUTH_USER_MODEL
 
 
-class Trip(models.Model):
+class TripManager(models.Manager):
+    def create(self, **kwargs) -> 'Trip':
+        from .sharding import is_sharding_enabled
+
+        if self._db is None and is_sharding_enabled():
+            # QuerySet.create() saves into the database picked without the instance, save() routes by the user instead
+            trip = self.model(**kwargs)
+            trip.save(force_insert=True)
+
+            return trip
+
+        return super().create(**kwargs)
+
+    def for_user(self, user_id: int) -> models.QuerySet:
+        """
+        Returns trips of the user read from the shard storing them
+
+        :param user_id: User ID
+        :return: QuerySet containing trips of the user
+        """
+
+        from .sharding import is_sharding_enabled, shard_for_user
+
+        queryset = self.get_queryset()
+
+        if is_sharding_enabled():
+            queryset = queryset.using(shard_for_user(user_id))
+
+        return queryset.filter(user=user_id)
+
+
+class BaseTrip(models.Model):
     """
-    Trip model
+    Columns shared by trips and archived trips, both tables have to stay union-compatible
     """
 
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    # Trips may live in a different database (shard) than their users, so the relation cannot be a DB constraint
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, db_constraint=False)
     destination = models.CharField(max_length=120, blank=False, null=False)
     start_date = models.DateField(blank=False, null=False)
     end_date = models.DateField(blank=False, null=False)
     comment = models.TextField(blank=True, null=True)
+
+    objects = TripManager()
+
+    class Meta:
+        abstract = True
+
+
+class Trip(BaseTrip):
+    """
+    Trip model
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values) -> 'Trip':
+        trip = super().from_db(db, field_names, values)
+        # Summaries of both users are refreshed when a trip changes hands
+        trip._loaded_user_id = trip.__dict__.get('user_id')
+
+        return trip
+
+    def save(self, *args, **kwargs) -> None:
+        from .sharding import get_trip_shards
+
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        source = self._state.db
+
+        if 'using' not in kwargs and not self._state.adding and source in get_trip_shards() and source != using:
+            # The trip changed hands and belongs to the shard of its new user. An UPDATE there would match nothing
+            # and Django would INSERT a copy, leaving the original behind in the old shard
+            self._move(source, using, kwargs.get('force_update', False))
+            return
+
+        # The trip summary of the user is refreshed by post_save in the same transaction
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+
+    def _move(self, source: str, target: str, force_update: bool = False) -> None:
+        """
+        Moves the trip from the shard @source to the shard @target. The trip is inserted into @target before
+        the transaction deleting it from @source commits: a failing insert rolls the delete back, so the trip
+        is never lost. The delete skips the signals, post_save of the insert refreshes the summaries of both users.
+
+        :param source: Database alias the trip was loaded from
+        :param target: Database alias of the shard of the new user
+        :param force_update: Whether the caller required the trip to exist, checked in @source
+        """
+
+        with transaction.atomic(using=source):
+            deleted = Trip.objects.using(source).filter(pk=self.pk)._raw_delete(source)
+
+            if force_update and not deleted:
+                raise DatabaseError('Forced update did not affect any rows.')
+
+            with transaction.atomic(using=target):
+                super().save(using=target, force_insert=True)
+
+    class Meta:
+        indexes = [
+            # Serves the scans of archive_trips for trips which ended before the archive horizon
+            models.Index(fields=['end_date'], name='api_trip_end_date_idx'),
+            # Serves the date hierarchy and the ordering of the admin changelist
+            models.Index(fields=['start_date'], name='api_trip_start_date_idx'),
+        ]
+
+
+class ArchivedTrip(BaseTrip):
+    """
+    Trip which ended before the archive horizon, moved out of the trip table by archive_trips (see project/api/archive.py).
+    Archived trips keep their IDs and live in the same database (shard) as the trips of their user.
+    """
+
+
+class ShardSequence(models.Model):
+    """
+    Sequence handing out IDs which stay unique across shards
+    """
+
+    name = models.CharField(max_length=32, primary_key=True)
+    value = models.BigIntegerField(default=0)
+
+
+class RevokedToken(models.Model):
+    """
+    Durable store of revoked tokens, loaded into the in-process denylist of every worker (see project/api/tokens.py)
+    """
+
+    jti = models.CharField(max_length=64, unique=True)
+    user_id = models.IntegerField()
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
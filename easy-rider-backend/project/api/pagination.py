@@ -0,0 +1,10 @@
+from rest_framework.pagination import LimitOffsetPagination
+
+
+class TripPagination(LimitOffsetPagination):
+    """
+    Pagination of listings across users, which are paginated even if the client does not ask for a page
+    """
+
+    default_limit = 50
+    max_limit = 1000
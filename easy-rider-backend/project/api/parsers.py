@@ -0,0 +1,30 @@
+from typing import Any, IO, Optional
+
+from djangorestframework_camel_case.settings import api_settings
+from djangorestframework_camel_case.util import underscoreize
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+from .renderers import decode_ext
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+
+class MessagePackParser(BaseParser):
+    """
+    Parses camelCase MessagePack request bodies (Content-Type: application/msgpack) into snake_case data.
+    Dates may be sent as the date extension type of MessagePackRenderer or as ISO 8601 strings
+    """
+
+    media_type = 'application/msgpack'
+
+    def parse(self, stream: IO[bytes], media_type: Optional[str] = None, parser_context: Optional[dict] = None) -> Any:
+        try:
+            data = msgpack.unpackb(stream.read(), ext_hook=decode_ext, timestamp=3, raw=False)
+        except ValueError as exception:
+            raise ParseError(f'MessagePack parse error - {exception}')
+
+        return underscoreize(data, **api_settings.JSON_UNDERSCOREIZE)
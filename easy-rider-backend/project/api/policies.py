@@ -1,7 +1,8 @@
 import logging
 from functools import reduce
-from typing import Optional
+from typing import List, Optional
 
+from django.db.models import Q, QuerySet
 from rest_access_policy import AccessPolicy
 from rest_framework.exceptions import NotFound
 from rest_framework.generics import GenericAPIView, get_object_or_404
@@ -18,6 +19,24 @@ class BaseAccessPolicy(AccessPolicy):
     def __init__(self) -> None:
         self._logger: logging.Logger = logging.getLogger(__name__)
 
+    def get_user_group_values(self, user: User) -> List[str]:
+        """
+        Returns names of the user's groups. The groups are queried only if one of the statements
+        refers to a group principal which saves a query per request and keeps read policies database-free
+
+        :param user: Originator of the request
+        :return: List of group names
+        """
+
+        for statement in self.statements:
+            principals = statement['principal']
+            principals = [principals] if isinstance(principals, str) else principals
+
+            if any(principal.startswith(self.group_prefix) for principal in principals):
+                return super().get_user_group_values(user)
+
+        return []
+
     def _check_user_role_condition(
             self,
             condition: str,
@@ -337,9 +356,10 @@ class TripAccessPolicy(BaseAccessPolicy):
     """
 
     statements = [
+        # Tickets of the event streams of trips (see project/api/events.py) follow the rules of the list operation
         # List and retrieve operations allow USERs to list only their own trips
         {
-            'action': ['list', 'retrieve'],
+            'action': ['list', 'retrieve', 'stream_ticket'],
             'principal': 'authenticated',
             'effect': 'allow',
             'condition': [
@@ -349,7 +369,7 @@ class TripAccessPolicy(BaseAccessPolicy):
         },
         # List and retrieve operations allow MANAGERs to list their own trips, USERs' trips and other MANAGERs' trips
         {
-            'action': ['list', 'retrieve'],
+            'action': ['list', 'retrieve', 'stream_ticket'],
             'principal': 'authenticated',
             'effect': 'allow',
             'condition': [
@@ -359,7 +379,7 @@ class TripAccessPolicy(BaseAccessPolicy):
         },
         # List allows ADMINs to list everybody's trips
         {
-            'action': ['list', 'retrieve'],
+            'action': ['list', 'retrieve', 'stream_ticket'],
             'principal': 'authenticated',
             'effect': 'allow',
             'condition': [
@@ -460,3 +480,61 @@ class TripAccessPolicy(BaseAccessPolicy):
 
     def _get_user_pk(self, request: Request) -> int:
         return int(request.parser_context.get('kwargs', {}).get('user_pk', 0))
+
+    @classmethod
+    def scope_queryset(cls, request: Request, queryset: QuerySet, join_users: bool = True) -> QuerySet:
+        """
+        Compiles the list rules into a single predicate for listings across users:
+        USERs see their own trips, MANAGERs their own and USERs' trips, ADMINs all trips.
+        Trips of deleted users are hidden, the users stay inactive until their trips have been purged
+
+        :param request: Incoming request
+        :param queryset: Trips to be narrowed down
+        :param join_users: Whether roles can be joined from the user table. Trips on a shard cannot be joined
+               with the users in the default database, user IDs are looked up and inlined instead
+        :return: Trips visible to the originator of the request
+        """
+
+        role = request.user.role
+
+        if role == RoleEnum.ADMIN:
+            if join_users:
+                return queryset.filter(user__is_active=True)
+
+            # Few users are waiting for their purge, so the inactive ones are inlined rather than all active ones
+            return queryset.exclude(user__in=list(User.objects.filter(is_active=False).values_list('id', flat=True)))
+        elif role == RoleEnum.MANAGER:
+            if join_users:
+                users = Q(user__role=int(RoleEnum.USER), user__is_active=True)
+            else:
+                users = Q(user__in=list(
+                    User.objects.filter(role=int(RoleEnum.USER), is_active=True).values_list('id', flat=True)))
+
+            return queryset.filter(Q(user=request.user.id) | users)
+        elif role == RoleEnum.USER:
+            return queryset.filter(user=request.user.id)
+        else:
+            logging.getLogger(__name__).error(f'Unknown role {role}')
+
+            return queryset.none()
+
+    @classmethod
+    def can_list_trips_of(cls, originator: User, owner: User) -> bool:
+        """
+        Evaluates the rules of scope_queryset for the trips of a single user
+
+        :param originator: Originator of the request
+        :param owner: User whose trips are requested
+        :return: Boolean value indicating whether the trips of @owner are visible to @originator
+        """
+
+        if not owner.is_active:
+            return False
+        elif originator.role == RoleEnum.ADMIN:
+            return True
+        elif originator.role == RoleEnum.MANAGER:
+            return owner.id == originator.id or owner.role == RoleEnum.USER
+        elif originator.role == RoleEnum.USER:
+            return owner.id == originator.id
+
+        return False
@@ -0,0 +1,82 @@
+import datetime
+import struct
+from typing import Any, Dict, Optional
+
+from djangorestframework_camel_case.util import camelize
+from rest_framework import serializers
+from rest_framework.fields import Field
+from rest_framework.renderers import BaseRenderer
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+# MessagePack extension type of dates: days since 1970-01-01 as a big-endian signed 32-bit integer (fixext 4)
+DATE_EXT_TYPE = 1
+EPOCH = datetime.date(1970, 1, 1)
+DATE_STRUCT = struct.Struct('>i')
+
+
+def encode_default(value: Any) -> Any:
+    """
+    Encodes values MessagePack has no type for. Dates take 6 bytes instead of 11 for an ISO 8601 string,
+    aware datetimes are packed as timestamps by msgpack itself
+    """
+
+    if isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+        return msgpack.ExtType(DATE_EXT_TYPE, DATE_STRUCT.pack((value - EPOCH).days))
+
+    # Decimals, UUIDs and lazy translations are sent as text like the JSON renderer does
+    return str(value)
+
+
+def decode_ext(code: int, data: bytes) -> Any:
+    if code == DATE_EXT_TYPE:
+        # Raised as ValueError like the other errors of msgpack, so parsers report malformed bodies as such
+        if len(data) != DATE_STRUCT.size:
+            raise ValueError(f'Date extension of {len(data)} bytes instead of {DATE_STRUCT.size}')
+
+        try:
+            return EPOCH + datetime.timedelta(days=DATE_STRUCT.unpack(data)[0])
+        except OverflowError:
+            raise ValueError('Date extension out of range')
+
+    return msgpack.ExtType(code, data)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renders camelCase MessagePack (requested with Accept: application/msgpack). Dates and datetimes are encoded
+    natively instead of as strings (see NativeDatesSerializerMixin)
+    """
+
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    native_dates = True
+
+    def render(self, data: Any, accepted_media_type: Optional[str] = None, renderer_context: Optional[dict] = None) -> bytes:
+        if data is None:
+            return b''
+
+        return msgpack.packb(camelize(data), default=encode_default, datetime=True, use_bin_type=True)
+
+
+class NativeDatesSerializerMixin:
+    """
+    Serializer mixin handing date and datetime objects to renderers with native_dates
+    instead of formatting them as ISO 8601 strings
+    """
+
+    def get_fields(self) -> Dict[str, Field]:
+        fields = super().get_fields()
+        request = self.context.get('request')
+
+        if getattr(getattr(request, 'accepted_renderer', None), 'native_dates', False):
+            for field in fields.values():
+                if isinstance(field, (serializers.DateField, serializers.DateTimeField)):
+                    field.format = None
+
+        return fields
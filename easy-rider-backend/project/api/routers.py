@@ -0,0 +1,197 @@
+import logging
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Model
+
+from .sharding import is_sharding_enabled, shard_for_user
+
+# Database the ORM reads from in the current request, None stands for the primary
+_read_database: ContextVar[Optional[str]] = ContextVar('read_database', default=None)
+
+_logger: logging.Logger = logging.getLogger(__name__)
+
+
+def get_read_database() -> Optional[str]:
+    """
+    Returns the alias of the replica reads are routed to in the current context, None stands for the primary
+    """
+
+    return _read_database.get()
+
+
+def get_replicas() -> List[str]:
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+
+def _pin_key(user_id: int) -> str:
+    return f'api:primary-pin:{user_id}'
+
+
+def pin_to_primary(user_id: int) -> None:
+    """
+    Routes reads of the user to the primary for DATABASE_READ_YOUR_WRITES_WINDOW seconds,
+    so the user sees their own write even if replicas lag behind.
+    The pin is kept in the cache, which must be shared between workers (see CACHES).
+
+    :param user_id: ID of the user who performed the write
+    """
+
+    window = getattr(settings, 'DATABASE_READ_YOUR_WRITES_WINDOW', 0)
+
+    if window > 0 and get_replicas():
+        cache.set(_pin_key(user_id), True, timeout=window)
+
+
+def is_pinned_to_primary(user_id: int) -> bool:
+    return bool(cache.get(_pin_key(user_id), False))
+
+
+@contextmanager
+def read_from_replica(user_id: Optional[int] = None) -> Iterator[Optional[str]]:
+    """
+    Routes reads executed within the block to a random replica,
+    unless no replica is configured or the user is pinned to the primary.
+
+    :param user_id: ID of the originator of the request
+    :return: Alias of the replica or None if reads stay on the primary
+    """
+
+    replicas = get_replicas()
+
+    if not replicas or (user_id is not None and is_pinned_to_primary(user_id)):
+        yield None
+        return
+
+    alias = random.choice(replicas)
+    # The previous value is restored explicitly as the block may be exited from a copy of the current context
+    previous_alias = _read_database.get()
+    _read_database.set(alias)
+
+    try:
+        yield alias
+    finally:
+        _read_database.set(previous_alias)
+
+
+class ReplicaRouter:
+    """
+    Database router sending reads to a replica inside read_from_replica blocks and everything else to the primary
+    """
+
+    def _databases(self) -> List[str]:
+        return [DEFAULT_DB_ALIAS] + get_replicas()
+
+    def db_for_read(self, model: type, **hints) -> Optional[str]:
+        return _read_database.get()
+
+    def db_for_write(self, model: type, **hints) -> Optional[str]:
+        # Instances fetched from a replica remember it in _state.db, writes must never follow them there
+        return DEFAULT_DB_ALIAS if get_replicas() else None
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints) -> Optional[bool]:
+        databases = self._databases()
+
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+
+        return None
+
+    def allow_migrate(self, db: str, app_label: str, model_name: Optional[str] = None, **hints) -> Optional[bool]:
+        return None
+
+
+class TripShardRouter:
+    """
+    Database router keeping trips of a user in the shard picked by shard_for_user (see TRIP_SHARDS).
+    Users always stay in the default database and its replicas.
+    """
+
+    def _shard_for_instance(self, instance: Optional[Model]) -> Optional[str]:
+        from .models import BaseTrip, User
+
+        if isinstance(instance, BaseTrip) and instance.user_id is not None:
+            return shard_for_user(instance.user_id)
+        elif isinstance(instance, User) and instance.pk is not None:
+            return shard_for_user(instance.pk)
+
+        return None
+
+    def _route(self, model: type, instance: Optional[Model]) -> Optional[str]:
+        from .models import ArchivedTrip, BaseTrip, Trip, User
+
+        if not is_sharding_enabled():
+            return None
+
+        if model in (Trip, ArchivedTrip):
+            return self._shard_for_instance(instance)
+        elif model is User and isinstance(instance, BaseTrip):
+            # Users related to a trip must not be looked up in the shard the trip was fetched from
+            return _read_database.get() or DEFAULT_DB_ALIAS
+
+        return None
+
+    def db_for_read(self, model: type, **hints) -> Optional[str]:
+        return self._route(model, hints.get('instance'))
+
+    def db_for_write(self, model: type, **hints) -> Optional[str]:
+        from .models import User
+
+        if model is User:
+            return None
+
+        return self._route(model, hints.get('instance'))
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints) -> Optional[bool]:
+        from .models import ArchivedTrip, Trip, User
+
+        types = {type(obj1), type(obj2)}
+
+        if is_sharding_enabled() and User in types and types & {Trip, ArchivedTrip}:
+            return True
+
+        return None
+
+    def allow_migrate(self, db: str, app_label: str, model_name: Optional[str] = None, **hints) -> Optional[bool]:
+        return None
+
+
+class ReplicaReadMixin:
+    """
+    View mixin serving the safe actions listed in replica_actions from a replica.
+    Successful writes pin their originator to the primary (read-your-writes).
+    """
+
+    replica_actions = ('list', 'retrieve')
+
+    def _get_replica_action(self, request) -> str:
+        return getattr(self, 'action', None) or request.method.lower()
+
+    def initial(self, request, *args, **kwargs) -> None:
+        # Authentication and permission checks always read from the primary
+        super().initial(request, *args, **kwargs)
+
+        if self._get_replica_action(request) in self.replica_actions:
+            user_id = request.user.id if request.user.is_authenticated else None
+            self._replica_context = read_from_replica(user_id)
+            self._replica_context.__enter__()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        replica_context = getattr(self, '_replica_context', None)
+
+        if replica_context is not None:
+            self._replica_context = None
+            replica_context.__exit__(None, None, None)
+
+        if request.method not in ('GET', 'HEAD', 'OPTIONS') and response.status_code < 400:
+            user = getattr(request, 'user', None)
+
+            if user is not None and user.is_authenticated:
+                pin_to_primary(user.id)
+
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -1,10 +1,37 @@
-from django.contrib.auth.hashers import make_password
+import jwt
+from django.utils.translation import gettext as _
 from rest_framework import serializers
+from rest_framework_jwt.serializers import RefreshJSONWebTokenSerializer
+from rest_framework_jwt.settings import api_settings
 
+from project.api.fieldsets import SparseFieldsetSerializerMixin
+from project.api.hashing import make_password
 from project.api.models import Trip, User
+from project.api.policies import TripAccessPolicy
+from project.api.renderers import NativeDatesSerializerMixin
+from project.api.tokens import RevokedTokenError, is_token_version_current
 
+jwt_decode_handler = api_settings.JWT_DECODE_HANDLER
 
-class UserSerializer(serializers.ModelSerializer):
+
+class TripSerializer(NativeDatesSerializerMixin, SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Trip
+        fields = ('id', 'user', 'destination', 'start_date', 'end_date', 'comment')
+
+
+class TripSummarySerializer(NativeDatesSerializerMixin, serializers.ModelSerializer):
+    """
+    Trip summary columns of a user maintained on trip writes (see project/api/summaries.py)
+    """
+
+    class Meta:
+        model = User
+        fields = ('trip_count', 'next_trip_start', 'last_trip_end')
+        read_only_fields = fields
+
+
+class UserSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     password = serializers.CharField(
         write_only=True,
         required=True,
@@ -15,6 +42,26 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = ('id', 'email', 'role', 'password')
 
+    def get_included_fields(self) -> dict:
+        return {
+            # UserViewSet prefetches the trips into prefetched_trips
+            'trips': TripSerializer(many=True, read_only=True, source='prefetched_trips'),
+            # Read from the columns of the user, no trips are queried
+            'summary': TripSummarySerializer(read_only=True, source='*'),
+        }
+
+    def to_representation(self, instance: User) -> dict:
+        data = super().to_representation(instance)
+        request = self.context.get('request')
+
+        # Trips and their summary are embedded only for users whose trips the originator may list
+        if request is not None and (
+                not request.user.is_authenticated or not TripAccessPolicy.can_list_trips_of(request.user, instance)):
+            data.pop('trips', None)
+            data.pop('summary', None)
+
+        return data
+
     def create(self, validated_data):
         validated_data['password'] = make_password(validated_data.get('password'))
         return super(UserSerializer, self).create(validated_data)
@@ -24,7 +71,25 @@ class UserSerializer(serializers.ModelSerializer):
         return super(UserSerializer, self).update(instance, validated_data)
 
 
-class TripSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Trip
-        fields = ('id', 'user', 'destination', 'start_date', 'end_date', 'comment')
+class RefreshTokenSerializer(RefreshJSONWebTokenSerializer):
+    """
+    Refreshes tokens unless they have been revoked
+    """
+
+    def _check_payload(self, token: str) -> dict:
+        try:
+            return jwt_decode_handler(token)
+        except RevokedTokenError:
+            raise serializers.ValidationError(_('Token has been revoked.'))
+        except jwt.ExpiredSignature:
+            raise serializers.ValidationError(_('Signature has expired.'))
+        except jwt.DecodeError:
+            raise serializers.ValidationError(_('Error decoding signature.'))
+
+    def _check_user(self, payload: dict) -> User:
+        user = super()._check_user(payload)
+
+        if not is_token_version_current(payload, user):
+            raise serializers.ValidationError(_('Token has been revoked.'))
+
+        return user
@@ -0,0 +1,245 @@
+import heapq
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, models, transaction
+from django.db.models import Max, Q
+
+_logger: logging.Logger = logging.getLogger(__name__)
+
+TRIP_SEQUENCE = 'trip'
+
+
+def get_trip_shards() -> List[str]:
+    """
+    Returns database aliases storing trips. An empty list means that trips are not sharded
+    and live in the default database.
+    """
+
+    return list(getattr(settings, 'TRIP_SHARDS', []))
+
+
+def is_sharding_enabled() -> bool:
+    return bool(get_trip_shards())
+
+
+def jump_hash(key: int, buckets: int) -> int:
+    """
+    Jump consistent hash (Lamping and Veach). Adding a bucket moves only 1/buckets of the keys,
+    so growing the number of shards relocates as few trips as possible.
+
+    :param key: Non-negative integer key
+    :param buckets: Number of buckets
+    :return: Bucket number in [0, buckets)
+    """
+
+    key &= 0xFFFFFFFFFFFFFFFF
+    bucket = -1
+    jump = 0
+
+    while jump < buckets:
+        bucket = jump
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        jump = int((bucket + 1) * (float(1 << 31) / float((key >> 33) + 1)))
+
+    return bucket
+
+
+def shard_for_user(user_id: int, shards: Optional[Sequence[str]] = None) -> str:
+    """
+    Returns the database alias storing trips of the user
+
+    :param user_id: User ID
+    :param shards: Optional list of shards, TRIP_SHARDS by default
+    :return: Database alias
+    """
+
+    shards = get_trip_shards() if shards is None else shards
+
+    if not shards:
+        return DEFAULT_DB_ALIAS
+
+    return shards[jump_hash(int(user_id), len(shards))]
+
+
+def allocate_trip_ids(count: int) -> List[int]:
+    """
+    Allocates globally unique trip IDs from a sequence kept in the default database.
+    Per-shard auto-increment counters would hand out the same IDs on every shard
+    and make moving trips between shards impossible.
+
+    :param count: Number of IDs to allocate
+    :return: List of allocated IDs
+    """
+
+    from .models import ShardSequence, Trip
+
+    for attempt in range(2):
+        try:
+            with transaction.atomic(using=DEFAULT_DB_ALIAS):
+                sequences = ShardSequence.objects.using(DEFAULT_DB_ALIAS).select_for_update()
+                sequence = sequences.filter(name=TRIP_SEQUENCE).first()
+
+                if sequence is None:
+                    # Continue after the trips stored before sharding was enabled
+                    last_id = max(
+                        [Trip.objects.using(alias).aggregate(last_id=Max('id'))['last_id'] or 0
+                         for alias in set(get_trip_shards()) | {DEFAULT_DB_ALIAS}])
+                    # A concurrent first allocation may create the row in the meantime, get_or_create then locks it
+                    sequence, _ = sequences.get_or_create(name=TRIP_SEQUENCE, defaults={'value': last_id})
+
+                first_id = sequence.value + 1
+                sequence.value += count
+                sequence.save(using=DEFAULT_DB_ALIAS, update_fields=['value'])
+
+            return list(range(first_id, first_id + count))
+        except IntegrityError:
+            # The concurrent creator had not committed when get_or_create looked the row up, it exists now
+            if attempt:
+                raise
+
+            _logger.info('Trip sequence was created concurrently, retrying the allocation')
+
+
+def bulk_create_trips(trips: List[models.Model]) -> Dict[str, int]:
+    """
+    Inserts trips into their shards, grouping them into one bulk insert per shard
+
+    :param trips: Unsaved trips
+    :return: Number of trips inserted per database alias
+    """
+
+    from .models import Trip
+
+    if not is_sharding_enabled():
+        Trip.objects.bulk_create(trips)
+
+        return {DEFAULT_DB_ALIAS: len(trips)}
+
+    for trip, trip_id in zip(trips, allocate_trip_ids(len(trips))):
+        trip.id = trip_id
+
+    trips_by_shard = defaultdict(list)
+
+    for trip in trips:
+        trips_by_shard[shard_for_user(trip.user_id)].append(trip)
+
+    for alias, shard_trips in trips_by_shard.items():
+        Trip.objects.using(alias).bulk_create(shard_trips)
+
+    return {alias: len(shard_trips) for alias, shard_trips in trips_by_shard.items()}
+
+
+def fan_out(
+        predicate: Optional[Q] = None,
+        ordering: Sequence[str] = ('id',),
+        limit: Optional[int] = None,
+        shards: Optional[Iterable[str]] = None) -> List[models.Model]:
+    """
+    Runs the same trip query on every shard and merges the ordered partial results.
+    Each shard returns at most @limit rows, so the merge never holds more than shards * limit trips.
+
+    :param predicate: Optional filter applied on every shard
+    :param ordering: Field names the result is ordered by, a leading '-' stands for descending order
+    :param limit: Optional maximum number of returned trips
+    :param shards: Optional list of shards, TRIP_SHARDS (or the default database) by default
+    :return: Merged list of trips
+    """
+
+    from .models import Trip
+
+    shards = list(shards or get_trip_shards() or [DEFAULT_DB_ALIAS])
+    partial_results = []
+
+    for alias in shards:
+        queryset = Trip.objects.using(alias).order_by(*ordering)
+
+        if predicate is not None:
+            queryset = queryset.filter(predicate)
+        if limit is not None:
+            queryset = queryset[:limit]
+
+        partial_results.append(list(queryset))
+
+    return merge_ordered(partial_results, ordering, limit)
+
+
+def merge_ordered(
+        partial_results: List[List[models.Model]],
+        ordering: Sequence[str],
+        limit: Optional[int] = None) -> List[models.Model]:
+    """
+    Merges results of the same query ordered by @ordering on several shards
+
+    :param partial_results: Ordered results of every shard
+    :param ordering: Field names the results are ordered by, a leading '-' stands for descending order
+    :param limit: Optional maximum number of returned objects
+    :return: Merged list of objects
+    """
+
+    if len(partial_results) == 1:
+        return partial_results[0]
+
+    descending = ordering[0].startswith('-') if ordering else False
+
+    if any(field.startswith('-') != descending for field in ordering):
+        # Mixed directions cannot be expressed as a single merge key, a stable multi-pass sort is used instead
+        merged = [trip for result in partial_results for trip in result]
+
+        for field in reversed(ordering):
+            merged.sort(key=lambda trip, name=field.lstrip('-'): getattr(trip, name), reverse=field.startswith('-'))
+    else:
+        fields = [field.lstrip('-') for field in ordering]
+        merged = list(heapq.merge(
+            *partial_results,
+            key=lambda trip: tuple(getattr(trip, field) for field in fields),
+            reverse=descending))
+
+    return merged[:limit] if limit is not None else merged
+
+
+def prefetch_trips(users: Sequence[models.Model], ordering: Sequence[str] = ('id',)) -> None:
+    """
+    Stores the trips of every user in its prefetched_trips attribute, querying every shard
+    holding trips of the users once. prefetch_related() cannot be used as it reads a single database
+
+    :param users: Users whose trips are loaded
+    :param ordering: Field names the trips of a user are ordered by
+    """
+
+    from .models import Trip
+
+    user_ids_by_shard = defaultdict(list)
+    trips_by_user = defaultdict(list)
+
+    for user in users:
+        user_ids_by_shard[shard_for_user(user.pk) if is_sharding_enabled() else DEFAULT_DB_ALIAS].append(user.pk)
+
+    for alias, user_ids in user_ids_by_shard.items():
+        for trip in Trip.objects.using(alias).filter(user__in=user_ids).order_by(*ordering):
+            trips_by_user[trip.user_id].append(trip)
+
+    for user in users:
+        user.prefetched_trips = trips_by_user[user.pk]
+
+
+def fan_out_count(predicate: Optional[Q] = None, shards: Optional[Iterable[str]] = None) -> int:
+    """
+    Counts trips matching @predicate on every shard
+
+    :param predicate: Optional filter applied on every shard
+    :param shards: Optional list of shards, TRIP_SHARDS (or the default database) by default
+    :return: Total number of matching trips
+    """
+
+    from .models import Trip
+
+    total = 0
+
+    for alias in shards or get_trip_shards() or [DEFAULT_DB_ALIAS]:
+        queryset = Trip.objects.using(alias)
+        total += (queryset.filter(predicate) if predicate is not None else queryset).count()
+
+    return total
@@ -0,0 +1,86 @@
+from functools import partial
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from .coalescing import next_generation
+from .events import CREATED, DELETED, UPDATED, build_event, get_broker
+from .models import ArchivedTrip, Trip, User
+from .sharding import allocate_trip_ids, is_sharding_enabled, shard_for_user
+from .summaries import refresh_trip_summary
+
+
+def assign_trip_id(sender: type, instance: Trip, raw: bool = False, **kwargs) -> None:
+    """
+    Assigns a globally unique ID to a new trip before it is inserted into its shard
+    """
+
+    if not raw and instance.pk is None and is_sharding_enabled():
+        instance.pk = allocate_trip_ids(1)[0]
+
+
+def delete_sharded_trips(sender: type, instance: User, **kwargs) -> None:
+    """
+    Deletes trips and archived trips of a deleted user from their shard. The cascade of the foreign key
+    only reaches trips stored in the database of the user.
+    """
+
+    if not is_sharding_enabled():
+        return
+
+    alias = shard_for_user(instance.pk)
+
+    if alias != DEFAULT_DB_ALIAS:
+        Trip.objects.using(alias).filter(user=instance.pk).delete()
+        ArchivedTrip.objects.using(alias).filter(user=instance.pk).delete()
+
+
+def publish_trip_saved(
+        sender: type, instance: Trip, created: bool, raw: bool = False, using: str = DEFAULT_DB_ALIAS, **kwargs) -> None:
+    """
+    Publishes the creation or update of a trip to the event streams once the transaction saving it commits
+    """
+
+    if raw:
+        return
+
+    event = build_event(CREATED if created else UPDATED, instance)
+    transaction.on_commit(lambda: get_broker().publish(event), using=using)
+
+
+def publish_trip_deleted(sender: type, instance: Trip, using: str = DEFAULT_DB_ALIAS, **kwargs) -> None:
+    """
+    Publishes the deletion of a trip to the event streams once the transaction deleting it commits
+    """
+
+    event = build_event(DELETED, instance)
+    transaction.on_commit(lambda: get_broker().publish(event), using=using)
+
+
+def update_trip_summaries(
+        sender: type, instance: Trip, raw: bool = False, using: str = DEFAULT_DB_ALIAS, **kwargs) -> None:
+    """
+    Refreshes the trip summaries of the user of a saved or deleted trip, and of its previous user
+    if the trip changed hands
+    """
+
+    if raw:
+        return
+
+    for user_id in {instance.user_id, getattr(instance, '_loaded_user_id', None)} - {None}:
+        if using == DEFAULT_DB_ALIAS:
+            # Users live in the default database, the summary is updated in the transaction of the trip
+            refresh_trip_summary(user_id)
+        else:
+            # Shards commit separately, the summary is computed from the committed trips
+            transaction.on_commit(partial(refresh_trip_summary, user_id), using=using)
+
+    instance._loaded_user_id = instance.user_id
+
+
+def invalidate_coalesced_reads(sender: type, using: str = DEFAULT_DB_ALIAS, **kwargs) -> None:
+    """
+    Keeps requests arriving after the commit of a user or trip write from sharing the response of a request
+    which may have read the data before the write
+    """
+
+    transaction.on_commit(next_generation, using=using)
@@ -0,0 +1,80 @@
+import datetime
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Count, Max, Min, Q
+from django.utils import timezone
+
+from .models import ArchivedTrip, Trip, User
+from .sharding import is_sharding_enabled, shard_for_user
+
+SUMMARY_FIELDS = ('trip_count', 'next_trip_start', 'last_trip_end')
+
+
+def compute_trip_summaries(user_ids: Iterable[int], today: datetime.date) -> Dict[int, dict]:
+    """
+    Aggregates the trips and archived trips of users with one grouped query per table and shard
+
+    :param user_ids: User IDs
+    :param today: First day counted as upcoming by next_trip_start
+    :return: Summary fields keyed by user ID
+    """
+
+    summaries = {}
+    user_ids_by_shard: Dict[str, List[int]] = defaultdict(list)
+
+    for user_id in user_ids:
+        summaries[user_id] = {'trip_count': 0, 'next_trip_start': None, 'last_trip_end': None}
+        user_ids_by_shard[shard_for_user(user_id) if is_sharding_enabled() else DEFAULT_DB_ALIAS].append(user_id)
+
+    for alias, shard_user_ids in user_ids_by_shard.items():
+        for model in (Trip, ArchivedTrip):
+            rows = model.objects.using(alias).filter(user__in=shard_user_ids).values('user').annotate(
+                trip_count=Count('id'),
+                next_trip_start=Min('start_date', filter=Q(start_date__gte=today)),
+                last_trip_end=Max('end_date'))
+
+            for row in rows:
+                summary = summaries[row['user']]
+                summary['trip_count'] += row['trip_count']
+                summary['next_trip_start'] = min(
+                    filter(None, (summary['next_trip_start'], row['next_trip_start'])), default=None)
+                summary['last_trip_end'] = max(
+                    filter(None, (summary['last_trip_end'], row['last_trip_end'])), default=None)
+
+    return summaries
+
+
+def refresh_trip_summary(user_id: int) -> None:
+    """
+    Recomputes the trip summary of an active user. Called after every trip write, in the transaction
+    of the write if the trip is stored in the default database
+
+    :param user_id: User ID
+    """
+
+    with transaction.atomic(using=DEFAULT_DB_ALIAS):
+        # Locking the user serializes concurrent trip writes of the user, so every aggregate sees the trips
+        # committed before it. Summaries of deleted users whose trips are being purged are not maintained
+        if not User.objects.using(DEFAULT_DB_ALIAS).select_for_update().filter(pk=user_id, is_active=True).exists():
+            return
+
+        summary = compute_trip_summaries([user_id], timezone.localdate())[user_id]
+        User.objects.using(DEFAULT_DB_ALIAS).filter(pk=user_id).update(**summary)
+
+
+def refresh_trip_summaries(user_ids: Iterable[int]) -> int:
+    """
+    Recomputes trip summaries of users in bulk, e.g. after trips have been inserted with bulk_create
+
+    :param user_ids: User IDs
+    :return: Number of refreshed users
+    """
+
+    summaries = compute_trip_summaries(user_ids, timezone.localdate())
+    users = [User(pk=user_id, **summary) for user_id, summary in summaries.items()]
+
+    User.objects.using(DEFAULT_DB_ALIAS).bulk_update(users, SUMMARY_FIELDS)
+
+    return len(users)
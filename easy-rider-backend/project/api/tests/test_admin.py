@@ -0,0 +1,165 @@
+from unittest import mock
+
+from django.contrib.admin import helpers
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from project.api.admin import EstimatedCountPaginator
+from project.api.models import RoleEnum, Trip, User
+from project.api.sharding import shard_for_user
+from project.jobs.models import Job
+
+SHARDS = ['default', 'shard']
+
+
+def _user_id_in_shard(alias: str, start: int) -> int:
+    return next(user_id for user_id in range(start, start + 100) if shard_for_user(user_id, SHARDS) == alias)
+
+
+@override_settings(ADMIN_BATCH_SIZE=2, ADMIN_EXACT_COUNT_LIMIT=2)
+class AdminTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.admin = User.objects.create(email='admin@example.com', role=int(RoleEnum.ADMIN), is_superuser=True)
+        cls.user = User.objects.create(email='user@example.com', role=int(RoleEnum.USER))
+        cls.other_user = User.objects.create(email='other@example.org', role=int(RoleEnum.USER))
+
+        for user in (cls.user, cls.user, cls.other_user):
+            Trip.objects.create(user=user, destination='Croatia', start_date='2020-07-01', end_date='2020-08-01')
+
+    def setUp(self) -> None:
+        self.client.force_login(self.admin)
+
+    def test_changelists_search_indexed_columns(self) -> None:
+        # Act
+        users = self.client.get('/admin/api/user/?q=@EXAMPLE.ORG')
+        trips = self.client.get('/admin/api/trip/?q=user')
+
+        # Assert
+        self.assertEqual([self.other_user], list(users.context['cl'].result_list))
+        self.assertEqual({self.user.id}, {trip.user_id for trip in trips.context['cl'].result_list})
+
+    def test_trip_forms_look_users_up_instead_of_listing_them(self) -> None:
+        # Act
+        response = self.client.get('/admin/api/trip/add/')
+
+        # Assert
+        self.assertContains(response, 'admin-autocomplete')
+        self.assertNotContains(response, 'other@example.org')
+
+    def test_large_tables_are_counted_from_statistics(self) -> None:
+        # Arrange
+        trips = Trip.objects.order_by('id')
+
+        # Act
+        with mock.patch('project.api.admin.estimate_row_count', return_value=1000000):
+            unfiltered_count = EstimatedCountPaginator(trips, 100).count
+            filtered_count = EstimatedCountPaginator(trips.filter(destination='Croatia'), 100).count
+
+        # Assert
+        self.assertEqual(1000000, unfiltered_count)
+        self.assertEqual(2, filtered_count)
+
+    def test_trips_are_deleted_in_batches(self) -> None:
+        # Act
+        response = self.client.post('/admin/api/trip/', {
+            'action': 'delete_trips',
+            helpers.ACTION_CHECKBOX_NAME: [trip.id for trip in Trip.objects.all()],
+            'select_across': '1',
+        })
+
+        # Assert
+        self.assertEqual(302, response.status_code)
+        self.assertFalse(Trip.objects.exists())
+        self.assertEqual(0, User.objects.get(pk=self.user.pk).trip_count)
+
+    def test_deleted_users_are_purged_in_the_background(self) -> None:
+        # Act
+        self.client.post('/admin/api/user/', {
+            'action': 'delete_users',
+            helpers.ACTION_CHECKBOX_NAME: [self.user.id, self.other_user.id],
+        })
+
+        # Assert
+        self.assertFalse(User.objects.filter(pk__in=[self.user.id, self.other_user.id], is_active=True).exists())
+        self.assertEqual(2, Job.objects.filter(name='api.purge_user', user_id=self.admin.id).count())
+
+
+@override_settings(ADMIN_BATCH_SIZE=2, TRIP_EVENTS_ENABLED=True)
+class AdminTripDeletionTest(TransactionTestCase):
+    """
+    Deletions are published once the batches commit, so the fixtures have to be committed
+    """
+
+    def setUp(self) -> None:
+        self.admin = User.objects.create(email='admin@example.com', role=int(RoleEnum.ADMIN), is_superuser=True)
+        self.user = User.objects.create(email='user@example.com', role=int(RoleEnum.USER))
+        self.trips = [
+            Trip.objects.create(user=self.user, destination='Croatia', start_date='2020-07-01', end_date='2020-08-01')
+            for _ in range(3)]
+        self.client.force_login(self.admin)
+
+    def test_deleted_trips_are_published_and_invalidate_coalesced_reads(self) -> None:
+        # Act
+        with mock.patch('project.api.admin.get_broker') as get_broker, \
+                mock.patch('project.api.admin.next_generation') as next_generation:
+            self.client.post('/admin/api/trip/', {
+                'action': 'delete_trips',
+                helpers.ACTION_CHECKBOX_NAME: [trip.id for trip in self.trips],
+            })
+
+        # Assert
+        events = [call.args[0] for call in get_broker.return_value.publish.call_args_list]
+        self.assertEqual([('deleted', self.user.id, {'id': trip.id}) for trip in self.trips],
+                         [(event['type'], event['user'], event['data']) for event in events])
+        self.assertEqual(2, next_generation.call_count)
+
+
+@override_settings(TRIP_SHARDS=SHARDS)
+class ShardedAdminTest(TestCase):
+    databases = {'default', 'shard'}
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.admin = User.objects.create(
+            id=_user_id_in_shard('default', 100), email='admin@example.com', role=int(RoleEnum.ADMIN), is_superuser=True)
+        cls.default_user = User.objects.create(
+            id=_user_id_in_shard('default', cls.admin.id + 1), email='default@example.com', role=int(RoleEnum.USER))
+        cls.shard_user = User.objects.create(
+            id=_user_id_in_shard('shard', 100), email='shard@example.com', role=int(RoleEnum.USER))
+
+    def setUp(self) -> None:
+        self.client.force_login(self.admin)
+        self.default_trip = Trip.objects.create(
+            user=self.default_user, destination='Croatia', start_date='2020-07-01', end_date='2020-08-01')
+        self.shard_trip = Trip.objects.create(
+            user=self.shard_user, destination='Hawaii', start_date='2020-07-01', end_date='2020-08-01')
+
+    def test_changelist_shows_the_trips_of_the_selected_shard(self) -> None:
+        # Act
+        default_response = self.client.get('/admin/api/trip/')
+        shard_response = self.client.get('/admin/api/trip/?shard=shard')
+        search_response = self.client.get('/admin/api/trip/?shard=shard&q=shard')
+
+        # Assert
+        self.assertEqual([self.default_trip], list(default_response.context['cl'].result_list))
+        self.assertEqual([self.shard_trip], list(shard_response.context['cl'].result_list))
+        self.assertContains(shard_response, 'shard@example.com')
+        self.assertEqual([self.shard_trip], list(search_response.context['cl'].result_list))
+
+    def test_trips_of_shards_can_be_changed(self) -> None:
+        # Act
+        response = self.client.get(f'/admin/api/trip/{self.shard_trip.id}/change/')
+
+        # Assert
+        self.assertContains(response, 'Hawaii')
+
+    def test_trips_are_deleted_from_the_selected_shard(self) -> None:
+        # Act
+        self.client.post('/admin/api/trip/?shard=shard', {
+            'action': 'delete_trips',
+            helpers.ACTION_CHECKBOX_NAME: [self.shard_trip.id],
+        })
+
+        # Assert
+        self.assertFalse(Trip.objects.using('shard').exists())
+        self.assertTrue(Trip.objects.using('default').exists())
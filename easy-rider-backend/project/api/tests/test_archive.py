@@ -0,0 +1,120 @@
+import datetime
+from io import StringIO
+from typing import List
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from project.api.archive import reaches_archive
+from project.api.models import ArchivedTrip, RoleEnum, Trip, User
+from project.api.tests.test_sharding import SHARDS, _user_id_in_shard
+
+HORIZON = datetime.date(2020, 1, 1)
+
+
+class ReachesArchiveTest(SimpleTestCase):
+    def test_lists_without_date_filters_skip_the_archive(self) -> None:
+        # Act & Assert
+        self.assertFalse(reaches_archive({}, HORIZON))
+        self.assertFalse(reaches_archive({'destination': 'Croatia'}, HORIZON))
+
+    def test_date_filters_without_a_recent_lower_bound_reach_the_archive(self) -> None:
+        # Act & Assert
+        self.assertTrue(reaches_archive({'start_date__gte': '2019-06-01'}, HORIZON))
+        self.assertTrue(reaches_archive({'end_date__lt': '2030-01-01'}, HORIZON))
+        self.assertTrue(reaches_archive({'start_date__gt': '2019-12-30'}, HORIZON))
+
+    def test_lower_bounds_after_the_horizon_skip_the_archive(self) -> None:
+        # Act & Assert
+        self.assertFalse(reaches_archive({'start_date__gte': '2020-01-01', 'end_date__lt': '2030-01-01'}, HORIZON))
+        self.assertFalse(reaches_archive({'end_date__gt': '2019-12-31'}, HORIZON))
+        self.assertFalse(reaches_archive({'end_date': '2020-02-01'}, HORIZON))
+
+
+@override_settings(TRIP_ARCHIVE_AFTER_DAYS=365, TRIP_ARCHIVE_BATCH_SIZE=2)
+class TripArchiveTest(TestCase):
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create(email='user@example.com', role=int(RoleEnum.USER))
+        cls.today = timezone.localdate()
+
+        for years_ago in (5, 4, 3, 2, 0):
+            start_date = cls.today.replace(year=cls.today.year - years_ago, month=1, day=1)
+            Trip.objects.create(
+                user=cls.user,
+                destination=str(start_date.year),
+                start_date=start_date,
+                end_date=start_date + datetime.timedelta(days=7))
+
+    def setUp(self) -> None:
+        call_command('archive_trips', stdout=StringIO())
+        self.client.force_authenticate(self.user)
+
+    def _list_destinations(self, path: str) -> List[str]:
+        response = self.client.get(path)
+
+        self.assertEqual(200, response.status_code)
+
+        results = response.data['results'] if isinstance(response.data, dict) else response.data
+
+        return sorted(trip['destination'] for trip in results)
+
+    def test_trips_which_ended_before_the_horizon_are_archived(self) -> None:
+        # Assert
+        self.assertEqual([str(self.today.year)], [trip.destination for trip in Trip.objects.all()])
+        self.assertEqual(4, ArchivedTrip.objects.filter(user=self.user).count())
+
+    def test_lists_without_date_filters_show_trips_which_have_not_been_archived(self) -> None:
+        # Act
+        destinations = self._list_destinations(f'/api/users/{self.user.id}/trips/')
+
+        # Assert
+        self.assertEqual([str(self.today.year)], destinations)
+
+    def test_lists_reaching_past_the_horizon_include_archived_trips(self) -> None:
+        # Arrange
+        since = self.today.replace(year=self.today.year - 3, month=1, day=1)
+
+        # Act
+        destinations = self._list_destinations(f'/api/users/{self.user.id}/trips/?start_date__gte={since}')
+        response = self.client.get(f'/api/trips/?start_date__gte={since}&limit=2&offset=1')
+
+        # Assert
+        self.assertEqual([str(self.today.year - years_ago) for years_ago in (3, 2, 0)], destinations)
+        self.assertEqual(3, response.data['count'])
+        self.assertEqual(
+            [str(self.today.year - 2), str(self.today.year)], [trip['destination'] for trip in response.data['results']])
+
+    def test_archived_trips_can_be_retrieved_but_not_changed(self) -> None:
+        # Arrange
+        archived_trip = ArchivedTrip.objects.order_by('id').first()
+        path = f'/api/users/{self.user.id}/trips/{archived_trip.id}/'
+
+        # Act
+        retrieved = self.client.get(path)
+        deleted = self.client.delete(path)
+
+        # Assert
+        self.assertEqual((200, archived_trip.destination), (retrieved.status_code, retrieved.data['destination']))
+        self.assertEqual(404, deleted.status_code)
+
+
+@override_settings(TRIP_SHARDS=SHARDS, TRIP_ARCHIVE_AFTER_DAYS=365)
+class ShardedTripArchiveTest(TestCase):
+    databases = {'default', 'shard'}
+
+    def test_trips_are_archived_in_their_shard(self) -> None:
+        # Arrange
+        user = User.objects.create(id=_user_id_in_shard('shard', 100), email='shard@example.com', role=int(RoleEnum.USER))
+        Trip.objects.create(user=user, destination='Croatia', start_date='2015-07-01', end_date='2015-08-01')
+
+        # Act
+        call_command('archive_trips', stdout=StringIO())
+
+        # Assert
+        self.assertFalse(Trip.objects.using('shard').exists())
+        self.assertEqual(['Croatia'], [trip.destination for trip in ArchivedTrip.objects.for_user(user.id)])
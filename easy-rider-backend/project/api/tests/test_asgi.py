@@ -0,0 +1,189 @@
+from typing import List, Optional, Tuple
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.test import TransactionTestCase, override_settings
+from rest_framework_jwt.settings import api_settings
+
+from project.api.archive import archive_trips, get_archive_horizon
+from project.api.asgi import AsyncReadApplication
+from project.api.models import RoleEnum, Trip, User
+
+jwt_payload_handler = api_settings.JWT_PAYLOAD_HANDLER
+jwt_encode_handler = api_settings.JWT_ENCODE_HANDLER
+
+
+class AsyncReadApplicationTest(TransactionTestCase):
+    """
+    The async endpoints run their queries in worker threads, so the fixtures have to be committed
+    """
+
+    def setUp(self) -> None:
+        self.django_calls = 0
+        django_application = get_asgi_application()
+
+        async def counting_application(scope, receive, send) -> None:
+            self.django_calls += 1
+            await django_application(scope, receive, send)
+
+        self.application = AsyncReadApplication(counting_application)
+
+        self.user = User.objects.create(email='user@example.com', role=int(RoleEnum.USER))
+        self.other_user = User.objects.create(email='other@example.com', role=int(RoleEnum.USER))
+        self.manager = User.objects.create(email='manager@example.com', role=int(RoleEnum.MANAGER))
+        self.admin = User.objects.create(email='admin@example.com', role=int(RoleEnum.ADMIN))
+
+        self.trip = Trip.objects.create(
+            user=self.user, destination='Croatia', start_date='2020-07-01', end_date='2020-08-01', comment='')
+        Trip.objects.create(
+            user=self.user, destination='Italy', start_date='2020-08-01', end_date='2020-09-01', comment='')
+
+    def _get(
+            self,
+            path: str,
+            user: Optional[User] = None,
+            query_string: bytes = b'',
+            accept: bytes = b'application/json') -> Tuple[int, bytes]:
+        headers: List[Tuple[bytes, bytes]] = [(b'accept', accept)]
+
+        if user is not None:
+            token = jwt_encode_handler(jwt_payload_handler(user))
+            prefix = settings.JWT_AUTH['JWT_AUTH_HEADER_PREFIX']
+            headers.append((b'authorization', f'{prefix} {token}'.encode()))
+
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': query_string,
+            'root_path': '',
+            'headers': headers,
+            'server': ('testserver', 80),
+            'client': ('127.0.0.1', 12345),
+        }
+        messages = []
+
+        async def receive() -> dict:
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message: dict) -> None:
+            messages.append(message)
+
+        async_to_sync(self.application)(scope, receive, send)
+
+        status = messages[0]['status']
+        body = b''.join(message.get('body', b'') for message in messages[1:])
+
+        return status, body
+
+    def _assert_same_as_django(
+            self, path: str, user: Optional[User], query_string: bytes = b'', accept: bytes = b'application/json') -> int:
+        with override_settings(ASYNC_READ_ENDPOINTS=False):
+            expected = self._get(path, user, query_string, accept)
+
+        django_calls = self.django_calls
+        actual = self._get(path, user, query_string, accept)
+
+        self.assertEqual(expected, actual)
+
+        return self.django_calls - django_calls
+
+    def test_current_user_is_served_natively(self) -> None:
+        # Act
+        django_calls = self._assert_same_as_django('/api/auth/user/', self.user)
+
+        # Assert
+        self.assertEqual(0, django_calls)
+
+    def test_user_retrieve_is_served_natively(self) -> None:
+        # Act
+        django_calls = self._assert_same_as_django(f'/api/users/{self.user.id}/', self.manager)
+
+        # Assert
+        self.assertEqual(0, django_calls)
+
+    def test_user_retrieve_hides_invisible_users(self) -> None:
+        # Act
+        django_calls = self._assert_same_as_django(f'/api/users/{self.admin.id}/', self.manager)
+
+        # Assert
+        self.assertEqual(0, django_calls)
+
+    def test_trip_list_is_served_natively(self) -> None:
+        # Act
+        django_calls = self._assert_same_as_django(f'/api/users/{self.user.id}/trips/', self.user)
+
+        # Assert
+        self.assertEqual(0, django_calls)
+
+    def test_trip_list_applies_filters(self) -> None:
+        # Act
+        django_calls = self._assert_same_as_django(
+            f'/api/users/{self.user.id}/trips/', self.user, b'destination=Italy')
+
+        # Assert
+        self.assertEqual(0, django_calls)
+
+    def test_trip_list_denies_other_users(self) -> None:
+        # Act
+        django_calls = self._assert_same_as_django(f'/api/users/{self.user.id}/trips/', self.other_user)
+
+        # Assert
+        self.assertEqual(0, django_calls)
+
+    def test_trip_retrieve_is_served_natively(self) -> None:
+        # Act
+        django_calls = self._assert_same_as_django(f'/api/users/{self.user.id}/trips/{self.trip.id}/', self.admin)
+
+        # Assert
+        self.assertEqual(0, django_calls)
+
+    def test_archived_trips_are_served_by_django(self) -> None:
+        # Arrange
+        archive_trips('default', get_archive_horizon(), 100)
+        path = f'/api/users/{self.user.id}/trips/'
+
+        # Act
+        list_calls = self._assert_same_as_django(path, self.user, b'start_date__lt=2020-08-01')
+        retrieve_calls = self._assert_same_as_django(f'{path}{self.trip.id}/', self.user)
+
+        # Assert
+        self.assertEqual(1, list_calls)
+        self.assertEqual(1, retrieve_calls)
+        self.assertIn(b'Croatia', self._get(f'{path}{self.trip.id}/', self.user)[1])
+
+    def test_content_is_negotiated_like_django(self) -> None:
+        # Arrange
+        path = f'/api/users/{self.user.id}/trips/'
+
+        for accept, expected_django_calls in (
+                (b'*/*', 0),
+                (b'application/msgpack, application/json;q=0.1', 0),
+                (b'application/msgpack, */*', 1),
+                (b'application/json-patch+json', 1),
+                (b'text/html', 1)):
+            with self.subTest(accept=accept):
+                # Act
+                django_calls = self._assert_same_as_django(path, self.user, accept=accept)
+
+                # Assert
+                self.assertEqual(expected_django_calls, django_calls)
+
+    def test_anonymous_requests_are_delegated_to_django(self) -> None:
+        # Act
+        django_calls = self._assert_same_as_django(f'/api/users/{self.user.id}/trips/', None)
+
+        # Assert
+        self.assertEqual(1, django_calls)
+
+    def test_paginated_requests_are_delegated_to_django(self) -> None:
+        # Act
+        django_calls = self._assert_same_as_django(f'/api/users/{self.user.id}/trips/', self.user, b'limit=1')
+
+        # Assert
+        self.assertEqual(1, django_calls)
@@ -0,0 +1,154 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.conf import settings
+from django.test import SimpleTestCase, TransactionTestCase
+from rest_framework.mixins import ListModelMixin
+from rest_framework.test import APIClient
+from rest_framework_jwt.settings import api_settings
+
+from project.api.coalescing import RequestCoalescer, coalescer, get_coalescing_key, get_user_scope
+from project.api.models import RoleEnum, Trip, User
+
+jwt_payload_handler = api_settings.JWT_PAYLOAD_HANDLER
+jwt_encode_handler = api_settings.JWT_ENCODE_HANDLER
+
+
+def _wait_for_followers(instance: RequestCoalescer, count: int) -> None:
+    deadline = time.monotonic() + 5
+
+    while sum(flight.followers for flight in list(instance._flights.values())) < count:
+        if time.monotonic() > deadline:
+            raise AssertionError(f'{count} followers did not join in time')
+
+        time.sleep(0.001)
+
+
+class RequestCoalescerTest(SimpleTestCase):
+    def setUp(self) -> None:
+        self.coalescer = RequestCoalescer()
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.addCleanup(self.executor.shutdown)
+
+    def _block(self, result: str) -> str:
+        self.release.wait(5)
+
+        return result
+
+    def test_concurrent_calls_share_one_computation(self) -> None:
+        # Arrange
+        leader = self.executor.submit(self.coalescer.run, 'key', lambda: self._block('leader'), 5)
+        followers = [self.executor.submit(self.coalescer.run, 'key', lambda: 'follower', 5) for _ in range(3)]
+        _wait_for_followers(self.coalescer, 3)
+
+        # Act
+        self.release.set()
+
+        # Assert
+        self.assertEqual(('leader', True), leader.result(5))
+        self.assertEqual([('leader', False)] * 3, [follower.result(5) for follower in followers])
+        self.assertEqual(
+            {'leaders': 1, 'followers': 3, 'timeouts': 0, 'failures': 0, 'in_flight': 0, 'coalesced_rate': 0.75},
+            self.coalescer.stats)
+
+    def test_waiting_is_bounded_by_the_timeout(self) -> None:
+        # Arrange
+        leader = self.executor.submit(self.coalescer.run, 'key', lambda: self._block('leader'), 5)
+        follower = self.executor.submit(self.coalescer.run, 'key', lambda: 'follower', 0.01)
+
+        # Act
+        result = follower.result(5)
+        self.release.set()
+
+        # Assert
+        self.assertEqual(('follower', True), result)
+        self.assertEqual(('leader', True), leader.result(5))
+        self.assertEqual(1, self.coalescer.stats['timeouts'])
+
+    def test_failed_computation_is_repeated_by_the_followers(self) -> None:
+        # Arrange
+        def fail() -> None:
+            self.release.wait(5)
+            raise ValueError('Database unavailable')
+
+        leader = self.executor.submit(self.coalescer.run, 'key', fail, 5)
+        follower = self.executor.submit(self.coalescer.run, 'key', lambda: 'follower', 5)
+        _wait_for_followers(self.coalescer, 1)
+
+        # Act
+        self.release.set()
+
+        # Assert
+        with self.assertRaises(ValueError):
+            leader.result(5)
+
+        self.assertEqual(('follower', True), follower.result(5))
+        self.assertEqual(1, self.coalescer.stats['failures'])
+
+
+class CoalescedReadsTest(TransactionTestCase):
+    """
+    Concurrent requests are served by threads with their own connections, so the fixtures have to be committed
+    """
+
+    def setUp(self) -> None:
+        self.user = User.objects.create(email='user@example.com', role=int(RoleEnum.USER))
+        self.admin = User.objects.create(email='admin@example.com', role=int(RoleEnum.ADMIN))
+        Trip.objects.create(user=self.user, destination='Croatia', start_date='2020-07-01', end_date='2020-08-01')
+        coalescer.reset_stats()
+
+    def _get(self, user: User, path: str) -> tuple:
+        client = APIClient()
+        token = jwt_encode_handler(jwt_payload_handler(user))
+        client.credentials(HTTP_AUTHORIZATION=f'{settings.JWT_AUTH["JWT_AUTH_HEADER_PREFIX"]} {token}')
+        response = client.get(path)
+
+        return response.status_code, json.loads(response.content)
+
+    def test_identical_concurrent_reads_run_once(self) -> None:
+        # Arrange
+        release = threading.Event()
+        self.addCleanup(release.set)
+        list_trips = ListModelMixin.list
+        calls = []
+
+        def blocking_list(view, request, *args, **kwargs):
+            calls.append(request.user.id)
+            release.wait(5)
+
+            return list_trips(view, request, *args, **kwargs)
+
+        path = f'/api/users/{self.user.id}/trips/'
+
+        # Act
+        with mock.patch.object(ListModelMixin, 'list', blocking_list), ThreadPoolExecutor(max_workers=4) as executor:
+            responses = [executor.submit(self._get, user, path) for user in (self.user, self.user, self.admin)]
+            _wait_for_followers(coalescer, 2)
+            release.set()
+            results = [response.result(5) for response in responses]
+
+        # Assert
+        self.assertEqual(1, len(calls))
+        self.assertEqual([results[0]] * 3, results)
+        self.assertEqual(200, results[0][0])
+        self.assertEqual(['Croatia'], [trip['destination'] for trip in results[0][1]])
+        self.assertEqual(2, coalescer.stats['followers'])
+
+    def test_writes_and_scopes_separate_keys(self) -> None:
+        # Arrange
+        manager = User.objects.create(email='manager@example.com', role=int(RoleEnum.MANAGER))
+        other_manager = User.objects.create(email='other@example.com', role=int(RoleEnum.MANAGER))
+        key_before_write = get_coalescing_key('/api/users/', get_user_scope(manager))
+
+        # Act
+        Trip.objects.create(user=self.user, destination='Italy', start_date='2020-09-01', end_date='2020-09-10')
+
+        # Assert
+        self.assertNotEqual(key_before_write, get_coalescing_key('/api/users/', get_user_scope(manager)))
+        self.assertEqual(get_user_scope(manager), get_user_scope(other_manager))
+        self.assertNotEqual(get_user_scope(self.user), get_user_scope(manager))
@@ -0,0 +1,158 @@
+import datetime
+import gzip
+import json
+import unittest
+import zlib
+
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from project.api.compression import CODECS, CompressedBodyCache, GzipCodec, compressed_bodies, negotiate
+from project.api.middleware import CompressionMiddleware
+from project.api.models import RoleEnum, Trip, User
+
+BODY = {'results': [{'destination': f'Destination {number}', 'comment': 'Sunny beach ' * 10} for number in range(50)]}
+
+
+@override_settings(
+    COMPRESSION_ENCODINGS=['br', 'zstd', 'gzip'],
+    COMPRESSION_MIN_SIZE=1024,
+    COMPRESSION_CONTENT_TYPES=['application/json', 'text/'])
+class CompressionMiddlewareTest(SimpleTestCase):
+    def setUp(self) -> None:
+        compressed_bodies.clear()
+
+    def _process(self, response: HttpResponse, accept_encoding: str = 'gzip') -> HttpResponse:
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept_encoding)
+
+        return CompressionMiddleware(lambda _: response)(request)
+
+    def test_json_bodies_are_compressed(self) -> None:
+        # Act
+        response = self._process(JsonResponse(BODY))
+
+        # Assert
+        self.assertEqual('gzip', response['Content-Encoding'])
+        self.assertEqual(str(len(response.content)), response['Content-Length'])
+        self.assertEqual(BODY, json.loads(gzip.decompress(response.content)))
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_small_bodies_are_not_compressed(self) -> None:
+        # Act
+        response = self._process(JsonResponse({'id': 1}))
+
+        # Assert
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertFalse(response.has_header('Vary'))
+
+    def test_content_types_outside_the_allowlist_are_not_compressed(self) -> None:
+        # Act
+        response = self._process(HttpResponse(b'\0' * 4096, content_type='image/png'))
+
+        # Assert
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_bodies_are_not_compressed_for_clients_refusing_all_codings(self) -> None:
+        # Act
+        response = self._process(JsonResponse(BODY), 'gzip;q=0, identity')
+
+        # Assert
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    @unittest.skipUnless('br' in CODECS, 'brotli is not installed')
+    def test_preferred_coding_wins_among_equally_accepted_ones(self) -> None:
+        # Act
+        response = self._process(JsonResponse(BODY), 'gzip, deflate, br')
+
+        # Assert
+        self.assertEqual('br', response['Content-Encoding'])
+
+    def test_streamed_chunks_can_be_decoded_as_they_arrive(self) -> None:
+        # Arrange
+        chunks = [json.dumps(item).encode() for item in BODY['results']]
+
+        # Act
+        response = self._process(StreamingHttpResponse(iter(chunks), content_type='text/event-stream'))
+        decompressor = zlib.decompressobj(31)
+        compressed_chunks = iter(response.streaming_content)
+        first_chunk = decompressor.decompress(next(compressed_chunks))
+        rest = b''.join(decompressor.decompress(chunk) for chunk in compressed_chunks)
+
+        # Assert
+        self.assertEqual('gzip', response['Content-Encoding'])
+        self.assertEqual(chunks[0], first_chunk)
+        self.assertEqual(b''.join(chunks), first_chunk + rest)
+
+    def test_repeated_bodies_are_compressed_once(self) -> None:
+        # Act
+        first = self._process(JsonResponse(BODY))
+        second = self._process(JsonResponse(BODY))
+
+        # Assert
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(1, compressed_bodies.stats['hits'])
+        self.assertEqual(1, compressed_bodies.stats['misses'])
+
+    def test_strong_etags_are_weakened(self) -> None:
+        # Arrange
+        response = JsonResponse(BODY)
+        response['ETag'] = '"abc"'
+
+        # Act
+        response = self._process(response)
+
+        # Assert
+        self.assertEqual('W/"abc"', response['ETag'])
+
+
+class CompressionTest(SimpleTestCase):
+    def test_quality_values_are_respected(self) -> None:
+        # Arrange
+        codecs = [GzipCodec(6)]
+
+        # Act & Assert
+        self.assertIsNone(negotiate('br', codecs))
+        self.assertIsNone(negotiate('*;q=0', codecs))
+        self.assertIsNotNone(negotiate('*', codecs))
+
+    def test_cache_is_bounded(self) -> None:
+        # Arrange
+        cache = CompressedBodyCache(60)
+        codec = GzipCodec(6)
+
+        # Act
+        for number in range(3):
+            cache.compress(codec, f'body {number}'.encode())
+
+        # Assert
+        self.assertLessEqual(cache.stats['bytes'], 60)
+        self.assertGreater(cache.stats['evictions'], 0)
+
+
+class CompressedApiTest(TestCase):
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create(email='user@example.com', role=int(RoleEnum.USER))
+
+        for number in range(20):
+            Trip.objects.create(
+                user=cls.user,
+                destination=f'Destination {number}',
+                start_date=datetime.date(2020, 7, 1),
+                end_date=datetime.date(2020, 8, 1),
+                comment='Sunny beach ' * 20)
+
+    def test_trip_lists_are_compressed(self) -> None:
+        # Arrange
+        self.client.force_authenticate(self.user)
+
+        # Act
+        response = self.client.get(f'/api/users/{self.user.id}/trips/', HTTP_ACCEPT_ENCODING='gzip')
+
+        # Assert
+        self.assertEqual('gzip', response['Content-Encoding'])
+        self.assertEqual(20, len(json.loads(gzip.decompress(response.content))))
@@ -0,0 +1,171 @@
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import OperationalError, connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from project.api import db
+from project.api.db import check_connection_health, run_sqlite_maintenance, schedule_sqlite_maintenance, statement_timeout
+from project.api.models import RoleEnum, Trip, User
+
+SLOW_QUERY = (
+    'WITH RECURSIVE counter(value) AS (SELECT 1 UNION ALL SELECT value + 1 FROM counter WHERE value < %s) '
+    'SELECT COUNT(*) FROM counter'
+)
+
+
+class StatementTimeoutTest(TestCase):
+    def test_statement_timeout_interrupts_slow_statements(self) -> None:
+        # Act & Assert
+        with self.assertRaises(OperationalError):
+            with statement_timeout(1):
+                with connection.cursor() as cursor:
+                    cursor.execute(SLOW_QUERY, [100_000_000])
+
+    def test_statement_timeout_is_reset_after_the_block(self) -> None:
+        # Arrange
+        with statement_timeout(10_000):
+            pass
+
+        # Act
+        with connection.cursor() as cursor:
+            cursor.execute(SLOW_QUERY, [100_000])
+            count = cursor.fetchone()[0]
+
+        # Assert
+        self.assertEqual(100_000, count)
+
+    def test_middleware_returns_service_unavailable_on_timeout(self) -> None:
+        # Arrange
+        user = User.objects.create(email='admin@example.com', role=int(RoleEnum.ADMIN))
+        Trip.objects.create(user=user, destination='Croatia', start_date='2020-07-01', end_date='2020-08-01')
+        client = APIClient()
+        client.force_authenticate(user)
+        slow_queryset = Trip.objects.extra(where=[f'({SLOW_QUERY % 100_000_000}) > 0'])
+
+        # Act
+        with override_settings(DATABASE_STATEMENT_TIMEOUTS={'user-trips-list': 1}), \
+                mock.patch('project.api.views.TripViewSet.get_queryset', return_value=slow_queryset):
+            response = client.get(f'/api/users/{user.id}/trips/')
+
+        # Assert
+        self.assertEqual(503, response.status_code)
+
+
+class ConnectionHealthCheckTest(SimpleTestCase):
+    def _connection(self, conn_max_age: int, usable: bool) -> mock.Mock:
+        database_connection = mock.Mock()
+        database_connection.settings_dict = {'CONN_MAX_AGE': conn_max_age}
+        database_connection.is_usable.return_value = usable
+
+        return database_connection
+
+    def test_unusable_persistent_connections_are_closed(self) -> None:
+        # Arrange
+        database_connection = self._connection(600, usable=False)
+
+        # Act
+        with mock.patch('project.api.db.connections') as connections:
+            connections.all.return_value = [database_connection]
+            check_connection_health()
+
+        # Assert
+        database_connection.close.assert_called_once_with()
+
+    def test_usable_and_non_persistent_connections_are_kept(self) -> None:
+        # Arrange
+        usable_connection = self._connection(600, usable=True)
+        non_persistent_connection = self._connection(0, usable=False)
+
+        # Act
+        with mock.patch('project.api.db.connections') as connections:
+            connections.all.return_value = [usable_connection, non_persistent_connection]
+            check_connection_health()
+
+        # Assert
+        usable_connection.close.assert_not_called()
+        non_persistent_connection.close.assert_not_called()
+        non_persistent_connection.is_usable.assert_not_called()
+
+
+class SQLiteTuningTest(SimpleTestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.connection = DatabaseWrapper({**connection.settings_dict, 'NAME': str(Path(directory.name) / 'tuning.sqlite3')})
+        self.addCleanup(self.connection.close)
+
+    def _pragma(self, name: str) -> object:
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+
+            return cursor.fetchone()[0]
+
+    def test_pragmas_are_applied_to_new_connections(self) -> None:
+        # Act
+        with override_settings(SQLITE_PRAGMAS={'journal_mode': 'wal', 'synchronous': 'normal', 'busy_timeout': 1234}):
+            self.connection.ensure_connection()
+
+        # Assert
+        self.assertEqual('wal', self._pragma('journal_mode'))
+        self.assertEqual(1, self._pragma('synchronous'))
+        self.assertEqual(1234, self._pragma('busy_timeout'))
+
+    def test_invalid_pragmas_are_rejected(self) -> None:
+        # Act & Assert
+        with override_settings(SQLITE_PRAGMAS={'journal_mode': 'wal; DROP TABLE api_trip'}):
+            with self.assertRaises(ImproperlyConfigured):
+                self.connection.ensure_connection()
+
+    def test_maintenance_checkpoints_the_wal(self) -> None:
+        # Arrange
+        with override_settings(SQLITE_PRAGMAS={'journal_mode': 'wal'}):
+            self.connection.ensure_connection()
+
+        with self.connection.cursor() as cursor:
+            cursor.execute('CREATE TABLE item (value INTEGER)')
+            cursor.execute('INSERT INTO item VALUES (1)')
+
+        # Act
+        with mock.patch('project.api.db.connections', {'default': self.connection}):
+            busy, log_frames, checkpointed_frames = run_sqlite_maintenance(analyze=True, checkpoint_mode='truncate')
+
+        # Assert
+        self.assertEqual((0, 0, 0), (busy, log_frames, checkpointed_frames))
+
+    def test_maintenance_runs_at_most_once_per_interval(self) -> None:
+        # Arrange
+        db._last_maintenance = time.monotonic() - 3600
+
+        self.connection.ensure_connection()
+
+        # Act
+        with override_settings(SQLITE_MAINTENANCE_INTERVAL=3600), \
+                mock.patch('project.api.db.connections', mock.Mock(all=lambda: [self.connection])), \
+                mock.patch('project.api.db.run_sqlite_maintenance') as run_maintenance:
+            schedule_sqlite_maintenance()
+            first_call_count = run_maintenance.call_count
+            schedule_sqlite_maintenance()
+
+        # Assert
+        run_maintenance.assert_called_once_with(self.connection.alias)
+        self.assertEqual(first_call_count, run_maintenance.call_count)
+
+    def test_maintenance_does_not_connect_unused_databases(self) -> None:
+        # Arrange
+        db._last_maintenance = time.monotonic() - 3600
+
+        # Act
+        with override_settings(SQLITE_MAINTENANCE_INTERVAL=3600), \
+                mock.patch('project.api.db.connections', mock.Mock(all=lambda: [self.connection])), \
+                mock.patch('project.api.db.run_sqlite_maintenance') as run_maintenance:
+            schedule_sqlite_maintenance()
+
+        # Assert
+        run_maintenance.assert_not_called()
+        self.assertIsNone(self.connection.connection)
@@ -0,0 +1,256 @@
+import asyncio
+import json
+from typing import Callable, List, Optional, Tuple
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_jwt.settings import api_settings
+
+from project.api.asgi import AsyncReadApplication
+from project.api.events import LocalBackend, TripEventBroker, reset_broker
+from project.api.models import RoleEnum, Trip, User
+
+jwt_payload_handler = api_settings.JWT_PAYLOAD_HANDLER
+jwt_encode_handler = api_settings.JWT_ENCODE_HANDLER
+
+
+def _parse_events(body: bytes) -> List[dict]:
+    events = []
+
+    for block in body.decode().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if ': ' in line and not line.startswith(':'))
+
+        if 'event' in fields:
+            events.append({'id': fields.get('id'), 'event': fields['event'], 'data': json.loads(fields['data'])})
+
+    return events
+
+
+class TripEventStreamTest(TransactionTestCase):
+    """
+    Events are published once the transactions commit, so the fixtures have to be committed
+    """
+
+    def setUp(self) -> None:
+        reset_broker()
+        self.addCleanup(reset_broker)
+
+        async def django_application(scope, receive, send) -> None:
+            raise AssertionError('The stream has to be served by the ASGI application')
+
+        self.application = AsyncReadApplication(django_application)
+        self.user = User.objects.create(email='user@example.com', role=int(RoleEnum.USER))
+        self.other_user = User.objects.create(email='other@example.com', role=int(RoleEnum.USER))
+        self.manager = User.objects.create(email='manager@example.com', role=int(RoleEnum.MANAGER))
+
+    def _token(self, user: User) -> str:
+        return jwt_encode_handler(jwt_payload_handler(user))
+
+    def _scope(
+            self,
+            user: User,
+            path: str,
+            headers: Optional[List[Tuple[bytes, bytes]]] = None,
+            query_string: Optional[str] = None) -> dict:
+        """
+        Authenticates with the Authorization header unless credentials are passed in @query_string
+        """
+
+        headers = list(headers or [])
+
+        if query_string is None:
+            headers.append((b'authorization', f'{api_settings.JWT_AUTH_HEADER_PREFIX} {self._token(user)}'.encode()))
+
+        return {
+            'type': 'http',
+            'method': 'GET',
+            'path': path,
+            'query_string': (query_string or '').encode(),
+            'headers': headers,
+        }
+
+    def _stream(
+            self,
+            user: User,
+            owner: User,
+            writes: Callable[[], None],
+            headers: Optional[List[Tuple[bytes, bytes]]] = None,
+            query_string: Optional[str] = None) -> Tuple[int, bytes]:
+        """
+        Opens the stream of @owner's trips, runs @writes once it is open and disconnects after the writes
+        """
+
+        messages = []
+        opened = asyncio.Event()
+        written = asyncio.Event()
+
+        async def receive() -> dict:
+            await written.wait()
+            # Lets the stream flush the events of the writes
+            await asyncio.sleep(0.05)
+
+            return {'type': 'http.disconnect'}
+
+        async def send(message: dict) -> None:
+            messages.append(message)
+            opened.set()
+
+        async def scenario() -> None:
+            stream = asyncio.ensure_future(
+                self.application(self._scope(user, f'/api/users/{owner.id}/trips/stream', headers, query_string), receive, send))
+            # Fails instead of waiting forever if the stream breaks before it opens
+            await asyncio.wait([stream, asyncio.ensure_future(opened.wait())], return_when=asyncio.FIRST_COMPLETED)
+            await sync_to_async(writes, thread_sensitive=False)()
+            written.set()
+            await asyncio.wait_for(stream, 5)
+
+        async_to_sync(scenario)()
+
+        return messages[0]['status'], b''.join(message.get('body', b'') for message in messages[1:])
+
+    def test_changes_of_trips_are_streamed(self) -> None:
+        # Arrange
+        def writes() -> None:
+            trip = Trip.objects.create(
+                user=self.user, destination='Croatia', start_date='2020-07-01', end_date='2020-08-01', comment='')
+            trip.destination = 'Italy'
+            trip.save()
+            Trip.objects.create(
+                user=self.other_user, destination='Spain', start_date='2020-07-01', end_date='2020-08-01', comment='')
+            trip.delete()
+
+        # Act
+        status, body = self._stream(self.user, self.user, writes)
+        events = _parse_events(body)
+
+        # Assert
+        self.assertEqual(200, status)
+        self.assertEqual(['created', 'updated', 'deleted'], [event['event'] for event in events])
+        self.assertEqual('Italy', events[1]['data']['destination'])
+        self.assertEqual('2020-07-01', events[1]['data']['startDate'])
+        self.assertEqual(events[0]['data']['id'], events[2]['data']['id'])
+
+    def test_managers_cannot_stream_trips_of_users(self) -> None:
+        # Act
+        status, _ = self._stream(self.manager, self.user, lambda: None)
+
+        # Assert
+        self.assertEqual(403, status)
+
+    def test_token_query_parameter_is_ignored_by_default(self) -> None:
+        # Act
+        status, _ = self._stream(self.user, self.user, lambda: None, query_string=f'token={self._token(self.user)}')
+
+        # Assert
+        self.assertEqual(401, status)
+
+    @override_settings(TRIP_EVENTS_QUERY_TOKEN=True)
+    def test_token_query_parameter_authenticates_when_enabled(self) -> None:
+        # Act
+        status, _ = self._stream(self.user, self.user, lambda: None, query_string=f'token={self._token(self.user)}')
+
+        # Assert
+        self.assertEqual(200, status)
+
+    def test_users_cannot_stream_trips_of_other_users(self) -> None:
+        # Act
+        status, _ = self._stream(self.user, self.other_user, lambda: None)
+
+        # Assert
+        self.assertEqual(403, status)
+
+    def _ticket(self, user: User, owner: User) -> Tuple[int, str]:
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.post(f'/api/users/{owner.id}/trips/stream/ticket/')
+
+        return response.status_code, response.data.get('ticket', '')
+
+    def test_tickets_open_the_stream(self) -> None:
+        # Arrange
+        _, ticket = self._ticket(self.user, self.user)
+
+        # Act
+        status, _ = self._stream(self.user, self.user, lambda: None, query_string=f'ticket={ticket}')
+
+        # Assert
+        self.assertEqual(200, status)
+
+    def test_tickets_are_issued_to_callers_who_may_list_the_trips(self) -> None:
+        # Act
+        status, _ = self._ticket(self.manager, self.user)
+
+        # Assert
+        self.assertEqual(403, status)
+
+    def test_invalid_tickets_are_rejected(self) -> None:
+        # Arrange
+        _, ticket = self._ticket(self.user, self.user)
+        _, revoked_ticket = self._ticket(self.other_user, self.other_user)
+        User.objects.filter(pk=self.other_user.pk).update(token_version=1)
+
+        # Act
+        other_stream, _ = self._stream(self.user, self.other_user, lambda: None, query_string=f'ticket={ticket}')
+        revoked, _ = self._stream(self.other_user, self.other_user, lambda: None, query_string=f'ticket={revoked_ticket}')
+
+        with override_settings(TRIP_EVENTS_TICKET_TTL=-1):
+            expired, _ = self._stream(self.user, self.user, lambda: None, query_string=f'ticket={ticket}')
+
+        # Assert
+        self.assertEqual([401, 401, 401], [other_stream, revoked, expired])
+
+    def test_missed_events_are_replayed_after_last_event_id(self) -> None:
+        # Arrange
+        def writes() -> None:
+            for destination in ('Croatia', 'Italy', 'Spain'):
+                Trip.objects.create(
+                    user=self.user, destination=destination, start_date='2020-07-01', end_date='2020-08-01', comment='')
+
+        _, body = self._stream(self.user, self.user, writes)
+        last_event_id = _parse_events(body)[0]['id']
+
+        # Act
+        _, body = self._stream(self.user, self.user, lambda: None, [(b'last-event-id', last_event_id.encode())])
+
+        # Assert
+        self.assertEqual(['Italy', 'Spain'], [event['data']['destination'] for event in _parse_events(body)])
+
+    def test_unknown_last_event_id_resets_the_client(self) -> None:
+        # Act
+        _, body = self._stream(self.user, self.user, lambda: None, [(b'last-event-id', b'expired-1')])
+
+        # Assert
+        self.assertEqual(['reset'], [event['event'] for event in _parse_events(body)])
+
+    @override_settings(TRIP_EVENTS_HEARTBEAT_INTERVAL=0.01)
+    def test_idle_streams_receive_heartbeats(self) -> None:
+        # Act
+        _, body = self._stream(self.user, self.user, lambda: None)
+
+        # Assert
+        self.assertIn(b': heartbeat\n\n', body)
+
+
+class TripEventBrokerTest(SimpleTestCase):
+    def test_subscribers_falling_behind_are_marked_as_overflowed(self) -> None:
+        # Arrange
+        broker = TripEventBroker(LocalBackend(), history_size=10, buffer_size=2)
+
+        async def scenario() -> Tuple[List[dict], bool]:
+            subscription = broker.subscribe(1)
+
+            for number in range(3):
+                broker.publish({'id': str(number), 'type': 'created', 'user': 1, 'data': {}})
+
+            # Pushes are scheduled on the event loop of the subscriber
+            await asyncio.sleep(0)
+
+            return await subscription.get(timeout=1), subscription.overflowed
+
+        # Act
+        events, overflowed = async_to_sync(scenario)()
+
+        # Assert
+        self.assertEqual(['0', '1'], [event['id'] for event in events])
+        self.assertTrue(overflowed)
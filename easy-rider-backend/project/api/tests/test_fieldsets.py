@@ -0,0 +1,125 @@
+import datetime
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from project.api.models import RoleEnum, Trip, User
+
+
+class SparseFieldsetTest(TestCase):
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.admin = User.objects.create(email='admin@example.com', role=int(RoleEnum.ADMIN))
+        cls.users = [User.objects.create(email=f'user{number}@example.com', role=int(RoleEnum.USER)) for number in range(3)]
+
+        for user in cls.users:
+            for day in (2, 1):
+                Trip.objects.create(
+                    user=user,
+                    destination=f'{user.email} {day}',
+                    start_date=datetime.date(2020, 7, day),
+                    end_date=datetime.date(2020, 8, day),
+                    comment='x' * 1000)
+
+        cls.managers = [
+            User.objects.create(email=f'manager{number}@example.com', role=int(RoleEnum.MANAGER)) for number in range(2)]
+
+        for manager in cls.managers:
+            Trip.objects.create(
+                user=manager, destination=manager.email, start_date=datetime.date(2020, 7, 1), end_date=datetime.date(2020, 8, 1))
+
+    def setUp(self) -> None:
+        self.client.force_authenticate(self.admin)
+
+    def test_fields_project_the_rendered_fields_and_loaded_columns(self) -> None:
+        # Arrange
+        user = self.users[0]
+
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/users/{user.id}/trips/?fields=id,startDate')
+
+        # Assert
+        self.assertEqual(200, response.status_code)
+        self.assertEqual([{'id', 'startDate'}] * 2, [set(trip) for trip in response.json()])
+        self.assertFalse(any('"comment"' in query['sql'] for query in queries.captured_queries))
+
+    def test_unknown_fields_are_rejected(self) -> None:
+        # Act
+        response = self.client.get(f'/api/users/{self.users[0].id}/trips/?fields=id,secret')
+
+        # Assert
+        self.assertEqual(400, response.status_code)
+
+    def test_fields_do_not_affect_writes(self) -> None:
+        # Act
+        response = self.client.post(
+            f'/api/users/{self.users[0].id}/trips/?fields=id',
+            {'user': self.users[0].id, 'destination': 'Bali', 'start_date': '2020-07-01', 'end_date': '2020-08-01'})
+
+        # Assert
+        self.assertEqual(201, response.status_code)
+        self.assertIn('destination', response.data)
+
+    def test_users_are_listed_with_their_trips_without_a_query_per_user(self) -> None:
+        # Act
+        # Count of the paginator, users and trips of all users
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/users/?include=trips&fields=id,email&role=1')
+
+        # Assert
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            [[f'{user.email} 1', f'{user.email} 2'] for user in self.users],
+            [[trip['destination'] for trip in user['trips']] for user in response.json()])
+        self.assertEqual({'id', 'email', 'trips'}, set(response.json()[0]))
+
+    def test_user_is_retrieved_with_their_trips(self) -> None:
+        # Act
+        response = self.client.get(f'/api/users/{self.users[1].id}/?include=trips')
+
+        # Assert
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(2, len(response.json()['trips']))
+
+    def test_managers_see_trips_of_users_and_their_own_only(self) -> None:
+        # Arrange
+        manager, other_manager = self.managers
+        self.client.force_authenticate(manager)
+
+        # Act
+        listed = self.client.get('/api/users/?include=trips&fields=email')
+        retrieved = self.client.get(f'/api/users/{other_manager.id}/?include=trips')
+
+        # Assert
+        trips = {user['email']: [trip['destination'] for trip in user.get('trips', [])] for user in listed.json()}
+        self.assertEqual([manager.email], trips[manager.email])
+        self.assertEqual([], trips[other_manager.email])
+        self.assertNotIn('trips', [user for user in listed.json() if user['email'] == other_manager.email][0])
+        self.assertEqual(2, len(trips[self.users[0].email]))
+        self.assertEqual(200, retrieved.status_code)
+        self.assertNotIn('trips', retrieved.json())
+
+    def test_users_cannot_include_trips_of_other_users(self) -> None:
+        # Arrange
+        self.client.force_authenticate(self.users[0])
+
+        # Act
+        listed = self.client.get('/api/users/?include=trips')
+        retrieved = self.client.get(f'/api/users/{self.users[1].id}/?include=trips')
+
+        # Assert
+        self.assertEqual([[self.users[0].email]], [[user['email']] for user in listed.json()])
+        self.assertEqual(2, len(listed.json()[0]['trips']))
+        self.assertEqual(404, retrieved.status_code)
+
+    def test_unknown_relations_are_rejected(self) -> None:
+        # Act
+        response = self.client.get('/api/users/?include=tokens')
+
+        # Assert
+        self.assertEqual(400, response.status_code)
@@ -0,0 +1,105 @@
+import asyncio
+from unittest import mock
+
+from django.contrib.auth.hashers import SHA1PasswordHasher
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from project.api import hashing
+from project.api.hashing import HashingQueueFull, PasswordHashingPool
+from project.api.models import RoleEnum, User
+
+
+class PasswordHashingTest(TestCase):
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create_user('user@example.com', 'password', role=int(RoleEnum.USER))
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def tearDown(self) -> None:
+        if hashing._pool is not None:
+            hashing._pool.shutdown()
+            hashing._pool = None
+
+    def test_passwords_are_hashed_and_checked_in_the_pool(self) -> None:
+        # Act
+        with override_settings(PASSWORD_HASHING_WORKERS=1):
+            encoded = hashing.make_password('secret')
+            result = hashing.check_password('secret', encoded)
+            pool = hashing._pool
+
+        # Assert
+        self.assertIsNotNone(pool)
+        self.assertEqual((True, False), result)
+
+    def test_login_checks_the_password_in_the_pool(self) -> None:
+        # Act
+        with override_settings(PASSWORD_HASHING_WORKERS=1):
+            response = self.client.post('/api/auth/obtain_token/', {'email': 'user@example.com', 'password': 'password'})
+            pool = hashing._pool
+
+        # Assert
+        self.assertEqual(200, response.status_code)
+        self.assertIsNotNone(pool)
+
+    def test_full_queue_rejects_logins(self) -> None:
+        # Arrange
+        pool = PasswordHashingPool(1, 1, 0)
+        pool._slots.acquire()
+
+        # Act
+        with mock.patch('project.api.hashing.get_hashing_pool', return_value=pool):
+            response = self.client.post('/api/auth/obtain_token/', {'email': 'user@example.com', 'password': 'password'})
+
+        # Assert
+        self.assertEqual(503, response.status_code)
+        self.assertIn('Retry-After', response)
+
+    def test_full_queue_raises_without_waiting_past_the_timeout(self) -> None:
+        # Arrange
+        pool = PasswordHashingPool(1, 1, 0.01)
+        pool._slots.acquire()
+
+        # Act & Assert
+        with self.assertRaises(HashingQueueFull):
+            pool.submit(hashing._make_password, 'password')
+
+    @override_settings(PASSWORD_HASHERS=[
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+        'django.contrib.auth.hashers.SHA1PasswordHasher',
+    ])
+    def test_passwords_of_outdated_hashers_are_upgraded(self) -> None:
+        # Arrange
+        user = User.objects.get(pk=self.user.pk)
+        user.password = SHA1PasswordHasher().encode('password', 'salt')
+        user.save()
+
+        # Act
+        is_correct = user.check_password('password')
+
+        # Assert
+        self.assertTrue(is_correct)
+        self.assertTrue(User.objects.get(pk=user.pk).password.startswith('md5$'))
+
+    def test_passwords_can_be_checked_on_the_event_loop(self) -> None:
+        # Arrange
+        async def check_passwords() -> list:
+            return await asyncio.gather(self.user.acheck_password('password'), self.user.acheck_password('wrong'))
+
+        # Act
+        results = asyncio.run(check_passwords())
+
+        # Assert
+        self.assertEqual([True, False], results)
+
+    def test_passwords_can_be_hashed_on_the_event_loop(self) -> None:
+        # Act
+        encoded = asyncio.run(hashing.amake_password('secret'))
+
+        # Assert
+        self.assertEqual((True, False), hashing.check_password('secret', encoded))
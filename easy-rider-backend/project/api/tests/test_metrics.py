@@ -0,0 +1,31 @@
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from project.api import metrics
+from project.api.metrics import get_runtime_stats, log_runtime_stats
+
+
+class RuntimeStatsTest(SimpleTestCase):
+    def test_stats_are_logged_at_most_once_per_interval(self) -> None:
+        # Arrange
+        metrics._last_report = time.monotonic() - 3600
+
+        # Act
+        with override_settings(METRICS_LOG_INTERVAL=60), self.assertLogs('project.api.metrics', 'INFO') as logs, \
+                mock.patch('project.api.metrics.get_runtime_stats', return_value={'token_cache': {'hits': 3}}):
+            log_runtime_stats()
+            log_runtime_stats()
+
+        # Assert
+        self.assertEqual(1, len(logs.output))
+        self.assertIn('{"token_cache": {"hits": 3}}', logs.output[0])
+
+    def test_stats_of_all_components_are_collected(self) -> None:
+        # Act
+        stats = get_runtime_stats()
+
+        # Assert
+        self.assertEqual({'token_cache', 'rate_limits', 'coalescing'}, set(stats))
+        self.assertIn('coalesced_rate', stats['coalescing'])
@@ -0,0 +1,91 @@
+import datetime
+import unittest
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from project.api.models import RoleEnum, Trip, User
+from project.api.parsers import MessagePackParser
+from project.api.renderers import DATE_EXT_TYPE, MessagePackRenderer, decode_ext, msgpack
+
+
+@unittest.skipIf(msgpack is None, 'msgpack is not installed')
+class MessagePackTest(TestCase):
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create(email='user@example.com', role=int(RoleEnum.USER))
+        Trip.objects.create(
+            user=cls.user,
+            destination='Croatia',
+            start_date=datetime.date(2020, 7, 1),
+            end_date=datetime.date(2020, 8, 1),
+            comment='Split')
+
+    def setUp(self) -> None:
+        self.client.force_authenticate(self.user)
+
+    def _unpack(self, content: bytes):
+        return msgpack.unpackb(content, ext_hook=decode_ext)
+
+    def test_trips_are_rendered_with_camel_case_keys_and_native_dates(self) -> None:
+        # Act
+        response = self.client.get(f'/api/users/{self.user.id}/trips/', HTTP_ACCEPT='application/msgpack')
+        trips = self._unpack(response.content)
+
+        # Assert
+        self.assertEqual('application/msgpack', response['Content-Type'])
+        self.assertEqual(datetime.date(2020, 7, 1), trips[0]['startDate'])
+        self.assertEqual(datetime.date(2020, 8, 1), trips[0]['endDate'])
+        self.assertEqual('Croatia', trips[0]['destination'])
+
+    def test_json_stays_the_default(self) -> None:
+        # Act
+        response = self.client.get(f'/api/users/{self.user.id}/trips/', HTTP_ACCEPT='*/*')
+
+        # Assert
+        self.assertEqual('application/json', response['Content-Type'])
+        self.assertEqual('2020-07-01', response.json()[0]['startDate'])
+
+    def test_trips_can_be_created_from_message_pack(self) -> None:
+        # Arrange
+        body = MessagePackRenderer().render({
+            'user': self.user.id,
+            'destination': 'Bali',
+            'start_date': datetime.date(2020, 9, 1),
+            'end_date': '2020-09-15',
+        })
+
+        # Act
+        response = self.client.post(
+            f'/api/users/{self.user.id}/trips/', body, content_type='application/msgpack', HTTP_ACCEPT='application/msgpack')
+
+        # Assert
+        self.assertEqual(201, response.status_code)
+        self.assertEqual(datetime.date(2020, 9, 1), Trip.objects.get(destination='Bali').start_date)
+        self.assertEqual(datetime.date(2020, 9, 15), self._unpack(response.content)['endDate'])
+
+    def test_invalid_bodies_are_rejected(self) -> None:
+        # Act
+        response = self.client.post(
+            f'/api/users/{self.user.id}/trips/', b'\xc1', content_type=MessagePackParser.media_type)
+
+        # Assert
+        self.assertEqual(400, response.status_code)
+
+    def test_malformed_date_extensions_are_rejected(self) -> None:
+        # Arrange
+        bodies = [
+            msgpack.packb({'startDate': msgpack.ExtType(DATE_EXT_TYPE, b'\x00\x00')}),
+            msgpack.packb({'startDate': msgpack.ExtType(DATE_EXT_TYPE, b'\x7f\xff\xff\xff')}),
+        ]
+
+        for body in bodies:
+            with self.subTest(body=body):
+                # Act
+                response = self.client.post(
+                    f'/api/users/{self.user.id}/trips/', body, content_type=MessagePackParser.media_type)
+
+                # Assert
+                self.assertEqual(400, response.status_code)
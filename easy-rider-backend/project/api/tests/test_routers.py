@@ -0,0 +1,106 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from rest_framework_jwt.settings import api_settings
+
+from project.api.models import RoleEnum, Trip, User
+
+jwt_payload_handler = api_settings.JWT_PAYLOAD_HANDLER
+jwt_encode_handler = api_settings.JWT_ENCODE_HANDLER
+
+
+@override_settings(DATABASE_REPLICAS=['replica'], DATABASE_READ_YOUR_WRITES_WINDOW=60)
+class ReplicaRouterTest(TestCase):
+    """
+    The replica is not replicated in tests: rows created only in one of the databases
+    reveal which database served a request
+    """
+
+    databases = {'default', 'replica'}
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create(email='user@example.com', role=int(RoleEnum.USER))
+        cls.user.set_password('user@example.com')
+        cls.user.save()
+        User.objects.using('replica').create(id=cls.user.id, email=cls.user.email, role=cls.user.role)
+
+        cls.primary_trip = Trip.objects.create(
+            user=cls.user, destination='Primary', start_date='2020-07-01', end_date='2020-08-01')
+        cls.replica_trip = Trip.objects.using('replica').create(
+            user_id=cls.user.id, destination='Replica', start_date='2020-07-01', end_date='2020-08-01')
+
+    def setUp(self) -> None:
+        cache.clear()
+
+        token = jwt_encode_handler(jwt_payload_handler(self.user))
+        self.client.credentials(HTTP_AUTHORIZATION=f'{settings.JWT_AUTH["JWT_AUTH_HEADER_PREFIX"]} {token}')
+
+    def _list_destinations(self) -> list:
+        response: Response = self.client.get(f'/api/users/{self.user.id}/trips/')
+
+        self.assertEqual(200, response.status_code)
+
+        return [trip['destination'] for trip in response.data]
+
+    def test_list_reads_from_replica(self) -> None:
+        # Act
+        destinations = self._list_destinations()
+
+        # Assert
+        self.assertEqual(['Replica'], destinations)
+
+    def test_retrieve_reads_from_replica(self) -> None:
+        # Act
+        response = self.client.get(f'/api/users/{self.user.id}/trips/{self.replica_trip.id}/')
+
+        # Assert
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('Replica', response.data['destination'])
+
+    def test_writes_go_to_primary(self) -> None:
+        # Act
+        response = self.client.post(
+            f'/api/users/{self.user.id}/trips/',
+            {'user': self.user.id, 'destination': 'Hawaii', 'start_date': '2020-09-01', 'end_date': '2020-10-01'})
+
+        # Assert
+        self.assertEqual(201, response.status_code)
+        self.assertTrue(Trip.objects.using('default').filter(destination='Hawaii').exists())
+        self.assertFalse(Trip.objects.using('replica').filter(destination='Hawaii').exists())
+
+    def test_reads_stick_to_primary_after_own_write(self) -> None:
+        # Arrange
+        self.client.post(
+            f'/api/users/{self.user.id}/trips/',
+            {'user': self.user.id, 'destination': 'Hawaii', 'start_date': '2020-09-01', 'end_date': '2020-10-01'})
+
+        # Act
+        destinations = self._list_destinations()
+
+        # Assert
+        self.assertEqual(['Primary', 'Hawaii'], destinations)
+
+    def test_failed_writes_do_not_pin_reads_to_primary(self) -> None:
+        # Arrange
+        self.client.post(f'/api/users/{self.user.id}/trips/', {'user': self.user.id})
+
+        # Act
+        destinations = self._list_destinations()
+
+        # Assert
+        self.assertEqual(['Replica'], destinations)
+
+    def test_token_is_issued_by_primary(self) -> None:
+        # Arrange
+        User.objects.using('replica').filter(id=self.user.id).delete()
+
+        # Act
+        response = self.client.post(
+            '/api/auth/obtain_token/', {'email': 'user@example.com', 'password': 'user@example.com'})
+
+        # Assert
+        self.assertEqual(200, response.status_code)
@@ -0,0 +1,47 @@
+import datetime
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from project.api.models import RoleEnum, Trip, User
+
+
+class SeedCommandTest(TestCase):
+    def _seed(self, **options) -> None:
+        call_command('seed', email_prefix='seed-test-', stdout=StringIO(), **options)
+
+    def test_seed_creates_requested_number_of_users_and_trips(self) -> None:
+        # Act
+        self._seed(users=25, min_trips=2, max_trips=2, batch_size=10)
+
+        # Assert
+        self.assertEqual(25, User.objects.filter(email__startswith='seed-test-').count())
+        self.assertEqual(50, Trip.objects.count())
+
+    def test_seed_shares_one_usable_password_hash(self) -> None:
+        # Act
+        self._seed(users=3, max_trips=0, password='secret')
+
+        # Assert
+        users = list(User.objects.all())
+        self.assertEqual(1, len({user.password for user in users}))
+        self.assertTrue(users[0].check_password('secret'))
+
+    def test_seed_respects_role_mix_and_date_range(self) -> None:
+        # Arrange
+        start = datetime.date(2020, 1, 1)
+        end = datetime.date(2020, 12, 31)
+
+        # Act
+        self._seed(users=10, roles='MANAGER:1', min_trips=1, max_trips=3, start=start, end=end, max_duration=0)
+
+        # Assert
+        self.assertEqual({int(RoleEnum.MANAGER)}, set(User.objects.values_list('role', flat=True)))
+        self.assertFalse(Trip.objects.filter(start_date__lt=start).exists())
+        self.assertFalse(Trip.objects.filter(start_date__gt=end).exists())
+
+    def test_seed_rejects_invalid_role_mix(self) -> None:
+        # Act & Assert
+        with self.assertRaises(CommandError):
+            self._seed(users=1, roles='OWNER:1')
@@ -0,0 +1,260 @@
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.db.models import Q, QuerySet
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from rest_framework_jwt.settings import api_settings
+
+from project.api.models import ArchivedTrip, RoleEnum, Trip, User
+from project.api.sharding import allocate_trip_ids, fan_out, fan_out_count, jump_hash, shard_for_user
+
+jwt_payload_handler = api_settings.JWT_PAYLOAD_HANDLER
+jwt_encode_handler = api_settings.JWT_ENCODE_HANDLER
+
+SHARDS = ['default', 'shard']
+
+
+def _user_id_in_shard(alias: str, start: int) -> int:
+    return next(user_id for user_id in range(start, start + 100) if shard_for_user(user_id, SHARDS) == alias)
+
+
+class JumpHashTest(SimpleTestCase):
+    def test_keys_are_spread_across_buckets(self) -> None:
+        # Act
+        buckets = [jump_hash(key, 4) for key in range(1000)]
+
+        # Assert
+        for bucket in range(4):
+            self.assertGreater(buckets.count(bucket), 200)
+
+    def test_adding_bucket_moves_keys_only_to_the_new_bucket(self) -> None:
+        # Act
+        moved = [key for key in range(1000) if jump_hash(key, 4) != jump_hash(key, 5)]
+
+        # Assert
+        self.assertTrue(all(jump_hash(key, 5) == 4 for key in moved))
+        self.assertLess(len(moved), 300)
+
+
+@override_settings(TRIP_SHARDS=SHARDS)
+class TripShardingTest(TestCase):
+    databases = {'default', 'shard'}
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.default_user = User.objects.create(
+            id=_user_id_in_shard('default', 100), email='default@example.com', role=int(RoleEnum.USER))
+        cls.shard_user = User.objects.create(
+            id=_user_id_in_shard('shard', 100), email='shard@example.com', role=int(RoleEnum.USER))
+
+    def _authenticate(self, user: User) -> None:
+        token = jwt_encode_handler(jwt_payload_handler(user))
+        self.client.credentials(HTTP_AUTHORIZATION=f'{settings.JWT_AUTH["JWT_AUTH_HEADER_PREFIX"]} {token}')
+
+    def _create_trip(self, user: User, destination: str, start_date: str = '2020-07-01') -> Response:
+        self._authenticate(user)
+
+        return self.client.post(
+            f'/api/users/{user.id}/trips/',
+            {'user': user.id, 'destination': destination, 'start_date': start_date, 'end_date': '2020-12-01'})
+
+    def test_trips_are_created_in_the_shard_of_their_user(self) -> None:
+        # Act
+        default_response = self._create_trip(self.default_user, 'Croatia')
+        shard_response = self._create_trip(self.shard_user, 'Hawaii')
+
+        # Assert
+        self.assertEqual(201, default_response.status_code)
+        self.assertEqual(201, shard_response.status_code)
+        self.assertEqual(['Croatia'], list(Trip.objects.using('default').values_list('destination', flat=True)))
+        self.assertEqual(['Hawaii'], list(Trip.objects.using('shard').values_list('destination', flat=True)))
+        self.assertNotEqual(default_response.data['id'], shard_response.data['id'])
+
+    def test_trips_are_read_from_the_shard_of_their_user(self) -> None:
+        # Arrange
+        trip_id = self._create_trip(self.shard_user, 'Hawaii').data['id']
+
+        # Act
+        list_response = self.client.get(f'/api/users/{self.shard_user.id}/trips/')
+        retrieve_response = self.client.get(f'/api/users/{self.shard_user.id}/trips/{trip_id}/')
+
+        # Assert
+        self.assertEqual(['Hawaii'], [trip['destination'] for trip in list_response.data])
+        self.assertEqual('Hawaii', retrieve_response.data['destination'])
+
+    def test_trips_changing_hands_move_to_the_shard_of_their_new_user(self) -> None:
+        # Arrange
+        admin = User.objects.create(email='admin@example.com', role=int(RoleEnum.ADMIN))
+        trip_id = self._create_trip(self.shard_user, 'Hawaii').data['id']
+        self._authenticate(admin)
+
+        # Act
+        response = self.client.patch(
+            f'/api/users/{self.shard_user.id}/trips/{trip_id}/', {'user': self.default_user.id}, format='json')
+
+        # Assert
+        self.assertEqual(200, response.status_code)
+        self.assertFalse(Trip.objects.using('shard').exists())
+        self.assertEqual([(trip_id, self.default_user.id)], list(Trip.objects.using('default').values_list('id', 'user_id')))
+        self.assertEqual(1, User.objects.get(pk=self.default_user.pk).trip_count)
+
+    def test_trip_id_allocation_is_retried_after_a_concurrent_sequence_creation(self) -> None:
+        # Arrange
+        get_or_create = QuerySet.get_or_create
+        calls = []
+
+        def racing_get_or_create(queryset: QuerySet, **kwargs) -> tuple:
+            calls.append(kwargs)
+
+            if len(calls) == 1:
+                raise IntegrityError('UNIQUE constraint failed: api_shardsequence.name')
+
+            return get_or_create(queryset, **kwargs)
+
+        # Act
+        with mock.patch.object(QuerySet, 'get_or_create', racing_get_or_create):
+            trip_ids = allocate_trip_ids(2)
+
+        # Assert
+        self.assertEqual(2, len(calls))
+        self.assertEqual([1, 2], trip_ids)
+
+    def test_deleting_user_deletes_trips_in_their_shard(self) -> None:
+        # Arrange
+        self._create_trip(self.shard_user, 'Hawaii')
+
+        # Act
+        User.objects.filter(id=self.shard_user.id).delete()
+
+        # Assert
+        self.assertFalse(Trip.objects.using('shard').exists())
+
+    def test_fan_out_merges_ordered_results_of_all_shards(self) -> None:
+        # Arrange
+        self._create_trip(self.default_user, 'Croatia', '2020-07-03')
+        self._create_trip(self.shard_user, 'Hawaii', '2020-07-01')
+        self._create_trip(self.shard_user, 'Bali', '2020-07-04')
+        self._create_trip(self.default_user, 'Peru', '2020-07-02')
+
+        # Act
+        trips = fan_out(Q(start_date__gte='2020-07-02'), ordering=('-start_date',), limit=2)
+        count = fan_out_count()
+
+        # Assert
+        self.assertEqual(['Bali', 'Croatia'], [trip.destination for trip in trips])
+        self.assertEqual(4, count)
+
+    def test_trips_of_all_shards_are_listed_in_one_page(self) -> None:
+        # Arrange
+        manager = User.objects.create(email='manager@example.com', role=int(RoleEnum.MANAGER))
+        self._create_trip(self.shard_user, 'Hawaii', '2020-07-01')
+        self._create_trip(self.default_user, 'Croatia', '2020-07-02')
+        self._create_trip(self.shard_user, 'Bali', '2020-07-03')
+        self._authenticate(manager)
+
+        # Act
+        response = self.client.get('/api/trips/?limit=2&offset=1')
+
+        # Assert
+        self.assertEqual(3, response.data['count'])
+        self.assertEqual(['Croatia', 'Bali'], [trip['destination'] for trip in response.data['results']])
+
+    def test_trips_of_deleted_users_are_hidden_on_all_shards(self) -> None:
+        # Arrange
+        manager = User.objects.create(email='manager@example.com', role=int(RoleEnum.MANAGER))
+        admin = User.objects.create(email='admin@example.com', role=int(RoleEnum.ADMIN))
+        self._create_trip(self.shard_user, 'Hawaii', '2020-07-01')
+        self._create_trip(self.default_user, 'Croatia', '2020-07-02')
+        User.objects.filter(pk=self.shard_user.pk).update(is_active=False)
+        destinations = {}
+
+        # Act
+        for user in (manager, admin):
+            self._authenticate(user)
+            destinations[user.role] = [trip['destination'] for trip in self.client.get('/api/trips/').data['results']]
+
+        # Assert
+        self.assertEqual({int(RoleEnum.MANAGER): ['Croatia'], int(RoleEnum.ADMIN): ['Croatia']}, destinations)
+
+    def test_users_are_listed_with_their_trips_of_all_shards(self) -> None:
+        # Arrange
+        admin = User.objects.create(email='admin@example.com', role=int(RoleEnum.ADMIN))
+        self._create_trip(self.default_user, 'Croatia')
+        self._create_trip(self.shard_user, 'Hawaii')
+        self._authenticate(admin)
+
+        # Act
+        response = self.client.get('/api/users/?include=trips&role=1')
+
+        # Assert
+        self.assertEqual(
+            {'default@example.com': ['Croatia'], 'shard@example.com': ['Hawaii']},
+            {user['email']: [trip['destination'] for trip in user['trips']] for user in response.json()})
+
+    def test_managers_include_trips_of_other_managers_on_no_shard(self) -> None:
+        # Arrange
+        manager = User.objects.create(email='manager@example.com', role=int(RoleEnum.MANAGER))
+        self.shard_user.role = int(RoleEnum.MANAGER)
+        self.shard_user.save()
+        self._create_trip(self.shard_user, 'Hawaii')
+        self._create_trip(self.default_user, 'Croatia')
+        self._authenticate(manager)
+
+        # Act
+        response = self.client.get('/api/users/?include=trips')
+
+        # Assert
+        self.assertEqual(
+            {'default@example.com': ['Croatia'], 'manager@example.com': [], 'shard@example.com': None},
+            {user['email']: [trip['destination'] for trip in user['trips']] if 'trips' in user else None
+             for user in response.json()})
+
+    def test_rebalance_moves_misplaced_trips(self) -> None:
+        # Arrange
+        Trip.objects.using('default').create(
+            id=1000, user_id=self.shard_user.id, destination='Hawaii', start_date='2020-07-01', end_date='2020-08-01')
+
+        # Act
+        call_command('rebalance_trips', batch_size=1, stdout=StringIO())
+
+        # Assert
+        self.assertFalse(Trip.objects.using('default').exists())
+        self.assertEqual([1000], list(Trip.objects.using('shard').values_list('id', flat=True)))
+
+    def test_rebalance_moves_misplaced_archived_trips_without_publishing_deletions(self) -> None:
+        # Arrange
+        Trip.objects.using('default').create(
+            id=1000, user_id=self.shard_user.id, destination='Hawaii', start_date='2020-07-01', end_date='2020-08-01')
+        ArchivedTrip.objects.using('default').create(
+            id=1001, user_id=self.shard_user.id, destination='Bali', start_date='2010-07-01', end_date='2010-08-01')
+        stdout = StringIO()
+
+        # Act
+        with mock.patch('project.api.signals.build_event') as build_event:
+            call_command('rebalance_trips', batch_size=1, stdout=stdout)
+
+        # Assert
+        self.assertFalse(ArchivedTrip.objects.using('default').exists())
+        self.assertEqual([1001], list(ArchivedTrip.objects.using('shard').values_list('id', flat=True)))
+        self.assertIn('default -> shard: 1 archived trips', stdout.getvalue())
+        self.assertEqual([1000], list(Trip.objects.using('shard').values_list('id', flat=True)))
+        build_event.assert_not_called()
+
+    def test_rebalance_dry_run_does_not_move_trips(self) -> None:
+        # Arrange
+        Trip.objects.using('default').create(
+            id=1000, user_id=self.shard_user.id, destination='Hawaii', start_date='2020-07-01', end_date='2020-08-01')
+        stdout = StringIO()
+
+        # Act
+        call_command('rebalance_trips', dry_run=True, stdout=stdout)
+
+        # Assert
+        self.assertTrue(Trip.objects.using('default').exists())
+        self.assertIn('Would move 1 trips', stdout.getvalue())
@@ -0,0 +1,106 @@
+import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from project.api.models import RoleEnum, Trip, User
+
+
+class TripSummaryTest(TestCase):
+    client_class = APIClient
+
+    def setUp(self) -> None:
+        self.today = timezone.localdate()
+        self.user = User.objects.create(email='user@example.com', role=int(RoleEnum.USER))
+        self.other_user = User.objects.create(email='other@example.com', role=int(RoleEnum.USER))
+        self.manager = User.objects.create(email='manager@example.com', role=int(RoleEnum.MANAGER))
+
+    def _in_days(self, days: int) -> datetime.date:
+        return self.today + datetime.timedelta(days=days)
+
+    def _create_trip(self, user: User, starts_in: int, days: int = 7) -> Trip:
+        start_date = self._in_days(starts_in)
+
+        return Trip.objects.create(
+            user=user, destination='Croatia', start_date=start_date, end_date=start_date + datetime.timedelta(days=days))
+
+    def _summary(self, user: User) -> tuple:
+        user.refresh_from_db()
+
+        return user.trip_count, user.next_trip_start, user.last_trip_end
+
+    def test_summaries_follow_trip_writes(self) -> None:
+        # Arrange
+        past_trip = self._create_trip(self.user, -30)
+        upcoming_trip = self._create_trip(self.user, 10)
+        self._create_trip(self.user, 20, days=30)
+
+        # Act
+        summary_after_creates = self._summary(self.user)
+        upcoming_trip.delete()
+        summary_after_delete = self._summary(self.user)
+        past_trip.user = self.other_user
+        past_trip.save()
+
+        # Assert
+        self.assertEqual((3, self._in_days(10), self._in_days(50)), summary_after_creates)
+        self.assertEqual((2, self._in_days(20), self._in_days(50)), summary_after_delete)
+        self.assertEqual((1, self._in_days(20), self._in_days(50)), self._summary(self.user))
+        self.assertEqual((1, None, self._in_days(-23)), self._summary(self.other_user))
+
+    def test_summaries_are_included_on_request(self) -> None:
+        # Arrange
+        self._create_trip(self.user, 10)
+        self.client.force_authenticate(self.manager)
+
+        # Act
+        plain = self.client.get(f'/api/users/{self.user.id}/')
+        included = self.client.get(f'/api/users/{self.user.id}/?fields=id&include=summary')
+
+        # Assert
+        self.assertNotIn('summary', plain.data)
+        self.assertEqual(
+            {'trip_count': 1, 'next_trip_start': str(self._in_days(10)), 'last_trip_end': str(self._in_days(17))},
+            included.data['summary'])
+
+    def test_summaries_of_other_managers_are_not_included(self) -> None:
+        # Arrange
+        other_manager = User.objects.create(email='other-manager@example.com', role=int(RoleEnum.MANAGER))
+        self._create_trip(other_manager, 10)
+        self.client.force_authenticate(self.manager)
+
+        # Act
+        listed = self.client.get('/api/users/?include=summary')
+        retrieved = self.client.get(f'/api/users/{other_manager.id}/?include=summary')
+
+        # Assert
+        summaries = {user['email']: user.get('summary') for user in listed.data}
+        self.assertIsNone(summaries[other_manager.email])
+        self.assertIsNotNone(summaries[self.manager.email])
+        self.assertIsNotNone(summaries[self.user.email])
+        self.assertEqual(200, retrieved.status_code)
+        self.assertNotIn('summary', retrieved.data)
+
+    def test_refresh_command_repairs_summaries(self) -> None:
+        # Arrange
+        self._create_trip(self.user, 10)
+        self._create_trip(self.other_user, 10)
+        yesterday = self.today - datetime.timedelta(days=1)
+        User.objects.filter(pk=self.user.pk).update(trip_count=5, next_trip_start=yesterday)
+        User.objects.filter(pk=self.other_user.pk).update(trip_count=5)
+
+        # Act
+        call_command('refresh_trip_summaries', stale=True, stdout=StringIO())
+
+        # Assert
+        self.assertEqual(1, self._summary(self.user)[0])
+        self.assertEqual(5, self._summary(self.other_user)[0])
+
+        # Act
+        call_command('refresh_trip_summaries', stdout=StringIO())
+
+        # Assert
+        self.assertEqual(1, self._summary(self.other_user)[0])
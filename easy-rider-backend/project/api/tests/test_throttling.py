@@ -0,0 +1,112 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from project.api import throttling
+from project.api.metrics import get_runtime_stats
+from project.api.models import RoleEnum, User
+from project.api.throttling import rate_limiter_stats
+
+RATE_LIMITS = {
+    'obtain_token': {'ip': '5/minute', 'email': '2/minute'},
+    'signup': {'ip': '2/hour', 'email': '2/hour'},
+}
+
+
+@override_settings(RATE_LIMITS=RATE_LIMITS)
+class TokenBucketThrottleTest(TestCase):
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.admin = User.objects.create(email='admin@example.com', role=int(RoleEnum.ADMIN))
+
+    def setUp(self) -> None:
+        cache.clear()
+        throttling._empty_until.clear()
+        rate_limiter_stats.clear()
+
+    def _obtain_token(self, email: str) -> Response:
+        return self.client.post('/api/auth/obtain_token/', {'email': email, 'password': 'password'})
+
+    def _sign_up(self, email: str) -> Response:
+        return self.client.post('/api/users/', {'email': email, 'password': 'password', 'role': int(RoleEnum.USER)})
+
+    def test_logins_are_limited_per_email_before_passwords_are_checked(self) -> None:
+        # Arrange
+        self._obtain_token('user@example.com')
+        self._obtain_token('user@example.com')
+
+        # Act
+        with mock.patch('rest_framework_jwt.serializers.authenticate') as authenticate:
+            response = self._obtain_token('User@Example.com')
+
+        # Assert
+        self.assertEqual(429, response.status_code)
+        self.assertIn('Retry-After', response)
+        authenticate.assert_not_called()
+
+    def test_logins_are_limited_per_ip(self) -> None:
+        # Arrange
+        for number in range(5):
+            self._obtain_token(f'user{number}@example.com')
+
+        # Act
+        response = self._obtain_token('other@example.com')
+
+        # Assert
+        self.assertEqual(429, response.status_code)
+
+    def test_tokens_are_refilled_over_time(self) -> None:
+        # Arrange
+        now = 1_000_000.0
+
+        with mock.patch('project.api.throttling.time.time', return_value=now):
+            self._obtain_token('user@example.com')
+            self._obtain_token('user@example.com')
+
+        # Act
+        with mock.patch('project.api.throttling.time.time', return_value=now + 30):
+            response = self._obtain_token('user@example.com')
+
+        # Assert
+        self.assertNotEqual(429, response.status_code)
+
+    def test_empty_buckets_are_rejected_without_cache_access(self) -> None:
+        # Arrange
+        for _ in range(3):
+            self._obtain_token('user@example.com')
+
+        # Act
+        with mock.patch('project.api.throttling.cache') as throttle_cache:
+            response = self._obtain_token('user@example.com')
+
+        # Assert
+        self.assertEqual(429, response.status_code)
+        throttle_cache.get_many.assert_not_called()
+        self.assertEqual({'allowed': 2, 'denied': 1, 'fast_denied': 1}, get_runtime_stats()['rate_limits']['obtain_token'])
+
+    def test_anonymous_signups_are_limited(self) -> None:
+        # Arrange
+        self._sign_up('user1@example.com')
+        self._sign_up('user2@example.com')
+
+        # Act
+        response = self._sign_up('user3@example.com')
+
+        # Assert
+        self.assertEqual(429, response.status_code)
+        self.assertFalse(User.objects.filter(email='user3@example.com').exists())
+
+    def test_users_created_by_admins_are_not_limited(self) -> None:
+        # Arrange
+        self.client.force_authenticate(self.admin)
+
+        # Act
+        responses = [self._sign_up(f'user{number}@example.com') for number in range(3)]
+
+        # Assert
+        self.assertEqual([201, 201, 201], [response.status_code for response in responses])
@@ -0,0 +1,229 @@
+import datetime
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from rest_framework_jwt import utils
+from rest_framework_jwt.settings import api_settings
+
+from project.api.models import RevokedToken, RoleEnum, User
+from project.api.tokens import TokenDenylist, VerifiedTokenCache, denylist, jwt_decode_handler, token_cache
+
+jwt_payload_handler = api_settings.JWT_PAYLOAD_HANDLER
+jwt_encode_handler = api_settings.JWT_ENCODE_HANDLER
+
+
+class TokenRevocationTest(TestCase):
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create(email='user@example.com', role=int(RoleEnum.USER))
+
+    def setUp(self) -> None:
+        denylist.clear()
+        token_cache.clear()
+
+    def _token(self) -> str:
+        self.user.refresh_from_db()
+
+        return jwt_encode_handler(jwt_payload_handler(self.user))
+
+    def _get_current_user(self, token: str) -> Response:
+        return self.client.get(
+            '/api/auth/user/', HTTP_AUTHORIZATION=f'{settings.JWT_AUTH["JWT_AUTH_HEADER_PREFIX"]} {token}')
+
+    def _logout(self, token: str, **data) -> Response:
+        return self.client.post(
+            '/api/auth/logout/', data, HTTP_AUTHORIZATION=f'{settings.JWT_AUTH["JWT_AUTH_HEADER_PREFIX"]} {token}')
+
+    def test_logout_revokes_the_token(self) -> None:
+        # Arrange
+        token = self._token()
+
+        # Act
+        logout_response = self._logout(token)
+        response = self._get_current_user(token)
+
+        # Assert
+        self.assertEqual(200, logout_response.status_code)
+        self.assertEqual(401, response.status_code)
+        self.assertEqual('Token has been revoked.', response.data['detail'])
+
+    def test_logout_keeps_other_tokens_valid(self) -> None:
+        # Arrange
+        token = self._token()
+        other_token = self._token()
+
+        # Act
+        self._logout(token)
+        response = self._get_current_user(other_token)
+
+        # Assert
+        self.assertEqual(200, response.status_code)
+
+    def test_logout_everywhere_revokes_all_tokens(self) -> None:
+        # Arrange
+        token = self._token()
+        other_token = self._token()
+
+        # Act
+        self._logout(token, everywhere=True)
+
+        # Assert
+        self.assertEqual(401, self._get_current_user(token).status_code)
+        self.assertEqual(401, self._get_current_user(other_token).status_code)
+        self.assertEqual(200, self._get_current_user(self._token()).status_code)
+
+    def test_revoked_token_cannot_be_refreshed(self) -> None:
+        # Arrange
+        token = self._token()
+        self._logout(token)
+
+        # Act
+        response = self.client.post('/api/auth/refresh_token/', {'token': token})
+
+        # Assert
+        self.assertEqual(400, response.status_code)
+
+    def test_token_revoked_everywhere_cannot_be_refreshed(self) -> None:
+        # Arrange
+        token = self._token()
+        self._logout(token, everywhere=True)
+
+        # Act
+        response = self.client.post('/api/auth/refresh_token/', {'token': token})
+
+        # Assert
+        self.assertEqual(400, response.status_code)
+
+    def test_valid_token_can_be_refreshed(self) -> None:
+        # Act
+        response = self.client.post('/api/auth/refresh_token/', {'token': self._token()})
+
+        # Assert
+        self.assertEqual(200, response.status_code)
+
+
+class TokenDenylistTest(TestCase):
+    def _revoke(self, jti: str, expires_in: datetime.timedelta) -> None:
+        RevokedToken.objects.create(jti=jti, user_id=1, expires_at=timezone.now() + expires_in)
+
+    def test_revocations_of_other_workers_are_synced_from_the_database(self) -> None:
+        # Arrange
+        token_denylist = TokenDenylist()
+        self._revoke('revoked', datetime.timedelta(hours=1))
+
+        # Act
+        with override_settings(REVOCATION_SYNC_INTERVAL=0):
+            revoked = token_denylist.is_revoked('revoked')
+
+        # Assert
+        self.assertTrue(revoked)
+
+    def test_lookups_do_not_query_the_database_between_syncs(self) -> None:
+        # Arrange
+        token_denylist = TokenDenylist()
+        token_denylist.sync(force=True)
+        self._revoke('revoked', datetime.timedelta(hours=1))
+
+        # Act
+        with override_settings(REVOCATION_SYNC_INTERVAL=60), self.assertNumQueries(0):
+            revoked = token_denylist.is_revoked('revoked')
+
+        # Assert
+        self.assertFalse(revoked)
+
+    def test_expired_revocations_are_dropped(self) -> None:
+        # Arrange
+        token_denylist = TokenDenylist()
+        self._revoke('expired', -datetime.timedelta(seconds=1))
+
+        # Act
+        token_denylist.sync(force=True)
+
+        # Assert
+        self.assertFalse(token_denylist.is_revoked('expired'))
+        self.assertEqual({}, token_denylist._expirations)
+
+
+class VerifiedTokenCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create(email='user@example.com', role=int(RoleEnum.USER))
+
+    def setUp(self) -> None:
+        denylist.clear()
+        token_cache.clear()
+
+    def test_signature_is_verified_once_per_token(self) -> None:
+        # Arrange
+        token = jwt_encode_handler(jwt_payload_handler(self.user))
+
+        # Act
+        with mock.patch('project.api.tokens.utils.jwt_decode_handler', wraps=utils.jwt_decode_handler) as verify:
+            payloads = [jwt_decode_handler(token) for _ in range(3)]
+
+        # Assert
+        verify.assert_called_once_with(token)
+        self.assertEqual([payloads[0]] * 3, payloads)
+        self.assertEqual(2, token_cache.stats['hits'])
+        self.assertEqual(1, token_cache.stats['misses'])
+
+    def test_revoked_tokens_are_rejected_on_cache_hits(self) -> None:
+        # Arrange
+        token = jwt_encode_handler(jwt_payload_handler(self.user))
+        client = APIClient()
+        authorization = f'{settings.JWT_AUTH["JWT_AUTH_HEADER_PREFIX"]} {token}'
+        client.get('/api/auth/user/', HTTP_AUTHORIZATION=authorization)
+
+        # Act
+        client.post('/api/auth/logout/', HTTP_AUTHORIZATION=authorization)
+        response = client.get('/api/auth/user/', HTTP_AUTHORIZATION=authorization)
+
+        # Assert
+        self.assertEqual(401, response.status_code)
+        self.assertGreater(token_cache.stats['hits'], 0)
+
+    def test_expired_entries_are_not_served(self) -> None:
+        # Arrange
+        cache = VerifiedTokenCache(10)
+        cache.put('token', {'exp': time.time() - 1})
+
+        # Act
+        payload = cache.get('token')
+
+        # Assert
+        self.assertIsNone(payload)
+
+    def test_least_recently_used_entries_are_evicted(self) -> None:
+        # Arrange
+        cache = VerifiedTokenCache(2)
+        expiration = time.time() + 60
+        cache.put('first', {'exp': expiration})
+        cache.put('second', {'exp': expiration})
+        cache.get('first')
+
+        # Act
+        cache.put('third', {'exp': expiration})
+
+        # Assert
+        self.assertIsNotNone(cache.get('first'))
+        self.assertIsNone(cache.get('second'))
+        self.assertEqual(1, cache.stats['evictions'])
+        self.assertEqual(2, cache.stats['size'])
+
+    def test_cached_payloads_cannot_be_modified(self) -> None:
+        # Arrange
+        cache = VerifiedTokenCache(10)
+        cache.put('token', {'exp': time.time() + 60, 'user_id': 1})
+
+        # Act
+        cache.get('token')['user_id'] = 2
+
+        # Assert
+        self.assertEqual(1, cache.get('token')['user_id'])
@@ -0,0 +1,92 @@
+import datetime
+from typing import List
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from project.api.models import RoleEnum, Trip, User
+
+
+class TripListViewSetTest(TestCase):
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create(email='user@example.com', role=int(RoleEnum.USER))
+        cls.other_user = User.objects.create(email='other@example.com', role=int(RoleEnum.USER))
+        cls.manager = User.objects.create(email='manager@example.com', role=int(RoleEnum.MANAGER))
+        cls.other_manager = User.objects.create(email='other-manager@example.com', role=int(RoleEnum.MANAGER))
+        cls.admin = User.objects.create(email='admin@example.com', role=int(RoleEnum.ADMIN))
+
+        for day, user in enumerate([cls.user, cls.other_user, cls.manager, cls.other_manager, cls.admin], start=1):
+            Trip.objects.create(
+                user=user,
+                destination=user.email,
+                start_date=datetime.date(2020, 7, day),
+                end_date=datetime.date(2020, 8, day))
+
+    def _list_destinations(self, user: User, query: str = '') -> List[str]:
+        self.client.force_authenticate(user)
+        response = self.client.get(f'/api/trips/?{query}')
+
+        self.assertEqual(200, response.status_code)
+
+        return [trip['destination'] for trip in response.data['results']]
+
+    def test_users_see_their_own_trips(self) -> None:
+        # Act
+        destinations = self._list_destinations(self.user)
+
+        # Assert
+        self.assertEqual(['user@example.com'], destinations)
+
+    def test_managers_see_their_own_and_users_trips(self) -> None:
+        # Act
+        destinations = self._list_destinations(self.manager)
+
+        # Assert
+        self.assertEqual(['user@example.com', 'other@example.com', 'manager@example.com'], destinations)
+
+    def test_admins_see_all_trips(self) -> None:
+        # Act
+        destinations = self._list_destinations(self.admin)
+
+        # Assert
+        self.assertEqual(5, len(destinations))
+
+    def test_trips_of_deleted_users_are_hidden(self) -> None:
+        # Arrange
+        User.objects.filter(pk__in=[self.other_user.pk, self.other_manager.pk]).update(is_active=False)
+
+        # Act
+        manager_destinations = self._list_destinations(self.manager)
+        admin_destinations = self._list_destinations(self.admin)
+
+        # Assert
+        self.assertEqual(['user@example.com', 'manager@example.com'], manager_destinations)
+        self.assertEqual(['user@example.com', 'manager@example.com', 'admin@example.com'], admin_destinations)
+
+    def test_trips_are_filtered_and_paginated(self) -> None:
+        # Act
+        destinations = self._list_destinations(self.admin, 'start_date__gte=2020-07-02&limit=2&offset=1')
+
+        # Assert
+        self.assertEqual(['manager@example.com', 'other-manager@example.com'], destinations)
+
+    def test_listing_takes_a_single_query_per_page(self) -> None:
+        # Arrange
+        self.client.force_authenticate(self.manager)
+
+        # Act
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/trips/')
+
+        # Assert
+        self.assertEqual(3, response.data['count'])
+
+    def test_anonymous_users_are_rejected(self) -> None:
+        # Act
+        response = self.client.get('/api/trips/')
+
+        # Assert
+        self.assertEqual(401, response.status_code)
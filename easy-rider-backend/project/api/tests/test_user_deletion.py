@@ -0,0 +1,92 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_jwt.settings import api_settings
+
+from project.api.models import RoleEnum, Trip, User
+from project.api.throttling import reserve
+from project.jobs.models import Job
+from project.jobs.worker import Worker
+
+jwt_payload_handler = api_settings.JWT_PAYLOAD_HANDLER
+jwt_encode_handler = api_settings.JWT_ENCODE_HANDLER
+
+
+@override_settings(USER_PURGE_BATCH_SIZE=2, USER_PURGE_RATE=0)
+class UserDeletionTest(TestCase):
+    client_class = APIClient
+
+    def setUp(self) -> None:
+        self.user = User.objects.create(email='user@example.com', role=int(RoleEnum.USER))
+        self.manager = User.objects.create(email='manager@example.com', role=int(RoleEnum.MANAGER))
+
+        for number in range(5):
+            Trip.objects.create(
+                user=self.user, destination=f'Destination {number}', start_date='2020-07-01', end_date='2020-08-01', comment='')
+
+    def test_deleted_users_are_deactivated_immediately(self) -> None:
+        # Arrange
+        token = jwt_encode_handler(jwt_payload_handler(self.user))
+        self.client.force_authenticate(self.manager)
+
+        # Act
+        response = self.client.delete(f'/api/users/{self.user.id}/')
+        retrieved = self.client.get(f'/api/users/{self.user.id}/')
+        self.client.force_authenticate(None)
+        self.client.credentials(HTTP_AUTHORIZATION=f'JWT {token}')
+        authenticated = self.client.get('/api/auth/user/')
+
+        # Assert
+        self.assertEqual(202, response.status_code)
+        self.assertTrue(response['Location'].endswith(f'/api/jobs/{response.data["job"]}/'))
+        self.assertEqual(404, retrieved.status_code)
+        self.assertEqual(401, authenticated.status_code)
+        self.assertEqual(5, Trip.objects.filter(user=self.user).count())
+
+    def test_trips_are_purged_in_batches_before_the_user(self) -> None:
+        # Arrange
+        self.client.force_authenticate(self.manager)
+        job_id = self.client.delete(f'/api/users/{self.user.id}/').data['job']
+
+        # Act
+        Worker('test').run(burst=True)
+
+        # Assert
+        job = Job.objects.get(pk=job_id)
+        self.assertEqual(Job.SUCCEEDED, job.status)
+        self.assertEqual({'deleted_trips': 5, 'remaining_trips': 0}, Job.loads(job.progress))
+        self.assertEqual({'deleted_trips': 5}, Job.loads(job.result))
+        self.assertEqual(self.manager.id, job.user_id)
+        self.assertFalse(Trip.objects.filter(user_id=self.user.id).exists())
+        self.assertFalse(User.objects.filter(pk=self.user.id).exists())
+
+    def test_reactivated_users_are_not_purged(self) -> None:
+        # Arrange
+        self.client.force_authenticate(self.manager)
+        self.client.delete(f'/api/users/{self.user.id}/')
+        User.objects.filter(pk=self.user.id).update(is_active=True)
+
+        # Act
+        Worker('test').run(burst=True)
+
+        # Assert
+        self.assertEqual(5, Trip.objects.filter(user=self.user).count())
+
+
+class ReserveTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_reservations_are_spaced_out_by_the_rate(self) -> None:
+        # Act
+        with mock.patch('project.api.throttling.time.time', return_value=1000.0):
+            waits = [reserve('test', 100, 50) for _ in range(3)]
+
+        # Assert
+        self.assertEqual([0.0, 2.0, 4.0], waits)
+
+    def test_a_rate_of_zero_is_unlimited(self) -> None:
+        # Act & Assert
+        self.assertEqual(0.0, reserve('test', 100, 0))
@@ -0,0 +1,76 @@
+from typing import List
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from project.api.models import RoleEnum, User
+from project.api.views import UserViewSet
+
+
+class UserFilterTest(TestCase):
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.admin = User.objects.create(email='admin@example.com', role=int(RoleEnum.ADMIN))
+        cls.manager = User.objects.create(email='manager@example.com', role=int(RoleEnum.MANAGER))
+        User.objects.create(email='Alice@Example.com', role=int(RoleEnum.USER))
+        User.objects.create(email='alex@other.org', role=int(RoleEnum.MANAGER))
+        User.objects.create(email='bob@example.com', role=int(RoleEnum.USER))
+
+    def _list_emails(self, user: User, query: str) -> List[str]:
+        self.client.force_authenticate(user)
+        response = self.client.get(f'/api/users/?{query}')
+
+        self.assertEqual(200, response.status_code)
+
+        return sorted(user['email'] for user in response.data)
+
+    def test_email_prefix_is_case_insensitive(self) -> None:
+        # Act
+        emails = self._list_emails(self.admin, 'email=AL')
+
+        # Assert
+        self.assertEqual(['Alice@Example.com', 'alex@other.org'], emails)
+
+    def test_domain_is_case_insensitive(self) -> None:
+        # Act
+        emails = self._list_emails(self.admin, 'domain=@EXAMPLE.com')
+
+        # Assert
+        self.assertEqual(['Alice@Example.com', 'admin@example.com', 'bob@example.com', 'manager@example.com'], emails)
+
+    def test_filters_are_combined(self) -> None:
+        # Act
+        emails = self._list_emails(self.admin, 'role__in=1,2&domain=example.com')
+
+        # Assert
+        self.assertEqual(['Alice@Example.com', 'bob@example.com', 'manager@example.com'], emails)
+
+    def test_filters_do_not_widen_the_visible_users(self) -> None:
+        # Act
+        emails = self._list_emails(self.manager, f'role={int(RoleEnum.ADMIN)}')
+
+        # Assert
+        self.assertEqual([], emails)
+
+    def test_email_prefix_uses_an_index(self) -> None:
+        # Arrange
+        queryset = UserViewSet.UserFilter({'email': 'al', 'role': int(RoleEnum.USER)}, queryset=User.objects.all()).qs
+
+        # Act
+        plan = queryset.explain()
+
+        # Assert
+        self.assertIn('USING INDEX api_user_role_email_idx (role=? AND email_lower>? AND email_lower<?)', plan)
+
+    def test_email_fields_follow_email_changes(self) -> None:
+        # Arrange
+        user = User.objects.get(email='bob@example.com')
+        user.email = 'Bob@Other.org'
+
+        # Act
+        user.save(update_fields=['email'])
+
+        # Assert
+        self.assertEqual(('bob@other.org', 'other.org'), User.objects.values_list('email_lower', 'email_domain').get(pk=user.pk))
@@ -8,10 +8,14 @@ from djangorestframework_camel_case.render import CamelCaseJSONRenderer
 from rest_framework import serializers
 from rest_framework.response import Response
 from rest_framework.test import APIClient
+from rest_framework_jwt.settings import api_settings
 
 from project.api.models import RoleEnum, Trip, User
 from project.api.serializers import TripSerializer, UserSerializer
 
+jwt_payload_handler = api_settings.JWT_PAYLOAD_HANDLER
+jwt_encode_handler = api_settings.JWT_ENCODE_HANDLER
+
 
 class BaseTestCase(TestCase):
     USER1_EMAIL = 'user1@example.com'
@@ -32,19 +36,25 @@ class BaseTestCase(TestCase):
     ADMIN2_EMAIL = 'admin2@example.com'
     ADMIN2_PASSWORD = 'admin2@example.com'
 
-    def _authenticate(self, email: str, password: str) -> None:
-        response = self.client.post(
+    client_class = APIClient
+
+    def _obtain_token(self, email: str, password: str) -> Response:
+        return self.client.post(
             '/api/auth/obtain_token/',
             {
                 'email': email,
                 'password': password
             })
-        token = response.data['token']
+
+    def _authenticate(self, user: User) -> None:
+        # Tokens are minted directly instead of going through /api/auth/obtain_token/ and hashing the password again
+        token = jwt_encode_handler(jwt_payload_handler(user))
         auth_header_prefix = settings.JWT_AUTH["JWT_AUTH_HEADER_PREFIX"]
 
         self.client.credentials(HTTP_AUTHORIZATION=f'{auth_header_prefix} {token}')
 
-    def _create_user_instance(self, email: str, password: str, role: RoleEnum, save: bool = True) -> User:
+    @classmethod
+    def _create_user_instance(cls, email: str, password: str, role: RoleEnum, save: bool = True) -> User:
         user = User(email=email, role=int(role))
         user.set_password(password)
 
@@ -74,17 +84,48 @@ class BaseTestCase(TestCase):
     def _get_expected_users(self, *users: User, as_list: bool = True) -> bytes:
         return self._get_expected_result(UserSerializer, *users, as_list=as_list)
 
-    def setUp(self) -> None:
-        self.user1 = self._create_user_instance(self.USER1_EMAIL, self.USER1_PASSWORD, RoleEnum.USER)
-        self.user2 = self._create_user_instance(self.USER2_EMAIL, self.USER2_PASSWORD, RoleEnum.USER)
+    @classmethod
+    def setUpTestData(cls) -> None:
+        # Fixtures are created once per test case class, every test runs inside a transaction rolled back afterwards
+        cls.user1 = cls._create_user_instance(cls.USER1_EMAIL, cls.USER1_PASSWORD, RoleEnum.USER)
+        cls.user2 = cls._create_user_instance(cls.USER2_EMAIL, cls.USER2_PASSWORD, RoleEnum.USER)
 
-        self.manager1 = self._create_user_instance(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD, RoleEnum.MANAGER)
-        self.manager2 = self._create_user_instance(self.MANAGER2_EMAIL, self.MANAGER2_PASSWORD, RoleEnum.MANAGER)
+        cls.manager1 = cls._create_user_instance(cls.MANAGER1_EMAIL, cls.MANAGER1_PASSWORD, RoleEnum.MANAGER)
+        cls.manager2 = cls._create_user_instance(cls.MANAGER2_EMAIL, cls.MANAGER2_PASSWORD, RoleEnum.MANAGER)
 
-        self.admin1 = self._create_user_instance(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD, RoleEnum.ADMIN)
-        self.admin2 = self._create_user_instance(self.ADMIN2_EMAIL, self.ADMIN2_PASSWORD, RoleEnum.ADMIN)
+        cls.admin1 = cls._create_user_instance(cls.ADMIN1_EMAIL, cls.ADMIN1_PASSWORD, RoleEnum.ADMIN)
+        cls.admin2 = cls._create_user_instance(cls.ADMIN2_EMAIL, cls.ADMIN2_PASSWORD, RoleEnum.ADMIN)
 
-        self.client = APIClient()
+
+class ObtainTokenTest(BaseTestCase):
+    def test_obtain_token_returns_token_for_valid_credentials(self) -> None:
+        # Act
+        response = self._obtain_token(self.USER1_EMAIL, self.USER1_PASSWORD)
+
+        # Assert
+        self.assertEqual(200, response.status_code)
+        self.assertIn('token', response.data)
+
+    def test_obtain_token_rejects_invalid_credentials(self) -> None:
+        # Act
+        response = self._obtain_token(self.USER1_EMAIL, self.USER2_PASSWORD)
+
+        # Assert
+        self.assertEqual(400, response.status_code)
+
+    def test_obtained_token_authenticates_requests(self) -> None:
+        # Arrange
+        token = self._obtain_token(self.USER1_EMAIL, self.USER1_PASSWORD).data['token']
+        auth_header_prefix = settings.JWT_AUTH["JWT_AUTH_HEADER_PREFIX"]
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'{auth_header_prefix} {token}')
+
+        # Act
+        response = self.client.get('/api/auth/user/')
+
+        # Assert
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(self.USER1_EMAIL, response.json()['email'])
 
 
 class UserViewSetTest(BaseTestCase):
@@ -126,7 +167,7 @@ class UserViewSetTest(BaseTestCase):
         # Arrange
         expected_result = self._get_expected_users(self.user1)
 
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._list_users()
@@ -141,7 +182,7 @@ class UserViewSetTest(BaseTestCase):
         expected_result = self._get_expected_users(
             self.user1, self.user2, self.manager1, self.manager2)
 
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._list_users()
@@ -156,7 +197,7 @@ class UserViewSetTest(BaseTestCase):
         expected_result = self._get_expected_users(
             self.user1, self.user2, self.manager1, self.manager2, self.admin1, self.admin2)
 
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._list_users()
@@ -175,7 +216,7 @@ class UserViewSetTest(BaseTestCase):
 
     def test_retrieve_raises_error_for_incorrect_pk(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._retrieve_user(1_000_000_000)
@@ -187,7 +228,7 @@ class UserViewSetTest(BaseTestCase):
         # Arrange
         expected_result = self._get_expected_users(self.user1, as_list=False)
 
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._retrieve_user(self.user1.id)
@@ -199,7 +240,7 @@ class UserViewSetTest(BaseTestCase):
 
     def test_retrieve_for_user_does_not_return_another_users(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._retrieve_user(self.user2.id)
@@ -211,7 +252,7 @@ class UserViewSetTest(BaseTestCase):
         # Arrange
         expected_result = self._get_expected_users(self.user1, as_list=False)
 
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._retrieve_user(self.user1.id)
@@ -225,7 +266,7 @@ class UserViewSetTest(BaseTestCase):
         # Arrange
         expected_result = self._get_expected_users(self.manager1, as_list=False)
 
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._retrieve_user(self.manager1.id)
@@ -239,7 +280,7 @@ class UserViewSetTest(BaseTestCase):
         # Arrange
         expected_result = self._get_expected_users(self.manager2, as_list=False)
 
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._retrieve_user(self.manager2.id)
@@ -251,7 +292,7 @@ class UserViewSetTest(BaseTestCase):
 
     def test_retrieve_for_manager_does_not_return_admins(self) -> None:
         # Arrange
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._retrieve_user(self.admin1.id)
@@ -263,7 +304,7 @@ class UserViewSetTest(BaseTestCase):
         # Arrange
         expected_result = self._get_expected_users(self.user1, as_list=False)
 
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._retrieve_user(self.user1.id)
@@ -277,7 +318,7 @@ class UserViewSetTest(BaseTestCase):
         # Arrange
         expected_result = self._get_expected_users(self.manager1, as_list=False)
 
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._retrieve_user(self.manager1.id)
@@ -291,7 +332,7 @@ class UserViewSetTest(BaseTestCase):
         # Arrange
         expected_result = self._get_expected_users(self.admin1, as_list=False)
 
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._retrieve_user(self.admin1.id)
@@ -305,7 +346,7 @@ class UserViewSetTest(BaseTestCase):
         # Arrange
         expected_result = self._get_expected_users(self.admin2, as_list=False)
 
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._retrieve_user(self.admin2.id)
@@ -317,7 +358,7 @@ class UserViewSetTest(BaseTestCase):
 
     def test_create_does_not_allow_to_insert_duplicates(self) -> None:
         # Arrange
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._create_user(self.USER1_EMAIL, self.USER1_PASSWORD, RoleEnum.USER)
@@ -369,7 +410,7 @@ class UserViewSetTest(BaseTestCase):
         password = 'test@example.com'
         role = RoleEnum.USER
 
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._create_user(email, password, role)
@@ -383,7 +424,7 @@ class UserViewSetTest(BaseTestCase):
         password = 'test@example.com'
         role = RoleEnum.USER
 
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._create_user(email, password, role)
@@ -399,7 +440,7 @@ class UserViewSetTest(BaseTestCase):
         password = 'test@example.com'
         role = RoleEnum.MANAGER
 
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._create_user(email, password, role)
@@ -415,7 +456,7 @@ class UserViewSetTest(BaseTestCase):
         password = 'test@example.com'
         role = RoleEnum.ADMIN
 
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._create_user(email, password, role)
@@ -429,7 +470,7 @@ class UserViewSetTest(BaseTestCase):
         password = 'test@example.com'
         role = RoleEnum.USER
 
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._create_user(email, password, role)
@@ -445,7 +486,7 @@ class UserViewSetTest(BaseTestCase):
         password = 'test@example.com'
         role = RoleEnum.MANAGER
 
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._create_user(email, password, role)
@@ -461,7 +502,7 @@ class UserViewSetTest(BaseTestCase):
         password = 'test@example.com'
         role = RoleEnum.ADMIN
 
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._create_user(email, password, role)
@@ -480,7 +521,7 @@ class UserViewSetTest(BaseTestCase):
 
     def test_update_raises_error_for_incorrect_pk(self) -> None:
         # Arrange
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._update_user(1_000_00_000, self.USER1_EMAIL, self.USER1_PASSWORD, RoleEnum.USER)
@@ -493,7 +534,7 @@ class UserViewSetTest(BaseTestCase):
         user = self.user1
         new_email = 'test@example.com'
 
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._update_user(user.id, new_email, new_email, RoleEnum.USER)
@@ -510,7 +551,7 @@ class UserViewSetTest(BaseTestCase):
 
     def test_update_does_not_allow_users_to_update_other_users(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._update_user(self.user2.id, self.USER1_EMAIL, self.USER1_PASSWORD, RoleEnum.USER)
@@ -520,7 +561,7 @@ class UserViewSetTest(BaseTestCase):
 
     def test_update_does_not_allow_users_to_update_managers(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._update_user(self.manager1.id, self.USER1_EMAIL, self.USER1_PASSWORD, RoleEnum.USER)
@@ -530,7 +571,7 @@ class UserViewSetTest(BaseTestCase):
 
     def test_update_does_not_allow_users_to_update_admins(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._update_user(self.admin1.id, self.USER1_EMAIL, self.USER1_PASSWORD, RoleEnum.USER)
@@ -540,7 +581,7 @@ class UserViewSetTest(BaseTestCase):
 
     def test_update_does_not_allow_users_to_promote_themselves_to_managers(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._update_user(self.user1.id, self.USER1_EMAIL, self.USER1_PASSWORD, RoleEnum.MANAGER)
@@ -550,7 +591,7 @@ class UserViewSetTest(BaseTestCase):
 
     def test_update_does_not_allow_users_to_promote_themselves_to_admins(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._update_user(self.user1.id, self.USER1_EMAIL, self.USER1_PASSWORD, RoleEnum.ADMIN)
@@ -560,7 +601,7 @@ class UserViewSetTest(BaseTestCase):
 
     def test_update_does_not_allow_users_to_promote_other_users_to_managers(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._update_user(self.user2.id, self.USER1_EMAIL, self.USER1_PASSWORD, RoleEnum.MANAGER)
@@ -570,7 +611,7 @@ class UserViewSetTest(BaseTestCase):
 
     def test_update_does_not_allow_users_to_promote_other_users_to_admins(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._update_user(self.user2.id, self.USER1_EMAIL, self.USER1_PASSWORD, RoleEnum.ADMIN)
@@ -580,7 +621,7 @@ class UserViewSetTest(BaseTestCase):
 
     def test_update_does_not_allow_users_to_promote_managers_to_admins(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._update_user(self.manager1.id, self.USER1_EMAIL, self.USER1_PASSWORD, RoleEnum.ADMIN)
@@ -590,7 +631,7 @@ class UserViewSetTest(BaseTestCase):
 
     def test_update_does_not_allow_users_to_demote_managers_to_users(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._update_user(self.manager1.id, self.USER1_EMAIL, self.USER1_PASSWORD, RoleEnum.USER)
@@ -600,7 +641,7 @@ class UserViewSetTest(BaseTestCase):
 
     def test_update_does_not_allow_users_to_demote_admins_to_users(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._update_user(self.admin1.id, self.USER1_EMAIL, self.USER1_PASSWORD, RoleEnum.USER)
@@ -610,7 +651,7 @@ class UserViewSetTest(BaseTestCase):
 
     def test_update_does_not_allow_users_to_demote_admins_to_managers(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._update_user(self.admin1.id, self.USER1_EMAIL, self.USER1_PASSWORD, RoleEnum.MANAGER)
@@ -623,7 +664,7 @@ class UserViewSetTest(BaseTestCase):
         manager = self.manager1
         new_email = 'test@example.com'
 
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._update_user(manager.id, new_email, new_email, RoleEnum(manager.role))
@@ -643,7 +684,7 @@ class UserViewSetTest(BaseTestCase):
         user = self.user1
         new_email = 'test@example.com'
 
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._update_user(user.id, new_email, new_email, RoleEnum(user.role))
@@ -663,7 +704,7 @@ class UserViewSetTest(BaseTestCase):
         manager = self.manager1
         new_email = 'test@example.com'
 
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._update_user(manager.id, new_email, new_email, RoleEnum(manager.role))
@@ -683,7 +724,7 @@ class UserViewSetTest(BaseTestCase):
         admin = self.admin1
         new_email = 'test@example.com'
 
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._update_user(admin.id, new_email, new_email, RoleEnum(admin.role))
@@ -697,7 +738,7 @@ class UserViewSetTest(BaseTestCase):
         new_email = 'test@example.com'
         new_role = RoleEnum.ADMIN
 
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._update_user(manager.id, new_email, new_email, new_role)
@@ -711,7 +752,7 @@ class UserViewSetTest(BaseTestCase):
         new_email = 'test@example.com'
         new_role = RoleEnum.MANAGER
 
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._update_user(user.id, new_email, new_email, new_role)
@@ -732,7 +773,7 @@ class UserViewSetTest(BaseTestCase):
         new_email = 'test@example.com'
         new_role = RoleEnum.ADMIN
 
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._update_user(user.id, new_email, new_email, new_role)
@@ -746,7 +787,7 @@ class UserViewSetTest(BaseTestCase):
         new_email = 'test@example.com'
         new_role = RoleEnum.ADMIN
 
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._update_user(manager.id, new_email, new_email, new_role)
@@ -760,7 +801,7 @@ class UserViewSetTest(BaseTestCase):
         new_email = 'test@example.com'
         new_role = RoleEnum.USER
 
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._update_user(manager.id, new_email, new_email, new_role)
@@ -774,7 +815,7 @@ class UserViewSetTest(BaseTestCase):
         new_email = 'test@example.com'
         new_role = RoleEnum.USER
 
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._update_user(manager.id, new_email, new_email, new_role)
@@ -788,7 +829,7 @@ class UserViewSetTest(BaseTestCase):
         new_email = 'test@example.com'
         new_role = RoleEnum.USER
 
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._update_user(admin.id, new_email, new_email, new_role)
@@ -803,7 +844,7 @@ class UserViewSetTest(BaseTestCase):
         new_email = 'test@example.com'
         new_role = RoleEnum.MANAGER
 
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._update_user(admin.id, new_email, new_email, new_role)
@@ -817,7 +858,7 @@ class UserViewSetTest(BaseTestCase):
         admin = self.admin1
         new_email = 'test@example.com'
 
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._update_user(admin.id, new_email, new_email, RoleEnum(admin.role))
@@ -837,7 +878,7 @@ class UserViewSetTest(BaseTestCase):
         user = self.user1
         new_email = 'test@example.com'
 
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._update_user(user.id, new_email, new_email, RoleEnum(user.role))
@@ -857,7 +898,7 @@ class UserViewSetTest(BaseTestCase):
         manager = self.manager1
         new_email = 'test@example.com'
 
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._update_user(manager.id, new_email, new_email, RoleEnum(manager.role))
@@ -877,7 +918,7 @@ class UserViewSetTest(BaseTestCase):
         admin = self.admin2
         new_email = 'test@example.com'
 
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._update_user(admin.id, new_email, new_email, RoleEnum(admin.role))
@@ -898,7 +939,7 @@ class UserViewSetTest(BaseTestCase):
         new_email = 'test@example.com'
         new_role = RoleEnum.MANAGER
 
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._update_user(user.id, new_email, new_email, new_role)
@@ -919,7 +960,7 @@ class UserViewSetTest(BaseTestCase):
         new_email = 'test@example.com'
         new_role = RoleEnum.ADMIN
 
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._update_user(user.id, new_email, new_email, new_role)
@@ -940,7 +981,7 @@ class UserViewSetTest(BaseTestCase):
         new_email = 'test@example.com'
         new_role = RoleEnum.ADMIN
 
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._update_user(manager.id, new_email, new_email, new_role)
@@ -961,7 +1002,7 @@ class UserViewSetTest(BaseTestCase):
         new_email = 'test@example.com'
         new_role = RoleEnum.USER
 
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._update_user(admin.id, new_email, new_email, new_role)
@@ -975,7 +1016,7 @@ class UserViewSetTest(BaseTestCase):
         new_email = 'test@example.com'
         new_role = RoleEnum.MANAGER
 
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._update_user(admin.id, new_email, new_email, new_role)
@@ -989,7 +1030,7 @@ class UserViewSetTest(BaseTestCase):
         new_email = 'test@example.com'
         new_role = RoleEnum.USER
 
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._update_user(manager.id, new_email, new_email, new_role)
@@ -1010,7 +1051,7 @@ class UserViewSetTest(BaseTestCase):
         new_email = 'test@example.com'
         new_role = RoleEnum.USER
 
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._update_user(admin.id, new_email, new_email, new_role)
@@ -1031,7 +1072,7 @@ class UserViewSetTest(BaseTestCase):
         new_email = 'test@example.com'
         new_role = RoleEnum.MANAGER
 
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._update_user(admin.id, new_email, new_email, new_role)
@@ -1055,19 +1096,19 @@ class UserViewSetTest(BaseTestCase):
 
     def test_destroy_allows_users_to_destroy_themselves(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._destroy_user(self.user1.id)
-        deleted_user_still_exists = User.objects.filter(pk=self.user1.id).exists()
+        deleted_user_is_active = User.objects.get(pk=self.user1.id).is_active
 
         # Assert
-        self.assertEqual(204, response.status_code)
-        self.assertFalse(deleted_user_still_exists)
+        self.assertEqual(202, response.status_code)
+        self.assertFalse(deleted_user_is_active)
 
     def test_destroy_does_not_allow_users_to_destroy_other_users(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._destroy_user(self.user2.id)
@@ -1077,7 +1118,7 @@ class UserViewSetTest(BaseTestCase):
 
     def test_destroy_does_not_allow_users_to_destroy_managers(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._destroy_user(self.manager1.id)
@@ -1087,7 +1128,7 @@ class UserViewSetTest(BaseTestCase):
 
     def test_destroy_does_not_allow_users_to_destroy_admins(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._destroy_user(self.admin1.id)
@@ -1097,43 +1138,43 @@ class UserViewSetTest(BaseTestCase):
 
     def test_destroy_allows_managers_to_destroy_themselves(self) -> None:
         # Arrange
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._destroy_user(self.manager1.id)
-        deleted_manager_still_exists = User.objects.filter(pk=self.manager1.id).exists()
+        deleted_manager_is_active = User.objects.get(pk=self.manager1.id).is_active
 
         # Assert
-        self.assertEqual(204, response.status_code)
-        self.assertFalse(deleted_manager_still_exists)
+        self.assertEqual(202, response.status_code)
+        self.assertFalse(deleted_manager_is_active)
 
     def test_destroy_allows_managers_to_destroy_users(self) -> None:
         # Arrange
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._destroy_user(self.user1.id)
-        deleted_user_still_exists = User.objects.filter(pk=self.user1.id).exists()
+        deleted_user_is_active = User.objects.get(pk=self.user1.id).is_active
 
         # Assert
-        self.assertEqual(204, response.status_code)
-        self.assertFalse(deleted_user_still_exists)
+        self.assertEqual(202, response.status_code)
+        self.assertFalse(deleted_user_is_active)
 
     def test_destroy_allows_managers_to_destroy_other_managers(self) -> None:
         # Arrange
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._destroy_user(self.manager2.id)
-        deleted_manager_still_exists = User.objects.filter(pk=self.manager2.id).exists()
+        deleted_manager_is_active = User.objects.get(pk=self.manager2.id).is_active
 
         # Assert
-        self.assertEqual(204, response.status_code)
-        self.assertFalse(deleted_manager_still_exists)
+        self.assertEqual(202, response.status_code)
+        self.assertFalse(deleted_manager_is_active)
 
     def test_destroy_does_not_allow_managers_to_destroy_admins(self) -> None:
         # Arrange
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._destroy_user(self.admin1.id)
@@ -1143,51 +1184,51 @@ class UserViewSetTest(BaseTestCase):
 
     def test_destroy_allows_admins_to_destroy_themselves(self) -> None:
         # Arrange
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._destroy_user(self.admin1.id)
-        deleted_admin_still_exists = User.objects.filter(pk=self.admin1.id).exists()
+        deleted_admin_is_active = User.objects.get(pk=self.admin1.id).is_active
 
         # Assert
-        self.assertEqual(204, response.status_code)
-        self.assertFalse(deleted_admin_still_exists)
+        self.assertEqual(202, response.status_code)
+        self.assertFalse(deleted_admin_is_active)
 
     def test_destroy_allows_admins_to_destroy_users(self) -> None:
         # Arrange
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._destroy_user(self.user1.id)
-        deleted_user_still_exists = User.objects.filter(pk=self.user1.id).exists()
+        deleted_user_is_active = User.objects.get(pk=self.user1.id).is_active
 
         # Assert
-        self.assertEqual(204, response.status_code)
-        self.assertFalse(deleted_user_still_exists)
+        self.assertEqual(202, response.status_code)
+        self.assertFalse(deleted_user_is_active)
 
     def test_destroy_allows_admins_to_destroy_other_managers(self) -> None:
         # Arrange
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._destroy_user(self.manager2.id)
-        deleted_manager_still_exists = User.objects.filter(pk=self.manager2.id).exists()
+        deleted_manager_is_active = User.objects.get(pk=self.manager2.id).is_active
 
         # Assert
-        self.assertEqual(204, response.status_code)
-        self.assertFalse(deleted_manager_still_exists)
+        self.assertEqual(202, response.status_code)
+        self.assertFalse(deleted_manager_is_active)
 
     def test_destroy_allows_admins_to_destroy_other_admins(self) -> None:
         # Arrange
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._destroy_user(self.admin2.id)
-        deleted_admin_still_exists = User.objects.filter(pk=self.admin2.id).exists()
+        deleted_admin_is_active = User.objects.get(pk=self.admin2.id).is_active
 
         # Assert
-        self.assertEqual(204, response.status_code)
-        self.assertFalse(deleted_admin_still_exists)
+        self.assertEqual(202, response.status_code)
+        self.assertFalse(deleted_admin_is_active)
 
 
 class TripViewSetTest(BaseTestCase):
@@ -1283,8 +1324,9 @@ class TripViewSetTest(BaseTestCase):
     def _get_expected_trips(self, *trips: Trip, as_list: bool = True) -> bytes:
         return self._get_expected_result(TripSerializer, *trips, as_list=as_list)
 
+    @classmethod
     def _create_trip_instance(
-            self,
+            cls,
             user: User,
             destination: str,
             start_date: str,
@@ -1303,86 +1345,87 @@ class TripViewSetTest(BaseTestCase):
 
         return trip
 
-    def setUp(self) -> None:
-        super().setUp()
-
-        self.user1_trip1 = self._create_trip_instance(
-            self.user1,
-            self.USER1_TRIP1_DESTINATION,
-            self.USER1_TRIP1_START_DATE,
-            self.USER1_TRIP1_END_DATE,
-            self.USER1_TRIP1_COMMENT)
-        self.user1_trip2 = self._create_trip_instance(
-            self.user1,
-            self.USER1_TRIP2_DESTINATION,
-            self.USER1_TRIP2_START_DATE,
-            self.USER1_TRIP2_END_DATE,
-            self.USER1_TRIP2_COMMENT)
-
-        self.user2_trip1 = self._create_trip_instance(
-            self.user2,
-            self.USER2_TRIP1_DESTINATION,
-            self.USER2_TRIP1_START_DATE,
-            self.USER2_TRIP1_END_DATE,
-            self.USER2_TRIP1_COMMENT)
-        self.user2_trip2 = self._create_trip_instance(
-            self.user2,
-            self.USER2_TRIP2_DESTINATION,
-            self.USER2_TRIP2_START_DATE,
-            self.USER2_TRIP2_END_DATE,
-            self.USER2_TRIP2_COMMENT)
-
-        self.manager1_trip1 = self._create_trip_instance(
-            self.manager1,
-            self.MANAGER1_TRIP1_DESTINATION,
-            self.MANAGER1_TRIP1_START_DATE,
-            self.MANAGER1_TRIP1_END_DATE,
-            self.MANAGER1_TRIP1_COMMENT)
-        self.manager1_trip2 = self._create_trip_instance(
-            self.manager1,
-            self.MANAGER1_TRIP2_DESTINATION,
-            self.MANAGER1_TRIP2_START_DATE,
-            self.MANAGER1_TRIP2_END_DATE,
-            self.MANAGER1_TRIP2_COMMENT)
-
-        self.manager2_trip1 = self._create_trip_instance(
-            self.manager2,
-            self.MANAGER2_TRIP1_DESTINATION,
-            self.MANAGER2_TRIP1_START_DATE,
-            self.MANAGER2_TRIP1_END_DATE,
-            self.MANAGER2_TRIP1_COMMENT)
-        self.manager2_trip2 = self._create_trip_instance(
-            self.manager2,
-            self.MANAGER2_TRIP2_DESTINATION,
-            self.MANAGER2_TRIP2_START_DATE,
-            self.MANAGER2_TRIP2_END_DATE,
-            self.MANAGER2_TRIP2_COMMENT)
-
-        self.admin1_trip1 = self._create_trip_instance(
-            self.admin1,
-            self.ADMIN1_TRIP1_DESTINATION,
-            self.ADMIN1_TRIP1_START_DATE,
-            self.ADMIN1_TRIP1_END_DATE,
-            self.ADMIN1_TRIP1_COMMENT)
-        self.admin1_trip2 = self._create_trip_instance(
-            self.admin1,
-            self.ADMIN1_TRIP2_DESTINATION,
-            self.ADMIN1_TRIP2_START_DATE,
-            self.ADMIN1_TRIP2_END_DATE,
-            self.ADMIN1_TRIP2_COMMENT)
-
-        self.admin2_trip1 = self._create_trip_instance(
-            self.admin2,
-            self.ADMIN2_TRIP1_DESTINATION,
-            self.ADMIN2_TRIP1_START_DATE,
-            self.ADMIN2_TRIP1_END_DATE,
-            self.ADMIN2_TRIP1_COMMENT)
-        self.admin2_trip2 = self._create_trip_instance(
-            self.admin2,
-            self.ADMIN2_TRIP2_DESTINATION,
-            self.ADMIN2_TRIP2_START_DATE,
-            self.ADMIN2_TRIP2_END_DATE,
-            self.ADMIN2_TRIP2_COMMENT)
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        cls.user1_trip1 = cls._create_trip_instance(
+            cls.user1,
+            cls.USER1_TRIP1_DESTINATION,
+            cls.USER1_TRIP1_START_DATE,
+            cls.USER1_TRIP1_END_DATE,
+            cls.USER1_TRIP1_COMMENT)
+        cls.user1_trip2 = cls._create_trip_instance(
+            cls.user1,
+            cls.USER1_TRIP2_DESTINATION,
+            cls.USER1_TRIP2_START_DATE,
+            cls.USER1_TRIP2_END_DATE,
+            cls.USER1_TRIP2_COMMENT)
+
+        cls.user2_trip1 = cls._create_trip_instance(
+            cls.user2,
+            cls.USER2_TRIP1_DESTINATION,
+            cls.USER2_TRIP1_START_DATE,
+            cls.USER2_TRIP1_END_DATE,
+            cls.USER2_TRIP1_COMMENT)
+        cls.user2_trip2 = cls._create_trip_instance(
+            cls.user2,
+            cls.USER2_TRIP2_DESTINATION,
+            cls.USER2_TRIP2_START_DATE,
+            cls.USER2_TRIP2_END_DATE,
+            cls.USER2_TRIP2_COMMENT)
+
+        cls.manager1_trip1 = cls._create_trip_instance(
+            cls.manager1,
+            cls.MANAGER1_TRIP1_DESTINATION,
+            cls.MANAGER1_TRIP1_START_DATE,
+            cls.MANAGER1_TRIP1_END_DATE,
+            cls.MANAGER1_TRIP1_COMMENT)
+        cls.manager1_trip2 = cls._create_trip_instance(
+            cls.manager1,
+            cls.MANAGER1_TRIP2_DESTINATION,
+            cls.MANAGER1_TRIP2_START_DATE,
+            cls.MANAGER1_TRIP2_END_DATE,
+            cls.MANAGER1_TRIP2_COMMENT)
+
+        cls.manager2_trip1 = cls._create_trip_instance(
+            cls.manager2,
+            cls.MANAGER2_TRIP1_DESTINATION,
+            cls.MANAGER2_TRIP1_START_DATE,
+            cls.MANAGER2_TRIP1_END_DATE,
+            cls.MANAGER2_TRIP1_COMMENT)
+        cls.manager2_trip2 = cls._create_trip_instance(
+            cls.manager2,
+            cls.MANAGER2_TRIP2_DESTINATION,
+            cls.MANAGER2_TRIP2_START_DATE,
+            cls.MANAGER2_TRIP2_END_DATE,
+            cls.MANAGER2_TRIP2_COMMENT)
+
+        cls.admin1_trip1 = cls._create_trip_instance(
+            cls.admin1,
+            cls.ADMIN1_TRIP1_DESTINATION,
+            cls.ADMIN1_TRIP1_START_DATE,
+            cls.ADMIN1_TRIP1_END_DATE,
+            cls.ADMIN1_TRIP1_COMMENT)
+        cls.admin1_trip2 = cls._create_trip_instance(
+            cls.admin1,
+            cls.ADMIN1_TRIP2_DESTINATION,
+            cls.ADMIN1_TRIP2_START_DATE,
+            cls.ADMIN1_TRIP2_END_DATE,
+            cls.ADMIN1_TRIP2_COMMENT)
+
+        cls.admin2_trip1 = cls._create_trip_instance(
+            cls.admin2,
+            cls.ADMIN2_TRIP1_DESTINATION,
+            cls.ADMIN2_TRIP1_START_DATE,
+            cls.ADMIN2_TRIP1_END_DATE,
+            cls.ADMIN2_TRIP1_COMMENT)
+        cls.admin2_trip2 = cls._create_trip_instance(
+            cls.admin2,
+            cls.ADMIN2_TRIP2_DESTINATION,
+            cls.ADMIN2_TRIP2_START_DATE,
+            cls.ADMIN2_TRIP2_END_DATE,
+            cls.ADMIN2_TRIP2_COMMENT)
 
     def test_list_requires_authentication(self) -> None:
         # Act
@@ -1393,7 +1436,7 @@ class TripViewSetTest(BaseTestCase):
 
     def test_list_raises_error_for_incorrect_pk(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._list_trips(1_000_000)
@@ -1406,7 +1449,7 @@ class TripViewSetTest(BaseTestCase):
         expected_result = self._get_expected_trips(
             self.user1_trip1, self.user1_trip2)
 
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._list_trips(self.user1.id)
@@ -1418,7 +1461,7 @@ class TripViewSetTest(BaseTestCase):
 
     def test_list_does_not_allow_users_to_list_other_users_trips(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._list_trips(self.user2.id)
@@ -1428,7 +1471,7 @@ class TripViewSetTest(BaseTestCase):
 
     def test_list_does_not_allow_users_to_list_manager_trips(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._list_trips(self.manager1.id)
@@ -1438,7 +1481,7 @@ class TripViewSetTest(BaseTestCase):
 
     def test_list_does_not_allow_users_to_list_admin_trips(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._list_trips(self.admin1.id)
@@ -1451,7 +1494,7 @@ class TripViewSetTest(BaseTestCase):
         expected_result = self._get_expected_trips(
             self.manager1_trip1, self.manager1_trip2)
 
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._list_trips(self.manager1.id)
@@ -1466,7 +1509,7 @@ class TripViewSetTest(BaseTestCase):
         expected_result = self._get_expected_trips(
             self.user1_trip1, self.user1_trip2)
 
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._list_trips(self.user1.id)
@@ -1481,7 +1524,7 @@ class TripViewSetTest(BaseTestCase):
         expected_result = self._get_expected_trips(
             self.manager2_trip1, self.manager2_trip2)
 
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._list_trips(self.manager2.id)
@@ -1493,7 +1536,7 @@ class TripViewSetTest(BaseTestCase):
 
     def test_list_does_not_allow_managers_to_list_admin_trips(self) -> None:
         # Arrange
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._list_trips(self.admin1.id)
@@ -1506,7 +1549,7 @@ class TripViewSetTest(BaseTestCase):
         expected_result = self._get_expected_trips(
             self.admin1_trip1, self.admin1_trip2)
 
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._list_trips(self.admin1.id)
@@ -1521,7 +1564,7 @@ class TripViewSetTest(BaseTestCase):
         expected_result = self._get_expected_trips(
             self.user1_trip1, self.user1_trip2)
 
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._list_trips(self.user1.id)
@@ -1536,7 +1579,7 @@ class TripViewSetTest(BaseTestCase):
         expected_result = self._get_expected_trips(
             self.manager2_trip1, self.manager2_trip2)
 
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._list_trips(self.manager2.id)
@@ -1551,7 +1594,7 @@ class TripViewSetTest(BaseTestCase):
         expected_result = self._get_expected_trips(
             self.admin2_trip1, self.admin2_trip2)
 
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._list_trips(self.admin2.id)
@@ -1570,7 +1613,7 @@ class TripViewSetTest(BaseTestCase):
 
     def test_retrieve_raises_error_for_incorrect_pk(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._retrieve_trip(self.user1.id, 1_000_000)
@@ -1582,7 +1625,7 @@ class TripViewSetTest(BaseTestCase):
         # Arrange
         expected_result = self._get_expected_trips(self.user1_trip1, as_list=False)
 
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._retrieve_trip(self.user1.id, self.user1_trip1.id)
@@ -1594,7 +1637,7 @@ class TripViewSetTest(BaseTestCase):
 
     def test_retrieve_does_not_allow_users_to_retrieve_other_users_trips(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._retrieve_trip(self.user2.id, self.user2_trip1.id)
@@ -1604,7 +1647,7 @@ class TripViewSetTest(BaseTestCase):
 
     def test_retrieve_does_not_allow_users_to_retrieve_manager_trips(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._retrieve_trip(self.manager1.id, self.manager1_trip1.id)
@@ -1614,7 +1657,7 @@ class TripViewSetTest(BaseTestCase):
 
     def test_retrieve_does_not_allow_users_to_retrieve_admin_trips(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._retrieve_trip(self.admin1.id, self.admin1_trip1.id)
@@ -1626,7 +1669,7 @@ class TripViewSetTest(BaseTestCase):
         # Arrange
         expected_result = self._get_expected_trips(self.manager1_trip1, as_list=False)
 
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._retrieve_trip(self.manager1.id, self.manager1_trip1.id)
@@ -1640,7 +1683,7 @@ class TripViewSetTest(BaseTestCase):
         # Arrange
         expected_result = self._get_expected_trips(self.user1_trip1, as_list=False)
 
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._retrieve_trip(self.user1.id, self.user1_trip1.id)
@@ -1654,7 +1697,7 @@ class TripViewSetTest(BaseTestCase):
         # Arrange
         expected_result = self._get_expected_trips(self.manager2_trip1, as_list=False)
 
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._retrieve_trip(self.manager2.id, self.manager2_trip1.id)
@@ -1666,7 +1709,7 @@ class TripViewSetTest(BaseTestCase):
 
     def test_retrieve_does_not_allow_managers_to_retrieve_admin_trips(self) -> None:
         # Arrange
-        self._authenticate(self.MANAGER1_EMAIL, self.MANAGER1_PASSWORD)
+        self._authenticate(self.manager1)
 
         # Act
         response = self._retrieve_trip(self.admin1.id, self.admin1_trip1.id)
@@ -1678,7 +1721,7 @@ class TripViewSetTest(BaseTestCase):
         # Arrange
         expected_result = self._get_expected_trips(self.admin1_trip1, as_list=False)
 
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._retrieve_trip(self.admin1.id, self.admin1_trip1.id)
@@ -1692,7 +1735,7 @@ class TripViewSetTest(BaseTestCase):
         # Arrange
         expected_result = self._get_expected_trips(self.user1_trip1, as_list=False)
 
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._retrieve_trip(self.user1.id, self.user1_trip1.id)
@@ -1706,7 +1749,7 @@ class TripViewSetTest(BaseTestCase):
         # Arrange
         expected_result = self._get_expected_trips(self.manager2_trip1, as_list=False)
 
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._retrieve_trip(self.manager2.id, self.manager2_trip1.id)
@@ -1720,7 +1763,7 @@ class TripViewSetTest(BaseTestCase):
         # Arrange
         expected_result = self._get_expected_trips(self.admin2_trip1, as_list=False)
 
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._retrieve_trip(self.admin2.id, self.admin2_trip1.id)
@@ -1739,7 +1782,7 @@ class TripViewSetTest(BaseTestCase):
 
     def test_create_allows_users_to_create_trips_for_themselves(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._create_trip(self.user1.id, 'Hawaii', '2020-09-01', '2020-10-01', '')
@@ -1749,7 +1792,7 @@ class TripViewSetTest(BaseTestCase):
 
     def test_create_does_not_allow_users_to_create_trips_for_other_users(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._create_trip(self.user2.id, 'Hawaii', '2020-09-01', '2020-10-01', '')
@@ -1759,7 +1802,7 @@ class TripViewSetTest(BaseTestCase):
 
     def test_create_does_not_allow_users_to_create_trips_for_managers(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._create_trip(self.manager1.id, 'Hawaii', '2020-09-01', '2020-10-01', '')
@@ -1769,7 +1812,7 @@ class TripViewSetTest(BaseTestCase):
 
     def test_create_does_not_allow_users_to_create_trips_for_admins(self) -> None:
         # Arrange
-        self._authenticate(self.USER1_EMAIL, self.USER1_PASSWORD)
+        self._authenticate(self.user1)
 
         # Act
         response = self._create_trip(self.admin1.id, 'Hawaii', '2020-09-01', '2020-10-01', '')
@@ -1779,7 +1822,7 @@ class TripViewSetTest(BaseTestCase):
 
     def test_destroy_allows_admins_to_destroy_user_trips(self) -> None:
         # Arrange
-        self._authenticate(self.ADMIN1_EMAIL, self.ADMIN1_PASSWORD)
+        self._authenticate(self.admin1)
 
         # Act
         response = self._destroy_trip(self.user1.id, self.user1_trip1.id)
@@ -0,0 +1,50 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import get_resolver
+
+from project.api.archive import get_archive_filterset_class
+from project.api.management.commands.profile_startup import parse_import_times
+from project.api.warmup import warm_up
+
+
+class WarmupTest(TestCase):
+    databases = {'default', 'replica', 'shard'}
+
+    def test_warm_up_primes_urls_and_filtersets(self) -> None:
+        # Arrange
+        get_archive_filterset_class.cache_clear()
+
+        # Act
+        warm_up(close_connections=False)
+
+        # Assert
+        self.assertTrue(get_resolver()._populated)
+        self.assertEqual(1, get_archive_filterset_class.cache_info().currsize)
+
+    def test_import_times_are_parsed(self) -> None:
+        # Arrange
+        output = '\n'.join((
+            'import time: self [us] | cumulative | imported package',
+            'import time:       120 |        120 |   encodings.aliases',
+            'import time:       300 |        420 | encodings',
+            'Traceback (most recent call last):',
+        ))
+
+        # Act
+        imports = parse_import_times(output)
+
+        # Assert
+        self.assertEqual([('encodings.aliases', 120, 120), ('encodings', 300, 420)], imports)
+
+    def test_profile_startup_reports_phases_and_imports(self) -> None:
+        # Arrange
+        stdout = StringIO()
+
+        # Act
+        call_command('profile_startup', top=5, stdout=stdout)
+
+        # Assert
+        self.assertIn('first_request', stdout.getvalue())
+        self.assertIn('django', stdout.getvalue())
@@ -0,0 +1,128 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.conf import settings
+from django.test import TransactionTestCase, override_settings
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from rest_framework_jwt.settings import api_settings
+
+from project.api.models import RoleEnum, Trip, User
+from project.api.writer import WriteCoordinator, WriteQueueFull
+
+jwt_payload_handler = api_settings.JWT_PAYLOAD_HANDLER
+jwt_encode_handler = api_settings.JWT_ENCODE_HANDLER
+
+
+class WriteCoordinatorTest(TransactionTestCase):
+    """
+    Writes are executed by the writer thread on its own connection, so the fixtures have to be committed
+    """
+
+    def setUp(self) -> None:
+        self.user = User.objects.create(email='user@example.com', role=int(RoleEnum.USER))
+        self.coordinator = WriteCoordinator(max_queue_size=100, max_batch_size=100, max_batch_delay=0.05)
+        self.addCleanup(self.coordinator.stop, 5)
+
+    def _create_trip(self, destination: str) -> Trip:
+        return Trip.objects.create(user=self.user, destination=destination, start_date='2020-07-01', end_date='2020-08-01')
+
+    def test_concurrent_writes_are_committed_in_groups(self) -> None:
+        # Act
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            trips = list(executor.map(
+                lambda number: self.coordinator.submit(self._create_trip, f'Destination {number}', timeout=5), range(10)))
+
+        # Assert
+        self.assertEqual(10, Trip.objects.count())
+        self.assertEqual(sorted(trip.id for trip in trips), list(Trip.objects.order_by('id').values_list('id', flat=True)))
+        self.assertLess(self.coordinator.stats['batches'], 10)
+        self.assertEqual(10, self.coordinator.stats['committed'])
+
+    def test_failing_write_does_not_affect_other_writes_of_the_batch(self) -> None:
+        # Arrange
+        def fail() -> None:
+            self._create_trip('Rolled back')
+            raise ValueError('Invalid trip')
+
+        # Act
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            failing = executor.submit(self.coordinator.submit, fail, timeout=5)
+            succeeding = executor.submit(self.coordinator.submit, self._create_trip, 'Croatia', timeout=5)
+
+            # Assert
+            with self.assertRaises(ValueError):
+                failing.result()
+
+            succeeding.result()
+
+        self.assertEqual(['Croatia'], list(Trip.objects.values_list('destination', flat=True)))
+
+    def test_full_queue_rejects_writes(self) -> None:
+        # Arrange
+        coordinator = WriteCoordinator(max_queue_size=1)
+        self.addCleanup(coordinator.stop, 5)
+        started = threading.Event()
+        release = threading.Event()
+
+        def block() -> None:
+            started.set()
+            release.wait(5)
+
+        executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+        self.addCleanup(release.set)
+        executor.submit(coordinator.submit, block)
+        started.wait(5)
+        executor.submit(coordinator.submit, lambda: None)
+
+        # Act & Assert
+        with self.assertRaises(WriteQueueFull):
+            coordinator.submit(lambda: None, timeout=0.2)
+
+        self.assertEqual(1, coordinator.stats['rejected'])
+
+
+@override_settings(WRITE_QUEUE_ENABLED=True)
+class WriteQueueMixinTest(TransactionTestCase):
+    def setUp(self) -> None:
+        self.coordinator = WriteCoordinator()
+        self.addCleanup(self.coordinator.stop, 5)
+        patcher = mock.patch('project.api.writer._coordinator', self.coordinator)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create(email='user@example.com', role=int(RoleEnum.USER))
+        self.client = APIClient()
+        token = jwt_encode_handler(jwt_payload_handler(self.user))
+        self.client.credentials(HTTP_AUTHORIZATION=f'{settings.JWT_AUTH["JWT_AUTH_HEADER_PREFIX"]} {token}')
+
+    def test_trip_writes_go_through_the_writer(self) -> None:
+        # Act
+        create_response: Response = self.client.post(
+            f'/api/users/{self.user.id}/trips/',
+            {'user': self.user.id, 'destination': 'Croatia', 'start_date': '2020-07-01', 'end_date': '2020-08-01'})
+        trip_id = create_response.data['id']
+        update_response: Response = self.client.patch(
+            f'/api/users/{self.user.id}/trips/{trip_id}/', {'destination': 'Italy'})
+        delete_response: Response = self.client.delete(f'/api/users/{self.user.id}/trips/{trip_id}/')
+
+        # Assert
+        self.assertEqual(201, create_response.status_code)
+        self.assertEqual('Italy', update_response.data['destination'])
+        self.assertEqual(204, delete_response.status_code)
+        self.assertFalse(Trip.objects.exists())
+        self.assertEqual(3, self.coordinator.stats['committed'])
+
+    def test_full_queue_responds_with_service_unavailable(self) -> None:
+        # Act
+        with mock.patch.object(self.coordinator, 'submit', side_effect=WriteQueueFull(wait=1)):
+            response: Response = self.client.post(
+                f'/api/users/{self.user.id}/trips/',
+                {'user': self.user.id, 'destination': 'Croatia', 'start_date': '2020-07-01', 'end_date': '2020-08-01'})
+
+        # Assert
+        self.assertEqual(503, response.status_code)
+        self.assertEqual('1', response['Retry-After'])
+        self.assertFalse(Trip.objects.exists())
@@ -0,0 +1,203 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.request import Request
+from rest_framework.throttling import BaseThrottle
+from rest_framework.views import APIView
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+# Number of remembered empty buckets above which the expired ones are dropped
+MAX_EMPTY_BUCKETS = 10000
+
+
+def parse_rate(rate: str) -> Tuple[int, float]:
+    """
+    Parses a rate like 10/minute into the bucket capacity and the number of tokens refilled per second
+
+    :param rate: Number of requests per period (second, minute, hour or day)
+    :return: Capacity and refill rate of the bucket
+    """
+
+    try:
+        capacity, period = rate.split('/')
+        capacity = int(capacity)
+        duration = PERIODS[period.strip()[0]]
+    except (KeyError, IndexError, ValueError):
+        raise ImproperlyConfigured(f'Invalid rate limit {rate}')
+
+    return capacity, capacity / duration
+
+
+class RateLimiterStats:
+    def __init__(self) -> None:
+        self._counters: Dict[str, Dict[str, int]] = defaultdict(lambda: {'allowed': 0, 'denied': 0, 'fast_denied': 0})
+        self._lock = threading.Lock()
+
+    def count(self, scope: str, outcome: str) -> None:
+        with self._lock:
+            self._counters[scope][outcome] += 1
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {scope: dict(counters) for scope, counters in self._counters.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counters.clear()
+
+
+rate_limiter_stats = RateLimiterStats()
+
+# Times until which a bucket is known to be empty, requests for it are rejected without a cache round trip
+_empty_until: Dict[str, float] = {}
+
+
+def _remember_empty_bucket(cache_key: str, until: float, now: float) -> None:
+    if len(_empty_until) >= MAX_EMPTY_BUCKETS:
+        for expired_key in [key for key, empty_until in _empty_until.items() if empty_until <= now]:
+            del _empty_until[expired_key]
+
+    _empty_until[cache_key] = until
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Token bucket rate limiter keyed per client IP and per email of the request body.
+    Buckets are kept in the default cache, which is shared by the workers when CACHES points to a shared backend.
+    A worker remembers when a bucket becomes non-empty again and rejects requests for it until then
+    without accessing the cache at all. Limits are configured per scope in RATE_LIMITS, e.g.
+    {'obtain_token': {'ip': '30/minute', 'email': '10/minute'}}.
+
+    Buckets are updated by a read-modify-write of the cache, concurrent requests of different workers
+    may therefore consume the same token. The limiter is meant to protect the CPU, not to enforce exact quotas.
+    """
+
+    scope: Optional[str] = None
+
+    def __init__(self) -> None:
+        self._wait: Optional[float] = None
+        self._logger: logging.Logger = logging.getLogger(__name__)
+
+    def get_limits(self) -> Dict[str, Tuple[int, float]]:
+        limits = getattr(settings, 'RATE_LIMITS', {}).get(self.scope, {})
+
+        return {key_type: parse_rate(rate) for key_type, rate in limits.items() if rate}
+
+    def get_keys(self, request: Request, key_types: List[str]) -> Dict[str, str]:
+        keys = {}
+
+        if 'ip' in key_types:
+            keys['ip'] = self.get_ident(request)
+
+        if 'email' in key_types:
+            email = request.data.get('email') if hasattr(request.data, 'get') else None
+
+            if isinstance(email, str) and email:
+                keys['email'] = email.strip().lower()
+
+        return keys
+
+    def is_limited(self, request: Request, view: APIView) -> bool:
+        return True
+
+    def allow_request(self, request: Request, view: APIView) -> bool:
+        limits = self.get_limits()
+
+        if not limits or not self.is_limited(request, view):
+            return True
+
+        now = time.time()
+        keys = {
+            key_type: f'api:rate-limit:{self.scope}:{key_type}:{key}'
+            for key_type, key in self.get_keys(request, list(limits)).items()
+        }
+
+        empty_until = max((_empty_until.get(cache_key, 0) for cache_key in keys.values()), default=0)
+
+        if empty_until > now:
+            self._wait = empty_until - now
+            rate_limiter_stats.count(self.scope, 'fast_denied')
+
+            return False
+
+        buckets = cache.get_many(list(keys.values()))
+        updated_buckets = {}
+        wait = 0.0
+
+        for key_type, cache_key in keys.items():
+            capacity, refill_rate = limits[key_type]
+            tokens, updated_at = buckets.get(cache_key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+
+            if tokens < 1:
+                key_wait = (1 - tokens) / refill_rate
+                _remember_empty_bucket(cache_key, now + key_wait, now)
+                wait = max(wait, key_wait)
+
+            updated_buckets[cache_key] = (tokens - 1, now, capacity / refill_rate)
+
+        if wait > 0:
+            self._wait = wait
+            rate_limiter_stats.count(self.scope, 'denied')
+            self._logger.info(f'Rate limit of {self.scope} exceeded, retry in {wait:.1f} s')
+
+            return False
+
+        for cache_key, (tokens, updated_at, timeout) in updated_buckets.items():
+            # A bucket left alone for capacity / refill_rate seconds is full again and does not need to be stored
+            cache.set(cache_key, (tokens, updated_at), timeout=int(timeout) + 1)
+            _empty_until.pop(cache_key, None)
+
+        rate_limiter_stats.count(self.scope, 'allowed')
+
+        return True
+
+    def wait(self) -> Optional[float]:
+        return self._wait
+
+
+class ObtainTokenThrottle(TokenBucketThrottle):
+    scope = 'obtain_token'
+
+
+class SignupThrottle(TokenBucketThrottle):
+    """
+    Limits creation of users by anonymous clients, authenticated managers and admins are not limited
+    """
+
+    scope = 'signup'
+
+    def is_limited(self, request: Request, view: APIView) -> bool:
+        return getattr(view, 'action', None) == 'create' and not request.user.is_authenticated
+
+
+def reserve(key: str, amount: int, rate: float) -> float:
+    """
+    Reserves @amount units of a rate shared by the workers through the default cache, e.g. rows deleted per second.
+    Like the token buckets, reservations are a read-modify-write of the cache and only approximate across workers.
+
+    :param key: Name of the rate
+    :param amount: Number of units about to be used
+    :param rate: Units per second, 0 disables the limit
+    :return: Seconds to wait before using the units
+    """
+
+    if rate <= 0:
+        return 0.0
+
+    cache_key = f'api:rate-reservation:{key}'
+    now = time.time()
+    # The time until which the rate has been reserved
+    start = max(now, cache.get(cache_key, now))
+    end = start + amount / rate
+    cache.set(cache_key, end, timeout=int(end - now) + 1)
+
+    return start - now
@@ -0,0 +1,250 @@
+import datetime
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple, Union
+
+import jwt
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import F
+from django.utils import timezone
+from rest_framework_jwt import utils
+from rest_framework_jwt.settings import api_settings
+
+from .models import RevokedToken, User
+
+_logger: logging.Logger = logging.getLogger(__name__)
+
+# Revocations committed late by slow transactions are still picked up by the next sync
+REVOCATION_SYNC_OVERLAP = datetime.timedelta(seconds=60)
+
+
+class RevokedTokenError(jwt.DecodeError):
+    """
+    Raised for tokens on the denylist. Subclassing DecodeError keeps djangorestframework-jwt
+    answering them with 400/401 instead of failing.
+    """
+
+
+class TokenDenylist:
+    """
+    In-process set of revoked token IDs with their expiration. Lookups never touch the database,
+    the set is refreshed from RevokedToken at most once per REVOCATION_SYNC_INTERVAL seconds,
+    so revocations made by other workers take effect within that interval.
+    """
+
+    def __init__(self) -> None:
+        self._expirations: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._synced_at: Optional[float] = None
+        self._last_sync: Optional[datetime.datetime] = None
+
+    def add(self, jti: str, expires_at: float) -> None:
+        self._expirations[jti] = expires_at
+
+    def clear(self) -> None:
+        with self._lock:
+            self._expirations = {}
+            self._synced_at = None
+            self._last_sync = None
+
+    def _sync(self) -> None:
+        now = timezone.now()
+        queryset = RevokedToken.objects.using(DEFAULT_DB_ALIAS).filter(expires_at__gt=now)
+
+        if self._last_sync is not None:
+            queryset = queryset.filter(revoked_at__gte=self._last_sync - REVOCATION_SYNC_OVERLAP)
+
+        expirations = {jti: expires_at.timestamp() for jti, expires_at in queryset.values_list('jti', 'expires_at')}
+        current_time = time.time()
+        # Expired tokens are rejected by the signature check anyway
+        self._expirations = {
+            jti: expires_at
+            for jti, expires_at in {**self._expirations, **expirations}.items()
+            if expires_at > current_time
+        }
+        self._last_sync = now
+
+    def is_sync_due(self) -> bool:
+        interval = getattr(settings, 'REVOCATION_SYNC_INTERVAL', 5)
+
+        return self._synced_at is None or time.monotonic() - self._synced_at >= interval
+
+    def sync(self, force: bool = False) -> None:
+        current_time = time.monotonic()
+
+        if not force and not self.is_sync_due():
+            return
+
+        # A single thread refreshes the set while the others keep using the current one
+        if not self._lock.acquire(blocking=force):
+            return
+
+        try:
+            self._sync()
+            self._synced_at = current_time
+        finally:
+            self._lock.release()
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        if not jti:
+            return False
+
+        self.sync()
+        expires_at = self._expirations.get(jti)
+
+        return expires_at is not None and expires_at > time.time()
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU cache of verified token payloads keyed by the SHA-256 digest of the token,
+    so the signature of a token is verified once instead of on every request.
+    Entries are served until the token expires. Revocation is not cached:
+    the denylist and the token version are checked on every request, including cache hits.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size: int = max_size
+        self._entries: 'OrderedDict[bytes, Tuple[dict, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+
+            return dict(
+                self._stats, size=len(self._entries), hit_rate=self._stats['hits'] / lookups if lookups else 0.0)
+
+    def _digest(self, token: Union[str, bytes]) -> bytes:
+        # The authentication passes the token as it was read from the header, the serializers as text
+        return hashlib.sha256(token.encode() if isinstance(token, str) else token).digest()
+
+    def get(self, token: Union[str, bytes]) -> Optional[dict]:
+        if self._max_size <= 0:
+            return None
+
+        digest = self._digest(token)
+
+        with self._lock:
+            entry = self._entries.get(digest)
+
+            if entry is not None and entry[1] <= time.time():
+                del self._entries[digest]
+                entry = None
+
+            if entry is None:
+                self._stats['misses'] += 1
+
+                return None
+
+            self._entries.move_to_end(digest)
+            self._stats['hits'] += 1
+
+        # Callers must not be able to modify the cached payload
+        return dict(entry[0])
+
+    def put(self, token: Union[str, bytes], payload: dict) -> None:
+        if self._max_size <= 0 or not isinstance(payload.get('exp'), (int, float)):
+            return
+
+        leeway = api_settings.JWT_LEEWAY
+        leeway = leeway.total_seconds() if isinstance(leeway, datetime.timedelta) else leeway
+        expires_at = payload['exp'] + leeway
+        digest = self._digest(token)
+
+        with self._lock:
+            self._entries[digest] = (dict(payload), expires_at)
+            self._entries.move_to_end(digest)
+
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+
+denylist = TokenDenylist()
+
+token_cache = VerifiedTokenCache(getattr(settings, 'JWT_CACHE_SIZE', 10000))
+
+
+def jwt_payload_handler(user: User) -> dict:
+    """
+    Adds the token ID (jti) and the token version of the user to the default payload
+    """
+
+    payload = utils.jwt_payload_handler(user)
+    payload['jti'] = uuid.uuid4().hex
+    payload['ver'] = user.token_version
+
+    return payload
+
+
+def jwt_decode_handler(token: str) -> dict:
+    """
+    Verifies the token, or looks it up in the verified token cache, and rejects it if it is on the denylist
+    """
+
+    payload = token_cache.get(token)
+
+    if payload is None:
+        payload = utils.jwt_decode_handler(token)
+        token_cache.put(token, payload)
+
+    if denylist.is_revoked(payload.get('jti')):
+        raise RevokedTokenError('Token has been revoked.')
+
+    return payload
+
+
+def is_token_version_current(payload: dict, user: User) -> bool:
+    """
+    Checks that the token was issued after the last "logout everywhere" of the user.
+    Tokens issued before token versions were introduced carry no version and are treated as version 0.
+    """
+
+    return payload.get('ver', 0) == user.token_version
+
+
+def revoke_token(payload: dict) -> None:
+    """
+    Revokes a single token until it expires
+
+    :param payload: Verified payload of the token
+    """
+
+    jti = payload.get('jti')
+
+    if not jti:
+        _logger.warning(f'Token of user {payload.get("user_id")} has no jti and cannot be revoked individually')
+        return
+
+    now = timezone.now()
+    expires_at = datetime.datetime.fromtimestamp(payload['exp'], tz=datetime.timezone.utc)
+
+    RevokedToken.objects.using(DEFAULT_DB_ALIAS).get_or_create(
+        jti=jti, defaults={'user_id': payload.get('user_id'), 'expires_at': expires_at})
+    denylist.add(jti, expires_at.timestamp())
+    # Revocations are rare, the durable store is cleaned up along the way
+    RevokedToken.objects.using(DEFAULT_DB_ALIAS).filter(expires_at__lte=now).delete()
+
+
+def revoke_all_tokens(user: User) -> None:
+    """
+    Revokes every token issued to the user so far ("logout everywhere")
+
+    :param user: User whose tokens are revoked
+    """
+
+    User.objects.filter(pk=user.pk).update(token_version=F('token_version') + 1)
+    user.refresh_from_db(fields=['token_version'])
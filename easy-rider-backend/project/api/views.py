@@ -1,25 +1,41 @@
 import datetime
 import logging
+from typing import Hashable
 
 import django_filters
-from django.db.models import Q, QuerySet
+from django.db.models import Prefetch, QuerySet
 from django.http import JsonResponse
 from django.views import View
-from rest_framework import filters, viewsets
+from rest_framework import filters, mixins, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.exceptions import APIException
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 from rest_framework.views import APIView
-from rest_framework_jwt.authentication import JSONWebTokenAuthentication
+from rest_framework_jwt.views import ObtainJSONWebToken, RefreshJSONWebToken
 
-from .models import RoleEnum, Trip, User
+from .archive import TripArchiveViewMixin, TripFilterBackend
+from .authentication import JSONWebTokenAuthentication
+from .coalescing import CoalescingReadMixin, get_user_scope
+from .events import make_stream_ticket
+from .fieldsets import SparseFieldsetViewMixin, get_requested_includes
+from .filters import TripAccessFilterBackend, filter_email_domain, filter_email_prefix
+from .jobs import schedule_user_deletion
+from .models import ArchivedTrip, RoleEnum, Trip, User
+from .pagination import TripPagination
 from .policies import TripAccessPolicy, UserAccessPolicy
-from .serializers import TripSerializer, UserSerializer
+from .routers import ReplicaReadMixin
+from .serializers import RefreshTokenSerializer, TripSerializer, UserSerializer
+from .sharding import get_trip_shards, is_sharding_enabled, merge_ordered, prefetch_trips
+from .summaries import SUMMARY_FIELDS
+from .throttling import ObtainTokenThrottle, SignupThrottle
+from .tokens import revoke_all_tokens, revoke_token
+from .writer import WriteQueueMixin
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ReplicaReadMixin, CoalescingReadMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows users to be viewed or edited
     """
@@ -33,10 +49,13 @@ class UserViewSet(viewsets.ModelViewSet):
             self._logger: logging.Logger = logging.getLogger(__name__)
 
         def filter_queryset(self, request: Request, queryset: QuerySet, view: View) -> QuerySet:
+            # Deleted users stay inactive until their trips have been purged
+            queryset = queryset.filter(is_active=True)
+
             if request.user.role == RoleEnum.USER:
                 return queryset.filter(id=request.user.id)
             elif request.user.role == RoleEnum.MANAGER:
-                return queryset.filter(Q(role=int(RoleEnum.USER)) | Q(role=int(RoleEnum.MANAGER)))
+                return queryset.filter(role__in=(int(RoleEnum.USER), int(RoleEnum.MANAGER)))
             elif request.user.role == RoleEnum.ADMIN:
                 return queryset
             else:
@@ -44,16 +63,87 @@ class UserViewSet(viewsets.ModelViewSet):
 
                 return queryset.none()
 
+    class UserFilter(django_filters.FilterSet):
+        """
+        Case-insensitive email prefix and domain filters running on the indexed lowercased columns
+        """
+
+        email = django_filters.CharFilter(method='filter_email')
+        domain = django_filters.CharFilter(method='filter_domain')
+
+        class Meta:
+            model = User
+            fields = {
+                'role': ['exact', 'in'],
+            }
+
+        def filter_email(self, queryset: QuerySet, name: str, value: str) -> QuerySet:
+            return filter_email_prefix(queryset, value)
+
+        def filter_domain(self, queryset: QuerySet, name: str, value: str) -> QuerySet:
+            return filter_email_domain(queryset, value)
+
     authentication_class = (JSONWebTokenAuthentication,)
     permission_classes = (UserAccessPolicy,)
     queryset = User.objects.all()
     serializer_class = UserSerializer
-    filter_backends = (UserFilterBackend,)
+    filter_backends = (UserFilterBackend, django_filters.rest_framework.DjangoFilterBackend)
+    filterset_class = UserFilter
+    # Rejects bursts of anonymous signups before their passwords are hashed
+    throttle_classes = (SignupThrottle,)
+    # Order of the trips embedded by ?include=trips
+    trip_ordering = ('start_date', 'id')
+    included_columns = {'summary': SUMMARY_FIELDS}
+
+    def _includes_trips(self) -> bool:
+        return 'trips' in get_requested_includes(self.request)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        if self._includes_trips() and not is_sharding_enabled():
+            # Only the trips the originator may list are loaded (see TripAccessPolicy.scope_queryset)
+            trips = TripAccessPolicy.scope_queryset(self.request, Trip.objects.order_by(*self.trip_ordering))
+            queryset = queryset.prefetch_related(Prefetch('trip_set', queryset=trips, to_attr='prefetched_trips'))
+
+        return queryset
+
+    def get_coalescing_scope(self, request: Request) -> Hashable:
+        # Embedded trips and summaries of MANAGERs are visible to themselves only, other MANAGERs get different responses
+        if request.user.role == RoleEnum.MANAGER and get_requested_includes(request) & {'trips', 'summary'}:
+            return f'user:{request.user.id}'
+
+        return get_user_scope(request.user)
+
+    def get_serializer(self, *args, **kwargs):
+        if args and self._includes_trips() and is_sharding_enabled():
+            # Trips of the users may be spread across shards, they are loaded once the page is known
+            many = kwargs.get('many', False)
+            users = list(args[0]) if many else [args[0]]
+            visible_users = [user for user in users if TripAccessPolicy.can_list_trips_of(self.request.user, user)]
+            prefetch_trips(visible_users, self.trip_ordering)
+
+            for user in users:
+                if not hasattr(user, 'prefetched_trips'):
+                    user.prefetched_trips = []
 
+            args = (users if many else users[0], *args[1:])
 
-class CurrentUserView(APIView):
+        return super().get_serializer(*args, **kwargs)
+
+    def destroy(self, request: Request, *args, **kwargs) -> Response:
+        # Deleting the trips of a user with a long history would hold one long transaction,
+        # the user is deactivated now and purged in the background instead
+        job = schedule_user_deletion(self.get_object(), request.user)
+        location = reverse('jobs-detail', args=[job.id], request=request)
+
+        return Response({'job': job.id}, status=status.HTTP_202_ACCEPTED, headers={'Location': location})
+
+
+class CurrentUserView(ReplicaReadMixin, APIView):
     authentication_class = (JSONWebTokenAuthentication,)
     permission_classes = (IsAuthenticated,)
+    replica_actions = ('get',)
 
     def get(self, request: Request) -> JsonResponse:
         serializer = UserSerializer(request.user)
@@ -62,14 +152,37 @@ class CurrentUserView(APIView):
 
 
 class LogoutView(APIView):
+    """
+    Revokes the token of the request, or all tokens of the user if "everywhere" is set
+    """
+
     authentication_class = (JSONWebTokenAuthentication,)
     permission_classes = (IsAuthenticated,)
 
     def post(self, request: Request) -> JsonResponse:
+        if request.data.get('everywhere'):
+            revoke_all_tokens(request.user)
+        else:
+            payload = getattr(request, 'jwt_payload', None)
+
+            if payload is not None:
+                revoke_token(payload)
+
         return JsonResponse(data={})
 
 
-class TripViewSet(viewsets.ModelViewSet):
+class ObtainTokenView(ObtainJSONWebToken):
+    # Rejects bursts of logins before the passwords are checked
+    throttle_classes = (ObtainTokenThrottle,)
+
+
+class RefreshTokenView(RefreshJSONWebToken):
+    serializer_class = RefreshTokenSerializer
+
+
+class TripViewSet(
+        ReplicaReadMixin, WriteQueueMixin, CoalescingReadMixin, TripArchiveViewMixin, SparseFieldsetViewMixin,
+        viewsets.ModelViewSet):
     """
     API endpoint that allows trips to be viewed or edited.
     """
@@ -88,11 +201,27 @@ class TripViewSet(viewsets.ModelViewSet):
     authentication_class = (JSONWebTokenAuthentication,)
     permission_classes = (IsAuthenticated, TripAccessPolicy)
     serializer_class = TripSerializer
-    filter_backends = (django_filters.rest_framework.DjangoFilterBackend,)
+    filter_backends = (TripFilterBackend,)
     filterset_class = TripFilter
 
     def get_queryset(self):
-        return Trip.objects.filter(user=self.kwargs['user_pk'])
+        return Trip.objects.for_user(self.kwargs['user_pk'])
+
+    def get_archive_queryset(self):
+        return ArchivedTrip.objects.for_user(self.kwargs['user_pk'])
+
+    def get_coalescing_scope(self, request: Request) -> Hashable:
+        # Every originator passing the permission checks sees the same trips of the user in the URL
+        return None
+
+    @action(detail=False, methods=['post'], url_path='stream/ticket')
+    def stream_ticket(self, request: Request, *args, **kwargs) -> Response:
+        """
+        Issues a short-lived ticket opening the event stream of the trips of the user, as EventSource cannot
+        send the Authorization header
+        """
+
+        return Response({'ticket': make_stream_ticket(request.user, self.kwargs['user_pk'])})
 
     def create(self, request: Request, *args, **kwargs) -> Response:
         # serializer = self.get_serializer(data=request.data)
@@ -105,3 +234,39 @@ class TripViewSet(viewsets.ModelViewSet):
 
         return super().create(request)
 
+
+class TripListViewSet(
+        ReplicaReadMixin, TripArchiveViewMixin, SparseFieldsetViewMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+    """
+    API endpoint listing the trips of all users visible to the originator with a single query
+    """
+
+    authentication_class = (JSONWebTokenAuthentication,)
+    permission_classes = (IsAuthenticated,)
+    serializer_class = TripSerializer
+    filter_backends = (TripAccessFilterBackend, TripFilterBackend)
+    filterset_class = TripViewSet.TripFilter
+    pagination_class = TripPagination
+    ordering = ('start_date', 'id')
+
+    def get_queryset(self):
+        return Trip.objects.order_by(*self.ordering)
+
+    def get_archive_queryset(self):
+        return ArchivedTrip.objects.all()
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        if not is_sharding_enabled():
+            return super().list(request, *args, **kwargs)
+
+        # Every shard returns its first offset + limit trips, the merged page is cut out of them
+        paginator = self.paginator
+        paginator.request = request
+        paginator.limit = paginator.get_limit(request)
+        paginator.offset = paginator.get_offset(request)
+        querysets = [self.filter_queryset(self.get_queryset().using(alias)) for alias in get_trip_shards()]
+        paginator.count = sum(queryset.count() for queryset in querysets)
+        end = paginator.offset + paginator.limit
+        trips = merge_ordered([list(queryset[:end]) for queryset in querysets], self.ordering, end)[paginator.offset:]
+
+        return paginator.get_paginated_response(self.get_serializer(trips, many=True).data)
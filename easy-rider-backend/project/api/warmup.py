@@ -0,0 +1,117 @@
+import logging
+import time
+from typing import Iterator, List
+
+from django.apps import apps
+from django.db import DatabaseError, connections
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.settings import api_settings as rest_framework_settings
+from rest_framework.views import APIView
+from rest_framework_jwt.settings import api_settings as jwt_settings
+
+_logger: logging.Logger = logging.getLogger(__name__)
+
+
+def _iter_view_classes(patterns: List) -> Iterator[type]:
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _iter_view_classes(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            view_class = getattr(pattern.callback, 'cls', None)
+
+            if view_class is not None and issubclass(view_class, APIView):
+                yield view_class
+
+
+def _prime_settings() -> None:
+    # Both settings objects import the classes named by strings on first access
+    for settings in (rest_framework_settings, jwt_settings):
+        for name in settings.defaults:
+            getattr(settings, name)
+
+
+def _prime_models() -> None:
+    for model in apps.get_models():
+        model._meta.get_fields()
+
+
+def _prime_views() -> int:
+    """
+    Instantiates the permissions (access policies), filter backends, filtersets and serializers of every DRF view
+    reachable from the root URLconf, which also imports the view modules and builds the router URL patterns
+
+    :return: Number of primed views
+    """
+
+    from .archive import TripFilterBackend
+    from .models import ArchivedTrip
+
+    resolver = get_resolver()
+    # Builds the reverse lookup tables reverse() would otherwise build on the first request
+    resolver._populate()
+    view_classes = list(dict.fromkeys(_iter_view_classes(resolver.url_patterns)))
+
+    for view_class in view_classes:
+        view = view_class()
+        view.get_permissions()
+
+        for backend_class in getattr(view_class, 'filter_backends', ()):
+            backend = backend_class()
+            filterset_class = getattr(view_class, 'filterset_class', None)
+
+            if filterset_class is not None:
+                # The form class of a filterset is built on first use
+                filterset_class().form
+
+                if isinstance(backend, TripFilterBackend):
+                    backend.get_filterset_class(view, ArchivedTrip.objects.none())().form
+
+        serializer_class = getattr(view_class, 'serializer_class', None)
+
+        if serializer_class is not None:
+            # ModelSerializer introspects the model to build its fields
+            serializer_class(context={}).fields
+
+    return len(view_classes)
+
+
+def _prime_database() -> None:
+    from .tokens import denylist
+
+    for connection in connections.all():
+        # Runs the connection_created receivers, e.g. the SQLite pragmas
+        connection.ensure_connection()
+
+    denylist.sync(force=True)
+
+
+def warm_up(close_connections: bool = True) -> None:
+    """
+    Does the work the first requests of a worker would otherwise pay for: imports the views and the classes named
+    in the settings, builds the URL patterns of the routers, instantiates the access policies, filtersets
+    and serializers and loads the token denylist. Failures are logged, they must not prevent the worker from starting.
+
+    :param close_connections: Close the database connections afterwards. Connections must not be inherited by
+           forked workers, so warm_up() called before forking (e.g. gunicorn --preload) has to close them
+    """
+
+    started = time.perf_counter()
+
+    try:
+        _prime_settings()
+        _prime_models()
+        view_count = _prime_views()
+    except Exception:
+        _logger.exception('Warming up the views failed')
+
+        return
+
+    try:
+        _prime_database()
+    except DatabaseError:
+        _logger.warning('Warming up the database failed', exc_info=True)
+    finally:
+        if close_connections:
+            connections.close_all()
+
+    _logger.info(f'Warmed up {view_count} views in {(time.perf_counter() - started) * 1000:.0f} ms')
@@ -0,0 +1,273 @@
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, transaction
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+_coordinator: Optional['WriteCoordinator'] = None
+_coordinator_lock = threading.Lock()
+
+
+class WriteQueueFull(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many pending writes, try again later.'
+    default_code = 'write_queue_full'
+
+    def __init__(self, wait: Optional[float] = None) -> None:
+        super().__init__()
+
+        # DRF turns the wait attribute into a Retry-After header
+        self.wait = wait
+
+
+class WriteTimeout(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'The write was not executed in time, try again later.'
+    default_code = 'write_timeout'
+
+
+@dataclass
+class PendingWrite:
+    function: Callable
+    args: tuple
+    kwargs: dict
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Any = None
+    error: Optional[BaseException] = None
+    # pending -> running | cancelled, the transition is guarded by the lock
+    state: str = 'pending'
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def _transition(self, state: str) -> bool:
+        with self.lock:
+            if self.state != 'pending':
+                return False
+
+            self.state = state
+
+            return True
+
+    def start(self) -> bool:
+        return self._transition('running')
+
+    def cancel(self) -> bool:
+        return self._transition('cancelled')
+
+
+class WriteCoordinator:
+    """
+    Funnels writes through a single writer thread. Writes waiting in the queue are committed together
+    in one transaction (group commit), every write runs in its own savepoint, so a failing write
+    does not affect the others. The queue is bounded: when it is full new writes are rejected
+    instead of piling up behind the lock of the database.
+    """
+
+    def __init__(
+            self,
+            max_queue_size: int = 1000,
+            max_batch_size: int = 100,
+            max_batch_delay: float = 0.0,
+            using: str = DEFAULT_DB_ALIAS) -> None:
+        """
+        :param max_queue_size: Maximum number of writes waiting for the writer
+        :param max_batch_size: Maximum number of writes committed in one transaction
+        :param max_batch_delay: Seconds the writer waits for more writes before committing a batch
+        :param using: Database alias the transaction is opened on
+        """
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._max_batch_size: int = max_batch_size
+        self._max_batch_delay: float = max_batch_delay
+        self._using: str = using
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._stats: Dict[str, int] = {'submitted': 0, 'committed': 0, 'failed': 0, 'rejected': 0, 'batches': 0}
+        self._stats_lock = threading.Lock()
+        self._logger: logging.Logger = logging.getLogger(__name__)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return dict(self._stats, depth=self._queue.qsize())
+
+    def _count(self, name: str, value: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[name] += value
+
+    def _ensure_started(self) -> None:
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='write-coordinator', daemon=True)
+                self._thread.start()
+
+    def submit(self, function: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Executes @function in the writer thread and waits for the commit of its transaction
+
+        :param function: Function writing to the database
+        :param timeout: Seconds to wait for a free slot in the queue and then for the commit, None waits forever
+        :return: Return value of @function
+        :raises WriteQueueFull: The queue stayed full for @timeout seconds
+        :raises WriteTimeout: The write was not started within @timeout seconds
+        """
+
+        if threading.current_thread() is self._thread:
+            # Writes issued by a write are already part of the batch
+            return function(*args, **kwargs)
+
+        self._ensure_started()
+
+        write = PendingWrite(function, args, kwargs)
+        started = time.monotonic()
+
+        try:
+            self._queue.put(write, timeout=timeout)
+        except queue.Full:
+            self._count('rejected')
+            self._logger.warning(f'Write queue is full ({self._queue.maxsize} writes), rejecting a write')
+
+            raise WriteQueueFull(wait=1)
+
+        self._count('submitted')
+        remaining = None if timeout is None else max(0.0, timeout - (time.monotonic() - started))
+
+        if not write.done.wait(remaining):
+            if write.cancel():
+                raise WriteTimeout()
+
+            # The writer already started the write, its outcome has to be awaited
+            write.done.wait()
+
+        if write.error is not None:
+            raise write.error
+
+        return write.result
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stops the writer thread after the writes queued so far have been executed
+        """
+
+        with self._thread_lock:
+            thread = self._thread
+            self._thread = None
+
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join(timeout)
+
+    def _next_batch(self) -> Optional[List[PendingWrite]]:
+        first = self._queue.get()
+
+        if first is None:
+            return None
+
+        batch = [first]
+        deadline = time.monotonic() + self._max_batch_delay
+
+        while len(batch) < self._max_batch_size:
+            try:
+                remaining = deadline - time.monotonic()
+                write = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if write is None:
+                # Stop after this batch
+                self._queue.put(None)
+                break
+
+            batch.append(write)
+
+        return batch
+
+    def _execute(self, batch: List[PendingWrite]) -> None:
+        executed = []
+
+        try:
+            with transaction.atomic(using=self._using):
+                for write in batch:
+                    if not write.start():
+                        continue
+
+                    executed.append(write)
+
+                    try:
+                        with transaction.atomic(using=self._using):
+                            write.result = write.function(*write.args, **write.kwargs)
+                    except Exception as error:
+                        write.error = error
+        except DatabaseError as error:
+            self._logger.exception('Commit of a write batch failed')
+
+            for write in executed:
+                if write.error is None:
+                    write.error = error
+
+            connection = connections[self._using]
+
+            if connection.connection is not None and not connection.is_usable():
+                connection.close()
+
+        self._count('batches')
+
+        for write in executed:
+            self._count('failed' if write.error is not None else 'committed')
+            write.done.set()
+
+    def _run(self) -> None:
+        try:
+            while True:
+                batch = self._next_batch()
+
+                if batch is None:
+                    break
+
+                self._execute(batch)
+        finally:
+            connections.close_all()
+
+
+def get_write_coordinator() -> WriteCoordinator:
+    global _coordinator
+
+    with _coordinator_lock:
+        if _coordinator is None:
+            _coordinator = WriteCoordinator(
+                max_queue_size=settings.WRITE_QUEUE_MAX_SIZE,
+                max_batch_size=settings.WRITE_QUEUE_MAX_BATCH_SIZE,
+                max_batch_delay=settings.WRITE_QUEUE_MAX_BATCH_DELAY)
+
+        return _coordinator
+
+
+def run_write(function: Callable, *args, **kwargs) -> Any:
+    """
+    Executes @function through the write coordinator if WRITE_QUEUE_ENABLED is set, directly otherwise
+    """
+
+    if not getattr(settings, 'WRITE_QUEUE_ENABLED', False):
+        return function(*args, **kwargs)
+
+    return get_write_coordinator().submit(function, *args, timeout=settings.WRITE_QUEUE_TIMEOUT, **kwargs)
+
+
+class WriteQueueMixin:
+    """
+    ModelViewSet mixin executing create, update and destroy through run_write
+    """
+
+    def perform_create(self, serializer) -> None:
+        run_write(super().perform_create, serializer)
+
+    def perform_update(self, serializer) -> None:
+        run_write(super().perform_update, serializer)
+
+    def perform_destroy(self, instance) -> None:
+        run_write(super().perform_destroy, instance)
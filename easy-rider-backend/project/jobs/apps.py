@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class JobsConfig(AppConfig):
+    name = 'project.jobs'
+
+    def ready(self) -> None:
+        # Tasks are registered by the jobs modules of the installed apps, e.g. project/api/jobs.py
+        autodiscover_modules('jobs')
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+from project.jobs.worker import WorkerPool, run_worker
+
+
+class Command(BaseCommand):
+    help = 'Runs background jobs in a pool of worker processes'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--processes', type=int, default=settings.JOBS_WORKERS,
+            help='Number of worker processes, 0 runs jobs in this process')
+        parser.add_argument('--burst', action='store_true', help='Exit once the queue is empty')
+
+    def handle(self, *args, **options) -> None:
+        self.stdout.write(f'Running jobs with {options["processes"] or "no"} worker processes')
+
+        if options['processes'] > 0:
+            WorkerPool(options['processes']).run(options['burst'])
+        else:
+            run_worker(options['burst'])
@@ -0,0 +1,39 @@
+# Generated by Django 3.0.14 on 2026-10-19 17:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('arguments', models.TextField(default='{}')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='queued', max_length=16)),
+                ('priority', models.SmallIntegerField(default=0)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('max_attempts', models.PositiveIntegerField()),
+                ('available_at', models.DateTimeField()),
+                ('locked_by', models.CharField(blank=True, default='', max_length=100)),
+                ('user_id', models.IntegerField(blank=True, null=True)),
+                ('progress', models.TextField(blank=True, default='')),
+                ('result', models.TextField(blank=True, default='')),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['status', 'available_at'], name='jobs_job_claim_idx'),
+        ),
+    ]
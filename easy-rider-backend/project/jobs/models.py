@@ -0,0 +1,60 @@
+import json
+from typing import Any
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class Job(models.Model):
+    """
+    Background job executed by the workers of run_workers (see project/jobs/worker.py).
+    Arguments, results and progress are stored as JSON text, which every database supports.
+    """
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+
+    STATUS_CHOICES = (
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (SUCCEEDED, 'Succeeded'),
+        (FAILED, 'Failed'),
+    )
+
+    name = models.CharField(max_length=200)
+    arguments = models.TextField(default='{}')
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=QUEUED)
+    # Jobs with a higher priority are claimed first
+    priority = models.SmallIntegerField(default=0)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField()
+    # Queued jobs are claimed once it passes, running jobs are claimed again once their lease expires there
+    available_at = models.DateTimeField()
+    locked_by = models.CharField(max_length=100, blank=True, default='')
+    # User who enqueued the job, the only non-admin allowed to see its status
+    user_id = models.IntegerField(null=True, blank=True)
+    progress = models.TextField(blank=True, default='')
+    result = models.TextField(blank=True, default='')
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Serves the claim query of the workers
+            models.Index(fields=['status', 'available_at'], name='jobs_job_claim_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.name} #{self.pk} ({self.status})'
+
+    @staticmethod
+    def dumps(value: Any) -> str:
+        return json.dumps(value, cls=DjangoJSONEncoder)
+
+    @staticmethod
+    def loads(value: str) -> Any:
+        return json.loads(value) if value else None
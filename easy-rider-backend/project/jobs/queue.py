@@ -0,0 +1,157 @@
+import datetime
+import random
+from typing import Any, Callable, Optional, Union
+
+from django.conf import settings
+from django.db.models import F, QuerySet
+from django.utils import timezone
+
+from .models import Job
+from .registry import get_task
+
+# Candidates read per claim attempt, workers racing for the same jobs fall back to the next ones
+CLAIM_CANDIDATES = 10
+
+
+def enqueue(
+        function: Union[Callable, str],
+        *args,
+        priority: Optional[int] = None,
+        delay: float = 0,
+        max_attempts: Optional[int] = None,
+        user_id: Optional[int] = None,
+        **kwargs) -> Job:
+    """
+    Stores a job running a task with the given arguments. The job is inserted in the current transaction,
+    so jobs enqueued by a view or a signal are only run if the transaction commits
+
+    :param function: Task function or its name
+    :param args: Positional arguments of the task, they have to be serializable to JSON
+    :param priority: Priority of the job, the default priority of the task if None
+    :param delay: Seconds before the job may run
+    :param max_attempts: Number of attempts before the job fails, the default of the task or JOBS_MAX_ATTEMPTS if None
+    :param user_id: ID of the user allowed to see the status of the job
+    :param kwargs: Keyword arguments of the task, they have to be serializable to JSON
+    :return: Queued job
+    """
+
+    registered_task = get_task(function if isinstance(function, str) else function.task_name)
+
+    return Job.objects.create(
+        name=registered_task.name,
+        arguments=Job.dumps({'args': args, 'kwargs': kwargs}),
+        priority=priority if priority is not None else registered_task.priority,
+        max_attempts=max_attempts or registered_task.max_attempts or settings.JOBS_MAX_ATTEMPTS,
+        available_at=timezone.now() + datetime.timedelta(seconds=delay),
+        user_id=user_id)
+
+
+def _lease_until(job: Job) -> datetime.datetime:
+    try:
+        timeout = get_task(job.name).timeout
+    except KeyError:
+        timeout = None
+
+    return timezone.now() + datetime.timedelta(seconds=timeout or settings.JOBS_VISIBILITY_TIMEOUT)
+
+
+def claim(worker_id: str) -> Optional[Job]:
+    """
+    Claims the available job with the highest priority. Claims are compare-and-set updates conditioned on
+    the attempt counter, which works without row locks, so on SQLite as well as on Postgres.
+    Running jobs whose lease expired (their worker died or hangs) are claimed again.
+
+    :param worker_id: ID of the claiming worker
+    :return: Claimed job or None if no job is available
+    """
+
+    now = timezone.now()
+    # Jobs whose last attempt did not finish in time (e.g. crashing their worker) are not retried forever
+    Job.objects.filter(status=Job.RUNNING, available_at__lte=now, attempts__gte=F('max_attempts')).update(
+        status=Job.FAILED, error='The last attempt timed out', locked_by='', finished_at=now)
+    candidates = list(
+        Job.objects
+        .filter(status__in=(Job.QUEUED, Job.RUNNING), available_at__lte=now)
+        .order_by('-priority', 'available_at', 'id')
+        .only('id', 'name', 'attempts')[:CLAIM_CANDIDATES])
+
+    for candidate in candidates:
+        claimed = Job.objects.filter(
+            pk=candidate.pk,
+            status__in=(Job.QUEUED, Job.RUNNING),
+            attempts=candidate.attempts,
+            available_at__lte=now
+        ).update(
+            status=Job.RUNNING,
+            attempts=F('attempts') + 1,
+            locked_by=worker_id,
+            available_at=_lease_until(candidate),
+            started_at=now)
+
+        if claimed:
+            return Job.objects.get(pk=candidate.pk)
+
+    return None
+
+
+def _owned(job: Job) -> QuerySet:
+    # A worker whose lease expired no longer owns the job, the attempt counter tells the runs apart
+    return Job.objects.filter(pk=job.pk, status=Job.RUNNING, locked_by=job.locked_by, attempts=job.attempts)
+
+
+def complete(job: Job, result: Any = None) -> bool:
+    """
+    Marks a claimed job as succeeded
+
+    :param job: Job returned by claim()
+    :param result: Result of the task, it has to be serializable to JSON
+    :return: Boolean value indicating whether the worker still owned the job
+    """
+
+    return bool(_owned(job).update(
+        status=Job.SUCCEEDED, result=Job.dumps(result), error='', locked_by='', finished_at=timezone.now()))
+
+
+def retry_delay(attempts: int) -> float:
+    """
+    Exponential backoff with full jitter
+
+    :param attempts: Number of attempts made so far
+    :return: Seconds before the next attempt
+    """
+
+    return random.uniform(0, min(settings.JOBS_RETRY_BACKOFF_MAX, settings.JOBS_RETRY_BACKOFF * 2 ** (attempts - 1)))
+
+
+def fail(job: Job, error: str) -> bool:
+    """
+    Queues a claimed job for another attempt after a backoff, or marks it as failed after its last attempt
+
+    :param job: Job returned by claim()
+    :param error: Description of the error, e.g. a traceback
+    :return: Boolean value indicating whether the worker still owned the job
+    """
+
+    now = timezone.now()
+
+    if job.attempts < job.max_attempts:
+        changes = {
+            'status': Job.QUEUED,
+            'available_at': now + datetime.timedelta(seconds=retry_delay(job.attempts)),
+        }
+    else:
+        changes = {'status': Job.FAILED, 'finished_at': now}
+
+    return bool(_owned(job).update(error=error, locked_by='', **changes))
+
+
+def set_progress(job: Job, progress: Any) -> bool:
+    """
+    Stores the progress of a claimed job and extends its lease, long jobs report progress to keep running
+
+    :param job: Job returned by claim()
+    :param progress: Progress of the task, it has to be serializable to JSON
+    :return: Boolean value indicating whether the worker still owned the job
+    """
+
+    return bool(_owned(job).update(progress=Job.dumps(progress), available_at=_lease_until(job)))
@@ -0,0 +1,61 @@
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+TASKS: Dict[str, 'Task'] = {}
+
+
+@dataclass
+class Task:
+    """
+    Function which can be executed as a background job
+    """
+
+    name: str
+    function: Callable
+    priority: int = 0
+    max_attempts: Optional[int] = None
+    # Seconds a worker may run the job before another worker claims it again, JOBS_VISIBILITY_TIMEOUT if None
+    timeout: Optional[float] = None
+    # Whether the function receives the running job as its first argument, e.g. to report progress
+    bind: bool = False
+
+
+def task(
+        function: Optional[Callable] = None,
+        *,
+        name: Optional[str] = None,
+        priority: int = 0,
+        max_attempts: Optional[int] = None,
+        timeout: Optional[float] = None,
+        bind: bool = False) -> Callable:
+    """
+    Registers a function as a task. Tasks have to live in the jobs module of an installed app,
+    so the workers import them at startup. Jobs may run more than once, tasks have to be idempotent.
+
+    :param function: Decorated function
+    :param name: Name of the task, the dotted path of the function by default
+    :param priority: Default priority of the jobs of the task
+    :param max_attempts: Default number of attempts of the jobs of the task
+    :param timeout: Visibility timeout of the jobs of the task in seconds
+    :param bind: Whether the function receives the running job as its first argument
+    :return: The function, unchanged
+    """
+
+    def decorator(function: Callable) -> Callable:
+        task_name = name or f'{function.__module__}.{function.__qualname__}'
+        TASKS[task_name] = Task(task_name, function, priority, max_attempts, timeout, bind)
+        function.task_name = task_name
+
+        return function
+
+    return decorator(function) if function is not None else decorator
+
+
+def get_task(name: str) -> Task:
+    """
+    :param name: Name of the task
+    :return: Registered task
+    :raises KeyError: If no task of the name is registered
+    """
+
+    return TASKS[name]
@@ -0,0 +1,34 @@
+from rest_framework import serializers
+
+from project.api.models import RoleEnum
+
+from .models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    progress = serializers.SerializerMethodField()
+    result = serializers.SerializerMethodField()
+    error = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Job
+        fields = (
+            'id', 'name', 'status', 'priority', 'attempts', 'max_attempts', 'progress', 'result', 'error',
+            'created_at', 'started_at', 'finished_at',
+        )
+        read_only_fields = fields
+
+    def get_progress(self, job: Job):
+        return Job.loads(job.progress)
+
+    def get_result(self, job: Job):
+        return Job.loads(job.result)
+
+    def get_error(self, job: Job) -> str:
+        request = self.context.get('request')
+
+        # Tracebacks reveal internals, other users only learn that an attempt failed
+        if request is not None and request.user.role == RoleEnum.ADMIN:
+            return job.error
+
+        return job.error.strip().splitlines()[-1] if job.error else ''
@@ -0,0 +1,174 @@
+import datetime
+import io
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from project.api.models import RoleEnum, User
+from project.jobs.models import Job
+from project.jobs.queue import claim, complete, enqueue, set_progress
+from project.jobs.registry import task
+from project.jobs.worker import Worker
+
+calls = []
+
+
+@task(name='tests.add')
+def add(a: int, b: int) -> int:
+    calls.append((a, b))
+
+    return a + b
+
+
+@task(name='tests.explode', max_attempts=2)
+def explode() -> None:
+    raise ValueError('Boom')
+
+
+@task(name='tests.report', bind=True)
+def report(job: Job, total: int) -> None:
+    set_progress(job, {'done': total, 'total': total})
+
+
+@override_settings(JOBS_RETRY_BACKOFF=0)
+class JobQueueTest(TestCase):
+    def setUp(self) -> None:
+        calls.clear()
+
+    def test_jobs_run_in_the_order_of_their_priorities(self) -> None:
+        # Arrange
+        first = enqueue(add, 1, 2)
+        second = enqueue(add, 3, 4, priority=10)
+
+        # Act
+        Worker('test').run(burst=True)
+
+        # Assert
+        self.assertEqual([(3, 4), (1, 2)], calls)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((Job.SUCCEEDED, 3), (first.status, Job.loads(first.result)))
+        self.assertEqual((Job.SUCCEEDED, 7), (second.status, Job.loads(second.result)))
+
+    def test_failed_jobs_are_retried_until_their_last_attempt(self) -> None:
+        # Arrange
+        job = enqueue(explode)
+        worker = Worker('test')
+
+        # Act
+        with self.assertLogs('project.jobs.worker', 'ERROR'):
+            worker.run_once()
+            job.refresh_from_db()
+            status_after_first_attempt = job.status
+            worker.run_once()
+            job.refresh_from_db()
+
+        # Assert
+        self.assertEqual(Job.QUEUED, status_after_first_attempt)
+        self.assertEqual((Job.FAILED, 2), (job.status, job.attempts))
+        self.assertIn('ValueError: Boom', job.error)
+
+    @override_settings(JOBS_RETRY_BACKOFF=60)
+    def test_retries_are_delayed(self) -> None:
+        # Arrange
+        job = enqueue(explode)
+
+        # Act
+        with self.assertLogs('project.jobs.worker', 'ERROR'):
+            Worker('test').run(burst=True)
+        job.refresh_from_db()
+
+        # Assert
+        self.assertEqual((Job.QUEUED, 1), (job.status, job.attempts))
+        self.assertIsNone(claim('test'))
+
+    def test_jobs_are_claimed_again_once_their_lease_expires(self) -> None:
+        # Arrange
+        enqueue(add, 1, 2)
+        first_claim = claim('first')
+        Job.objects.filter(pk=first_claim.pk).update(available_at=timezone.now() - datetime.timedelta(seconds=1))
+
+        # Act
+        second_claim = claim('second')
+
+        # Assert
+        self.assertEqual(first_claim.pk, second_claim.pk)
+        self.assertFalse(complete(first_claim, 3))
+        self.assertTrue(complete(second_claim, 3))
+
+    def test_delayed_jobs_are_not_claimed_early(self) -> None:
+        # Arrange
+        enqueue(add, 1, 2, delay=60)
+
+        # Act & Assert
+        self.assertIsNone(claim('test'))
+
+    def test_bound_tasks_report_progress(self) -> None:
+        # Arrange
+        job = enqueue(report, total=3)
+
+        # Act
+        Worker('test').run(burst=True)
+        job.refresh_from_db()
+
+        # Assert
+        self.assertEqual({'done': 3, 'total': 3}, Job.loads(job.progress))
+
+
+class JobViewSetTest(TestCase):
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create(email='user@example.com', role=int(RoleEnum.USER))
+        cls.other_user = User.objects.create(email='other@example.com', role=int(RoleEnum.USER))
+        cls.admin = User.objects.create(email='admin@example.com', role=int(RoleEnum.ADMIN))
+
+    def test_users_see_the_status_of_their_jobs_only(self) -> None:
+        # Arrange
+        job = enqueue(add, 1, 2, user_id=self.user.id)
+        enqueue(add, 3, 4, user_id=self.other_user.id)
+        Worker('test').run(burst=True)
+        self.client.force_authenticate(self.user)
+
+        # Act
+        retrieved = self.client.get(f'/api/jobs/{job.id}/')
+        listed = self.client.get('/api/jobs/')
+
+        # Assert
+        self.assertEqual(200, retrieved.status_code)
+        self.assertEqual(('succeeded', 3), (retrieved.data['status'], retrieved.data['result']))
+        self.assertEqual([job.id], [item['id'] for item in listed.data['results']])
+
+    def test_only_admins_see_tracebacks(self) -> None:
+        # Arrange
+        job = enqueue(explode, user_id=self.user.id, max_attempts=1)
+
+        with self.assertLogs('project.jobs.worker', 'ERROR'):
+            Worker('test').run(burst=True)
+
+        # Act
+        self.client.force_authenticate(self.user)
+        user_response = self.client.get(f'/api/jobs/{job.id}/')
+        self.client.force_authenticate(self.admin)
+        admin_response = self.client.get(f'/api/jobs/{job.id}/')
+
+        # Assert
+        self.assertEqual('ValueError: Boom', user_response.data['error'])
+        self.assertIn('Traceback', admin_response.data['error'])
+
+
+class RunWorkersCommandTest(TransactionTestCase):
+    def test_worker_processes_run_the_queued_jobs(self) -> None:
+        # Arrange
+        jobs = [enqueue(add, number, number) for number in range(5)]
+
+        # Act
+        call_command('run_workers', processes=2, burst=True, stdout=io.StringIO())
+
+        # Assert
+        self.assertEqual(
+            [number * 2 for number in range(5)],
+            [Job.loads(Job.objects.get(pk=job.pk).result) for job in jobs])
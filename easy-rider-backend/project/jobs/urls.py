@@ -0,0 +1,12 @@
+from django.conf.urls import include
+from django.urls import path
+from rest_framework.routers import SimpleRouter
+
+from project.jobs.views import JobViewSet
+
+router = SimpleRouter()
+router.register(r'jobs', JobViewSet, basename='jobs')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
@@ -0,0 +1,36 @@
+from django.db.models import QuerySet
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import mixins, viewsets
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.permissions import IsAuthenticated
+
+from project.api.models import RoleEnum
+
+from .models import Job
+from .serializers import JobSerializer
+
+
+class JobPagination(LimitOffsetPagination):
+    default_limit = 50
+    max_limit = 1000
+
+
+class JobViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """
+    API endpoint that allows the status of background jobs to be viewed. Users see the jobs they enqueued,
+    admins all jobs
+    """
+
+    permission_classes = (IsAuthenticated,)
+    serializer_class = JobSerializer
+    pagination_class = JobPagination
+    filter_backends = (DjangoFilterBackend,)
+    filterset_fields = ('status', 'name')
+
+    def get_queryset(self) -> QuerySet:
+        queryset = Job.objects.order_by('-id')
+
+        if self.request.user.role != RoleEnum.ADMIN:
+            queryset = queryset.filter(user_id=self.request.user.id)
+
+        return queryset
@@ -0,0 +1,180 @@
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+import traceback
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import connections
+
+from .models import Job
+from .queue import claim, complete, fail
+from .registry import get_task
+
+
+def _close_old_connections() -> None:
+    # Django does the same around requests, connections within a transaction (e.g. of a test case) are kept
+    for connection in connections.all():
+        if not connection.in_atomic_block:
+            connection.close_if_unusable_or_obsolete()
+
+
+class Worker:
+    """
+    Claims and runs jobs one at a time until stopped
+    """
+
+    def __init__(self, worker_id: Optional[str] = None, poll_interval: Optional[float] = None) -> None:
+        """
+        :param worker_id: ID of the worker stored in the jobs it claims, host and PID by default
+        :param poll_interval: Maximum seconds between two claim attempts while the queue is empty
+        """
+
+        self.worker_id: str = worker_id or f'{socket.gethostname()}:{os.getpid()}'
+        self._poll_interval: float = poll_interval if poll_interval is not None else settings.JOBS_POLL_INTERVAL
+        self._stopped: bool = False
+        self._logger: logging.Logger = logging.getLogger(__name__)
+
+    def stop(self, *args) -> None:
+        self._stopped = True
+
+    def execute(self, job: Job) -> None:
+        """
+        Runs a claimed job and records its outcome
+
+        :param job: Job returned by claim()
+        """
+
+        self._logger.info(f'Running job {job} (attempt {job.attempts} of {job.max_attempts})')
+
+        try:
+            task = get_task(job.name)
+            arguments = Job.loads(job.arguments)
+            args = ([job] if task.bind else []) + arguments['args']
+            result = task.function(*args, **arguments['kwargs'])
+        except Exception:
+            self._logger.exception(f'Job {job} failed')
+
+            if not fail(job, traceback.format_exc()):
+                self._logger.warning(f'Job {job} has been claimed by another worker, its failure is discarded')
+        else:
+            if not complete(job, result):
+                self._logger.warning(f'Job {job} has been claimed by another worker, its result is discarded')
+
+    def run_once(self) -> bool:
+        """
+        Claims and runs a single job
+
+        :return: Boolean value indicating whether a job was available
+        """
+
+        _close_old_connections()
+
+        try:
+            job = claim(self.worker_id)
+
+            if job is None:
+                return False
+
+            self.execute(job)
+
+            return True
+        finally:
+            _close_old_connections()
+
+    def run(self, burst: bool = False) -> None:
+        """
+        Runs jobs until stopped. Polling backs off while the queue stays empty
+
+        :param burst: Whether to stop once the queue is empty
+        """
+
+        delay = 0.05
+
+        while not self._stopped:
+            try:
+                ran = self.run_once()
+            except Exception:
+                # E.g. the database being unavailable, the worker keeps polling
+                self._logger.exception('Claiming a job failed')
+                ran = False
+
+            if ran:
+                delay = 0.05
+                continue
+            if burst:
+                return
+
+            time.sleep(delay)
+            delay = min(delay * 2, self._poll_interval)
+
+
+def run_worker(burst: bool = False) -> None:
+    """
+    Runs a worker in the current process until it receives SIGTERM or SIGINT, the running job is finished first
+
+    :param burst: Whether to stop once the queue is empty
+    """
+
+    worker = Worker()
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run(burst)
+
+
+class WorkerPool:
+    """
+    Supervises worker processes, replacing processes which died until stopped
+    """
+
+    def __init__(self, processes: int) -> None:
+        self._processes: int = processes
+        self._workers: List[Optional[multiprocessing.Process]] = []
+        self._stopped: bool = False
+        self._logger: logging.Logger = logging.getLogger(__name__)
+
+    def stop(self, *args) -> None:
+        self._stopped = True
+
+    def _start_worker(self, burst: bool) -> multiprocessing.Process:
+        # Connections must not be shared with the forked processes
+        connections.close_all()
+        # Forked workers inherit the configured Django instead of setting it up again
+        process = multiprocessing.get_context('fork').Process(target=run_worker, args=(burst,), daemon=True)
+        process.start()
+
+        return process
+
+    def run(self, burst: bool = False) -> None:
+        """
+        Starts the worker processes and waits for them
+
+        :param burst: Whether the workers stop once the queue is empty instead of being replaced
+        """
+
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        self._workers = [self._start_worker(burst) for _ in range(self._processes)]
+
+        while self._workers and not self._stopped:
+            for index, process in enumerate(self._workers):
+                process.join(timeout=0.1 if burst else 1 / len(self._workers))
+
+                if process.is_alive():
+                    continue
+                if burst:
+                    self._workers[index] = None
+                else:
+                    self._logger.warning(f'Worker {process.pid} exited with code {process.exitcode}, restarting it')
+                    self._workers[index] = self._start_worker(burst)
+
+            self._workers = [process for process in self._workers if process is not None]
+
+        for process in self._workers:
+            process.terminate()
+
+        for process in self._workers:
+            process.join()
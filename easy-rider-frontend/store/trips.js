@@ -1,6 +1,19 @@
 import Vue from 'vue'
 import { dateToString } from '~/utils/date'
 
+// Event streams of trip changes by user ID, kept outside of the state as they are not serializable
+const streams = {}
+// Delays in milliseconds before reopening a failed stream, by the number of failures in a row
+const REOPEN_DELAYS = [1000, 5000, 15000, 60000]
+
+function reopenLater(context, userId, stream) {
+  const attempt = Math.min(stream.failures, REOPEN_DELAYS.length - 1)
+  const delay = REOPEN_DELAYS[attempt]
+
+  stream.failures += 1
+  stream.timer = setTimeout(() => context.dispatch('open', userId), delay)
+}
+
 export const state = () => ({
   trips: {}
 })
@@ -59,6 +72,14 @@ export const actions = {
 
     return trips
   },
+  async search(context, { userId, params }) {
+    // Trips which ended long ago are archived, they are only listed when the date filters reach into the past
+    const trips = await this.$axios.$get(`/users/${userId}/trips/`, { params })
+
+    context.commit('add', { userId, trips })
+
+    return trips
+  },
   async retrieve(context, { userId, tripId }) {
     const tripsMap = context.state.trips[parseInt(userId)]
     let trip = null
@@ -104,7 +125,116 @@ export const actions = {
 
     context.commit('remove', { userId, tripId })
   },
+  subscribe(context, userId) {
+    if (process.server || userId in streams) {
+      return
+    }
+
+    streams[userId] = {
+      source: null,
+      lastEventId: '',
+      failures: 0,
+      timer: null
+    }
+
+    context.dispatch('open', userId)
+  },
+  async open(context, userId) {
+    const stream = streams[userId]
+    let ticket = null
+
+    if (!stream) {
+      return
+    }
+
+    // EventSource cannot send the Authorization header, streams are opened with short-lived tickets instead
+    try {
+      const response = await this.$axios.$post(
+        `/users/${userId}/trips/stream/ticket/`
+      )
+
+      ticket = response.ticket
+    } catch (error) {
+      if (streams[userId] !== stream) {
+        return
+      }
+
+      // Streams the user may not open are given up, other failures are retried
+      if (error.response && error.response.status < 500) {
+        delete streams[userId]
+      } else {
+        reopenLater(context, userId, stream)
+      }
+
+      return
+    }
+
+    // Unsubscribed while the ticket was requested
+    if (streams[userId] !== stream) {
+      return
+    }
+
+    const params = new URLSearchParams({ ticket })
+
+    if (stream.lastEventId) {
+      params.set('lastEventId', stream.lastEventId)
+    }
+
+    const source = new EventSource(
+      `${this.$axios.defaults.baseURL}/users/${userId}/trips/stream?${params}`
+    )
+    const listen = (type, handle) => {
+      source.addEventListener(type, (event) => {
+        stream.lastEventId = event.lastEventId || stream.lastEventId
+        handle(event)
+      })
+    }
+
+    listen('created', (event) => {
+      context.commit('add', { userId, trips: [JSON.parse(event.data)] })
+    })
+    listen('updated', (event) => {
+      context.commit('add', { userId, trips: [JSON.parse(event.data)] })
+    })
+    listen('deleted', (event) => {
+      context.commit('remove', { userId, tripId: JSON.parse(event.data).id })
+    })
+    // Sent when the changes missed while disconnected are no longer known
+    listen('reset', () => {
+      context.dispatch('list', userId)
+    })
+
+    source.onopen = () => {
+      stream.failures = 0
+    }
+    // EventSource retries dropped connections by itself but gives up on error responses,
+    // e.g. 401 once the ticket has expired. The stream is reopened with a new ticket after a delay
+    source.onerror = () => {
+      if (source.readyState === EventSource.CLOSED) {
+        source.close()
+        reopenLater(context, userId, stream)
+      }
+    }
+
+    stream.source = source
+  },
+  unsubscribe(context, userId) {
+    const stream = streams[userId]
+
+    if (stream) {
+      clearTimeout(stream.timer)
+
+      if (stream.source) {
+        stream.source.close()
+      }
+
+      delete streams[userId]
+    }
+  },
   clear(context) {
+    Object.keys(streams).forEach((userId) =>
+      context.dispatch('unsubscribe', userId)
+    )
     context.commit('clear')
   }
 }